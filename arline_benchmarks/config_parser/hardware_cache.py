@@ -0,0 +1,73 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import threading
+
+from arline_quantum.hardware import hardware_by_name
+
+_lock = threading.RLock()
+_hardware_cache = {}
+_conversion_cache = {}
+
+
+def canonical_config_key(cfg):
+    """Canonical string representation of (json serializable) config
+    """
+    return json.dumps(cfg, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def cached_hardware_by_name(cfg):
+    r"""Process-wide memoized version of :func:`arline_quantum.hardware.hardware_by_name`
+
+    **Description:**
+        Returns the same hardware object for equal hardware configs.
+        Returned objects are shared between strategies and target generators and must not be modified,
+        make a copy before changing them.
+    """
+    key = canonical_config_key(cfg)
+    with _lock:
+        try:
+            return _hardware_cache[key]
+        except KeyError:
+            hardware = hardware_by_name(cfg)
+            _hardware_cache[key] = hardware
+            return hardware
+
+
+def cached_hardware_conversion(cfg, framework, convert):
+    """Memoized conversion of hardware to framework-specific device object
+
+    :param cfg: hardware config
+    :param framework: framework name (e.g. 'qiskit', 'cirq', 'pytket')
+    :param convert: function without arguments that performs conversion
+    :return: shared device object, must not be modified
+    """
+    key = (canonical_config_key(cfg), framework)
+    with _lock:
+        try:
+            return _conversion_cache[key]
+        except KeyError:
+            device = convert()
+            _conversion_cache[key] = device
+            return device
+
+
+def clear_hardware_cache():
+    with _lock:
+        _hardware_cache.clear()
+        _conversion_cache.clear()
@@ -0,0 +1,110 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import hashlib
+import json
+import os
+import re
+import sys
+
+import _jsonnet
+
+_undefined_ext_var = re.compile(r"undefined external variable: (\S+)")
+_jsonnet_version = tuple(int(v) for v in re.findall(r"\d+", _jsonnet.version)[:2])
+
+
+def default_cache_dir():
+    try:
+        return os.environ["ARLINE_BENCHMARKS_CACHE_DIR"]
+    except KeyError:
+        return os.path.join(os.path.expanduser("~"), ".cache", "arline_benchmarks", "jsonnet")
+
+
+def _file_hash(filename):
+    with open(filename, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def evaluate_file(filename):
+    r"""Evaluate .jsonnet file
+
+    **Description:**
+        External variables (``std.extVar('NAME')``) are taken from environment variables.
+
+    :return: tuple (evaluated json string, {imported file path: content hash}, {external variable: value})
+    """
+    files = {os.path.abspath(filename): _file_hash(filename)}
+
+    def import_callback(dir_name, rel_path):
+        full_path = os.path.abspath(os.path.join(dir_name, rel_path))
+        if not os.path.isfile(full_path):
+            raise RuntimeError("File not found: {}".format(full_path))
+        with open(full_path, "rb") as f:
+            content = f.read()
+        files[full_path] = hashlib.sha256(content).hexdigest()
+        return full_path, content if _jsonnet_version >= (0, 19) else content.decode("utf-8")
+
+    ext_vars = {}
+    while True:
+        try:
+            result = _jsonnet.evaluate_file(filename, import_callback=import_callback, ext_vars=ext_vars)
+            return result, files, ext_vars
+        except RuntimeError as e:
+            # Provide undefined external variable from the environment and try again
+            m = _undefined_ext_var.search(str(e))
+            if m is None or m.group(1) not in os.environ or m.group(1) in ext_vars:
+                raise
+            ext_vars[m.group(1)] = os.environ[m.group(1)]
+
+
+def evaluate_file_cached(filename, cache_dir=None):
+    r"""Evaluate .jsonnet file with caching of the result
+
+    **Description:**
+        The cache entry of a file is valid while the content of the file and of all files it imports
+        (transitively) and the values of external variables it references are unchanged.
+        Cache is stored in ``cache_dir`` (``$ARLINE_BENCHMARKS_CACHE_DIR`` or ``~/.cache/arline_benchmarks/jsonnet``
+        by default).
+
+    :return: evaluated json string
+    """
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    root_key = hashlib.sha256(os.path.abspath(filename).encode("utf-8")).hexdigest()
+    entry_path = os.path.join(cache_dir, root_key + ".json")
+
+    try:
+        with open(entry_path) as f:
+            entry = json.load(f)
+        if all(
+            os.path.isfile(fname) and _file_hash(fname) == file_hash for fname, file_hash in entry["files"].items()
+        ) and all(os.environ.get(name) == value for name, value in entry["ext_vars"].items()):
+            return entry["result"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    result, files, ext_vars = evaluate_file(filename)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = "{}.{}.tmp".format(entry_path, os.getpid())
+        with open(tmp_path, "w") as f:
+            json.dump({"files": files, "ext_vars": ext_vars, "result": result}, f)
+        os.replace(tmp_path, entry_path)
+    except OSError as e:
+        print("Warning: can't save jsonnet cache entry {}: {}".format(entry_path, e), file=sys.stderr)
+    return result
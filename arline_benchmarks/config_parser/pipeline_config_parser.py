@@ -16,20 +16,77 @@
 
 
 import json
+import os
+
 import _jsonnet
 
+from arline_benchmarks.config_parser.jsonnet_cache import evaluate_file_cached
+
+
+def substitute_placeholders(obj, values):
+    """Replace strings ``'$name'`` in (nested) config by ``values[name]``
+    """
+    if isinstance(obj, str):
+        if obj.startswith("$") and obj[1:] in values:
+            return values[obj[1:]]
+        return obj
+    if isinstance(obj, dict):
+        return {k: substitute_placeholders(v, values) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [substitute_placeholders(v, values) for v in obj]
+    return obj
+
+
+def iter_pipeline_configs(cfg):
+    r"""Iterate over pipeline configs of the experiment
+
+    **Description:**
+        Yields pipelines listed in ``pipelines`` and then pipelines of ``pipeline_matrix``.
+        Each ``pipeline_matrix`` entry declares axes of the experiment:
+
+            * ``hardware`` - list of hardware configs
+            * ``targets`` - list of target configs
+            * ``pipelines`` - list of pipeline templates
+            * ``test_type`` - test type
+
+        Pipelines are produced lazily for each (hardware, target, template) combination, strings
+        ``'$hardware'``, ``'$target'`` and ``'$test_type'`` in templates are replaced by the current values.
+    """
+    for pipeline_cfg in cfg.get("pipelines", []):
+        yield pipeline_cfg
+    for matrix in cfg.get("pipeline_matrix", []):
+        for hardware in matrix["hardware"]:
+            for target in matrix["targets"]:
+                values = {"hardware": hardware, "target": target, "test_type": matrix.get("test_type")}
+                for template in matrix["pipelines"]:
+                    yield substitute_placeholders(template, values)
+
+
+def count_pipeline_configs(cfg):
+    """Number of pipelines yielded by :func:`iter_pipeline_configs` (without expansion)
+    """
+    n = len(cfg.get("pipelines", []))
+    for matrix in cfg.get("pipeline_matrix", []):
+        n += len(matrix["hardware"]) * len(matrix["targets"]) * len(matrix["pipelines"])
+    return n
+
 
 class PipelineConfigParser(dict):
     """Loads experiment configuration from disk (.jsonnet config file)
 
         :param setup_config_path: path to config
         :type setup_config_path: str
+        :param use_cache: cache evaluated config (can be disabled by ``ARLINE_BENCHMARKS_CONFIG_CACHE=0``)
+        :type use_cache: bool
     """
 
-    def __init__(self, setup_config_path):
+    def __init__(self, setup_config_path, use_cache=True):
         super().__init__()
         self._setup_config_path = setup_config_path
-        self.update(json.loads(_jsonnet.evaluate_file(setup_config_path)))
+        if use_cache and os.environ.get("ARLINE_BENCHMARKS_CONFIG_CACHE", "1") != "0":
+            self.update(json.loads(evaluate_file_cached(setup_config_path)))
+        else:
+            self.update(json.loads(_jsonnet.evaluate_file(setup_config_path)))
 
     def to_json(self, filename):
         with open(filename, "w", encoding="utf-8") as f:
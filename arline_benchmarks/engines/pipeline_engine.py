@@ -15,8 +15,12 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import json
+import re
 import sys
 import traceback
+import zlib
+from collections import OrderedDict
 from os import makedirs, path
 from pprint import pprint
 from shutil import rmtree
@@ -24,12 +28,135 @@ from shutil import rmtree
 import pandas as pd
 from tqdm import tqdm
 
-from arline_benchmarks.pipeline.pipeline import Pipeline
+from arline_benchmarks.config_parser.pipeline_config_parser import count_pipeline_configs, iter_pipeline_configs
+from arline_benchmarks.engines.progress_monitor import ProgressMonitor, RateLimitedWriter
+from arline_benchmarks.engines.racing import PipelineRace
+from arline_benchmarks.metrics.statistics import AdaptiveSampleSize
+from arline_benchmarks.metrics.target_cache import target_cache
+from arline_benchmarks.pipeline.pipeline import Pipeline, stage_analyse_mode
+from arline_benchmarks.profiling.import_timer import import_cost_report
+from arline_benchmarks.profiling.stage_profiler import StageProfiler
+from arline_benchmarks.profiling.tracer import tracer
+from arline_benchmarks.reports.circuit_store import CircuitStore
 from arline_benchmarks.reports.results_logger import open_csv_results_logger
+from arline_benchmarks.strategies.parallel import shutdown_executors
+from arline_benchmarks.strategies.registry import check_strategy_name
 from arline_benchmarks.targets.target import Target
 from arline_quantum.gate_chain.gate_chain import GateChain
 
 
+def parse_save_output(spec):
+    r"""Parse ``save_output`` option of a pipeline or a stage
+
+    **Description:**
+        Supported values:
+
+            * ``all`` (or ``true``) - save output circuits of all stages
+            * ``final`` - save output circuit of the last stage only (pipeline level option)
+            * ``none`` (or ``false``) - do not save output circuits
+            * ``sample:<fraction>`` - save output circuits for a random fraction of targets
+
+    :return: tuple (mode, fraction)
+    """
+    if spec is True:
+        return "all", 1.0
+    if spec is False or spec is None:
+        return "none", 0.0
+    spec = str(spec).strip().lower()
+    if spec in ("all", "final", "none"):
+        return spec, 1.0 if spec != "none" else 0.0
+    if spec.startswith("sample:"):
+        fraction = float(spec[len("sample:"):])
+        if not 0 <= fraction <= 1:
+            raise ValueError(f"Sampling fraction must be in [0, 1], got save_output = '{spec}'")
+        return "sample", fraction
+    raise ValueError(f"Unknown save_output option '{spec}', expected all | final | none | sample:<fraction>")
+
+
+def parse_stages_save_output(pipeline_cfg):
+    """Parse ``save_output`` options of all stages of the pipeline
+
+    Stage level ``save_output`` option overrides the pipeline level one.
+
+    :return: list of tuples (mode, fraction), one per stage (see :func:`parse_save_output`)
+    :raises ValueError: on invalid options
+    """
+    pipeline_mode = parse_save_output(pipeline_cfg.get("save_output", "all"))
+    modes = []
+    for stg_cfg in pipeline_cfg["stages"]:
+        if "save_output" not in stg_cfg:
+            modes.append(pipeline_mode)
+            continue
+        try:
+            mode = parse_save_output(stg_cfg["save_output"])
+        except ValueError as e:
+            raise ValueError(f"Pipeline {pipeline_cfg['id']}, stage {stg_cfg['id']}: {e}") from e
+        if mode[0] == "final":
+            raise ValueError(
+                f"Pipeline {pipeline_cfg['id']}: save_output = 'final' is not supported for stage {stg_cfg['id']}"
+            )
+        modes.append(mode)
+    return modes
+
+
+def save_output_key(pipeline_cfg):
+    """Key of ``save_output`` options of the pipeline, pipelines with equal keys save the same stages
+    """
+    return json.dumps(
+        [pipeline_cfg.get("save_output", "all"), [stg_cfg.get("save_output") for stg_cfg in pipeline_cfg["stages"]]]
+    )
+
+
+def check_stage_strategies(pipeline_cfg):
+    """Check that strategies of all stages (and portfolio members) are registered and ``analyse`` options are valid
+
+    :raises ValueError: on unknown strategy names or ``analyse`` options
+    """
+    for stg_cfg in pipeline_cfg["stages"]:
+        try:
+            stage_analyse_mode(stg_cfg)
+        except ValueError as e:
+            raise ValueError(f"Pipeline {pipeline_cfg['id']}: {e}") from e
+        strategy_cfgs = [stg_cfg]
+        if stg_cfg["strategy"] == "portfolio":
+            strategy_cfgs += stg_cfg.get("args", {}).get("members", [])
+        for strategy_cfg in strategy_cfgs:
+            try:
+                check_strategy_name(strategy_cfg["strategy"])
+            except ValueError as e:
+                raise ValueError(f"Pipeline {pipeline_cfg['id']}, stage {stg_cfg['id']}: {e}") from e
+
+
+# Metrics reported by stages with ``analyse: 'none'`` and ``analyse: 'light'`` options
+timing_metrics = ("Execution Time", "Total Execution Time")
+light_metrics = timing_metrics + ("Total Gate Count", "Single-Qubit Gate Count", "Two-Qubit Gate Count")
+
+
+def check_stage_metrics(pipeline_cfg, stage_id, metrics, option):
+    """Check that metrics used by ``option`` (e.g. ``adaptive``) are reported by the stage of the pipeline
+
+    Metric names of stages with full analysis are not known before the run, only the stage and its ``analyse``
+    option are checked for them.
+
+    :raises ValueError: if the stage does not exist or does not report the metrics
+    """
+    stages = {stg_cfg["id"]: stg_cfg for stg_cfg in pipeline_cfg["stages"]}
+    if stage_id not in stages:
+        raise ValueError(f"Pipeline {pipeline_cfg['id']}: {option} stage '{stage_id}' is not a stage of the pipeline")
+    if not metrics or not all(isinstance(m, str) for m in metrics):
+        raise ValueError(f"Pipeline {pipeline_cfg['id']}: {option} metrics must be a non-empty list of names")
+    analyse_mode = stage_analyse_mode(stages[stage_id])
+    if analyse_mode == "full":
+        return
+    reported = timing_metrics if analyse_mode == "none" else light_metrics
+    for m in metrics:
+        if m not in reported and not (analyse_mode == "light" and re.fullmatch(r"\d+-Qubit Gate Count", m)):
+            raise ValueError(
+                f"Pipeline {pipeline_cfg['id']}: {option} metric '{m}' is not reported by stage {stage_id} "
+                f"with analyse = '{analyse_mode}'"
+            )
+
+
 class PipelineEngine:
     """Benchmark Engine Class
     """
@@ -38,17 +165,47 @@ class PipelineEngine:
         self.args = args
         self.cfg = cfg
         self.run_id = 0
+        # Strategies with identical configs are shared by all pipelines
+        self.strategy_pool = {}
+        # Parsed save_output options by save_output_key
+        self.save_output_modes = {}
 
     def run(self):
         exit_code = 0
+        # Config errors are reported before any job runs (and before previous results are removed)
+        self.validate_config()
         # Output path
         output_dir = path.join(self.args.output)
         output_qasm_dir = path.join(output_dir, "qasm")
         self.create_result_dir(output_dir)
         self.create_result_dir(output_qasm_dir)
+        self.circuit_store = CircuitStore(output_qasm_dir)
+        # Target-side analysis results are shared by all pipelines of the run
+        target_cache.clear()
+        target_cache.max_bytes = int(getattr(self.args, "target_cache_mb", 512) * 2**20)
         # Convert .jsonnet config file to .json
         self.cfg.to_json(path.join(self.args.output, "config.json"))
 
+        # Live progress counters and rate-limited console output
+        self.log_writer = RateLimitedWriter(getattr(self.args, "log_interval", 1.0))
+        self.monitor = ProgressMonitor(
+            num_pipelines=count_pipeline_configs(self.cfg),
+            metrics_file=getattr(self.args, "metrics_file", None),
+            port=getattr(self.args, "metrics_port", None),
+            interval=getattr(self.args, "metrics_interval", 5.0),
+        )
+        self.monitor.start()
+        profile_stages = getattr(self.args, "profile", None)
+        self.profiler = StageProfiler(
+            path.join(output_dir, "profiles"),
+            stage_ids=profile_stages.split(",") if profile_stages else (),
+            mode=getattr(self.args, "profile_mode", "cprofile"),
+        )
+        if getattr(self.args, "trace", False):
+            tracer.start(
+                jsonl_path=path.join(output_dir, "trace.jsonl"), chrome_trace_path=path.join(output_dir, "trace.json")
+            )
+
         # column names in .csv output file
         id_columns_names = [
             "Run ID",
@@ -60,6 +217,7 @@ class PipelineEngine:
             "Pipeline Output Hardware Name",
             "Pipeline Output Number of Qubits",
             "QASM Path",
+            "QASM Hash",
             "Test Type",
         ]
 
@@ -67,93 +225,371 @@ class PipelineEngine:
         # Path to .csv report file with benchmarking results
         report_file = path.join(output_dir, "gate_chain_report.csv")
 
-        with open_csv_results_logger(report_file, id_columns_names, columns_order=columns_first) as csv_logger:
-            # Create Pipeline
-            for pipeline_cfg in tqdm(self.cfg["pipelines"], desc="Overall benchmark progress", unit="pipeline"):
-                pipeline = Pipeline(pipeline_id=pipeline_cfg["id"], stages=pipeline_cfg["stages"], run_analyser=True)
-                # Create Target Generator
-                target_generator = Target.from_config(config=pipeline_cfg["target"])
-
-                targets = []
-                while True:
-                    try:
-                        t = next(target_generator)
-                        if t is None:
-                            print("\n\nTarget is None", file=sys.stderr)
-                            print("Target config:", file=sys.stderr)
-                            pprint(pipeline_cfg["target"], stream=sys.stderr)
-                            continue
-                        targets.append(t)
-                    except StopIteration:
-                        break
-                    except Exception as e:
-                        print("\n\nError occurred when generating target", target_generator, file=sys.stderr)
-                        traceback.print_exc(file=sys.stderr)
-                        print("Target config:", file=sys.stderr)
-                        pprint(pipeline_cfg["target"], stream=sys.stderr)
-                        exit_code = -2
-                        continue
-
-                for target, target_id in tqdm(
-                    targets, desc="Benchmarking pipeline {}".format(pipeline_cfg["id"]), unit="target",
-                ):
-                    try:
-                        tqdm.write("Target ID: {}, Target Name: {}".format(target_id, pipeline_cfg["target"]["name"]))
-                        r = pipeline.run(target)
-                    except Exception as e:
-                        print(
-                            f"\n\nError occurred when running pipeline {pipeline.id} on target_id {target_id}:",
-                            file=sys.stderr,
-                        )
-                        traceback.print_exc(file=sys.stderr)
-                        print("Pipeline config:", file=sys.stderr)
-                        pprint(pipeline_cfg, stream=sys.stderr)
-                        exit_code = -1
-                        continue
-
-                    for stg_cfg, stage_result, stg_report in zip(
-                        pipeline.stages, pipeline.stage_results, pipeline.analyser_report_history
-                    ):
-                        # Save Gate Chain
-                        file_path = path.join(
-                            output_qasm_dir,
-                            "{}_output_{}_{}_{}_{}".format(
-                                self.run_id,
-                                pipeline_cfg["id"],
-                                pipeline_cfg["target"]["name"],
-                                target_id,
-                                stg_cfg["id"]
-                            ),
-                        )
-                        qasm_path = file_path+".qasm"
-                        chain_path = file_path+".pkl"
-                        if isinstance(stage_result, GateChain):
-                            stage_result.save_to_qasm(qasm_path, "q")
-
-                            # stage_result.save_chain(chain_path)      #TODO fix problem with make_discrete
-                        # Add result to the .csv report
-
-                        hardw = pipeline.strategy_list[-1].quantum_hardware  # Take hardware the last stage
-                        csv_logger.add_results(
-                            line_id=(
-                                self.run_id,  # "Run ID",
-                                pipeline_cfg["id"],  # "Pipeline ID",
-                                stg_cfg["id"],  # "Stage ID",
-                                stg_cfg["strategy"],  # "Strategy ID"
-                                pipeline_cfg["target"]["name"],  # "Test Target Generator Name",
-                                target_id,  # "Test Target ID",
-                                "{}".format(hardw.name),  # "Pipeline Output Hardware Name",
-                                hardw.num_qubits,  # "Pipeline Output Number of Qubits",
-                                qasm_path,  # "QASM path"
-                                pipeline_cfg["test_type"],  # "Test Type"
-                            ),
-                            data=stg_report,
-                        )
-                    self.run_id += 1
+        try:
+            with open_csv_results_logger(report_file, id_columns_names, columns_order=columns_first) as csv_logger:
+                if "racing" in self.cfg:
+                    exit_code = self.run_racing(csv_logger, path.join(output_dir, "racing.csv"))
+                else:
+                    exit_code = self.run_all(csv_logger)
+        finally:
+            self.monitor.stop()
+            tracer.stop()
+            # Worker processes of parallel strategies (see parallel_map)
+            shutdown_executors()
 
+        self.profiler.save_aggregated()
+        if getattr(self.args, "import_report", False):
+            print(import_cost_report())
+        print(self.circuit_store.summary())
+        print(target_cache.summary())
         data = pd.read_csv(report_file)
         return exit_code
 
+    def create_pipeline(self, pipeline_cfg):
+        return Pipeline(
+            pipeline_id=pipeline_cfg["id"],
+            stages=pipeline_cfg["stages"],
+            run_analyser=True,
+            log_writer=self.log_writer,
+            profiler=self.profiler,
+            strategy_pool=self.strategy_pool,
+        )
+
+    def run_all(self, csv_logger):
+        """Benchmark every pipeline on all its targets
+
+        :return: exit code
+        """
+        exit_code = 0
+        # Pipelines of the config matrix are expanded lazily
+        for pipeline_cfg in tqdm(
+            iter_pipeline_configs(self.cfg),
+            total=count_pipeline_configs(self.cfg),
+            desc="Overall benchmark progress",
+            unit="pipeline",
+        ):
+            # Create Pipeline
+            pipeline = self.create_pipeline(pipeline_cfg)
+            if "adaptive" in pipeline_cfg["target"]:
+                exit_code = self.run_adaptive(pipeline, pipeline_cfg, csv_logger) or exit_code
+                continue
+
+            targets, targets_exit_code = self.generate_targets(pipeline_cfg)
+            exit_code = targets_exit_code or exit_code
+            self.monitor.add_pipeline(len(targets))
+
+            for target, target_id in tqdm(
+                targets, desc="Benchmarking pipeline {}".format(pipeline_cfg["id"]), unit="target",
+            ):
+                if not self.run_job(pipeline, pipeline_cfg, target, target_id, csv_logger):
+                    exit_code = -1
+        return exit_code
+
+    def run_racing(self, csv_logger, log_file):
+        """Benchmark pipelines in racing mode
+
+        Pipelines with the same target and output hardware race against each other on growing batches of targets,
+        dominated pipelines are dropped (see :class:`arline_benchmarks.engines.racing.PipelineRace`).
+        A pipeline that fails on a target (or does not report the objective) is dropped from the race.
+        Elimination decisions are saved to ``log_file``, the final decision of each pipeline is added to its report rows
+        (``Racing Decision`` column).
+
+        :return: exit code
+        """
+        exit_code = 0
+        racing_cfg = self.cfg["racing"]
+        groups = OrderedDict()
+        for pipeline_cfg in iter_pipeline_configs(self.cfg):
+            hardware_cfgs = [s["args"]["hardware"] for s in pipeline_cfg["stages"] if "hardware" in s.get("args", {})]
+            group_key = json.dumps([pipeline_cfg["target"], hardware_cfgs[-1:]], sort_keys=True)
+            groups.setdefault(group_key, []).append(pipeline_cfg)
+
+        decisions_log = []
+        for group in tqdm(groups.values(), desc="Racing", unit="group"):
+            targets, targets_exit_code = self.generate_targets(group[0])
+            exit_code = targets_exit_code or exit_code
+            pipelines = [self.create_pipeline(pipeline_cfg) for pipeline_cfg in group]
+            for _ in group:
+                self.monitor.add_pipeline(len(targets))
+            race = PipelineRace(range(len(group)), racing_cfg)
+            hardware = pipelines[0].strategy_list[-1].quantum_hardware
+            group_name = "{} / {}".format(group[0]["target"]["name"], hardware.name)
+            first_row = len(csv_logger)
+            num_jobs = 0
+
+            start = 0
+            while start < len(targets) and race.survivors:
+                batch = race.next_batch(start, len(targets))
+                for i in list(race.survivors):
+                    pipeline, pipeline_cfg = pipelines[i], group[i]
+                    stage_id = race.stage_id or pipeline_cfg["stages"][-1]["id"]
+                    for t in batch:
+                        target, target_id = targets[t]
+                        num_jobs += 1
+                        value = None
+                        if self.run_job(pipeline, pipeline_cfg, target, target_id, csv_logger):
+                            reports = {s["id"]: r for s, r in zip(pipeline.stages, pipeline.analyser_report_history)}
+                            value = reports[stage_id].get(race.objective)
+                            if value is None:
+                                print(
+                                    f"\n\nRacing objective '{race.objective}' is not reported by stage {stage_id} "
+                                    f"of pipeline {pipeline.id}",
+                                    file=sys.stderr,
+                                )
+                        if value is None:
+                            # Pipelines are compared on common targets, a failed pipeline is dropped from the race
+                            exit_code = -1
+                            self.log_racing_decision(decisions_log, group, group_name, race.round, race.fail(i), t + 1)
+                            break
+                        race.add(i, t, value)
+                start = batch.stop
+                if len(race.survivors) < 2:
+                    continue
+                for d in race.eliminate():
+                    self.log_racing_decision(decisions_log, group, group_name, race.round, d, start)
+            self.monitor.remove_jobs(len(targets) * len(group) - num_jobs)
+            # Eliminated pipelines have report rows for a part of the targets only
+            for i, pipeline_cfg in enumerate(group):
+                csv_logger.update_results(
+                    {"Racing Decision": race.status[i]}, first_row=first_row, where={"Pipeline ID": pipeline_cfg["id"]}
+                )
+
+        pd.DataFrame(decisions_log).to_csv(log_file, index=None, header=True)
+        return exit_code
+
+    @staticmethod
+    def log_racing_decision(decisions_log, group, group_name, race_round, d, num_targets):
+        """Add racing decision ``d`` (see :meth:`arline_benchmarks.engines.racing.PipelineRace.eliminate`) to the log
+        """
+        leader_id = group[d["leader"]]["id"] if d["leader"] is not None else ""
+        decisions_log.append(
+            {
+                "Group": group_name,
+                "Round": race_round,
+                "Number of Targets": num_targets,
+                "Pipeline ID": group[d["key"]]["id"],
+                "Leader": leader_id,
+                "Objective Mean": d["mean"],
+                "Difference Mean": d["diff_mean"],
+                "Difference CI Half Width": d["diff_half_width"],
+                "Decision": d["decision"],
+            }
+        )
+        if d["decision"] != "survived":
+            tqdm.write(
+                "Racing {}: pipeline {} {} after {} targets{}".format(
+                    group_name,
+                    group[d["key"]]["id"],
+                    d["decision"],
+                    num_targets,
+                    " (leader {})".format(leader_id) if leader_id else "",
+                )
+            )
+
+    def generate_targets(self, pipeline_cfg):
+        """Generate all targets of the pipeline
+
+        :return: tuple (list of (target, target_id), exit code)
+        """
+        exit_code = 0
+        targets = []
+        for t in self.iter_targets(pipeline_cfg, pipeline_cfg["target"]):
+            if t is None:
+                exit_code = -2
+            else:
+                targets.append(t)
+        return targets, exit_code
+
+    def iter_targets(self, pipeline_cfg, target_cfg):
+        """Generate targets of the pipeline lazily
+
+        Generation errors are reported to stderr, ``None`` is yielded for every target that failed to generate.
+        """
+        # Create Target Generator
+        target_generator = Target.from_config(config=target_cfg)
+
+        while True:
+            try:
+                with tracer.context(pipeline_id=pipeline_cfg["id"]), tracer.span("generate"):
+                    t = next(target_generator)
+                if t is None:
+                    print("\n\nTarget is None", file=sys.stderr)
+                    print("Target config:", file=sys.stderr)
+                    pprint(target_cfg, stream=sys.stderr)
+                    continue
+            except StopIteration:
+                break
+            except Exception as e:
+                print("\n\nError occurred when generating target", target_generator, file=sys.stderr)
+                traceback.print_exc(file=sys.stderr)
+                print("Target config:", file=sys.stderr)
+                pprint(target_cfg, stream=sys.stderr)
+                yield None
+                continue
+            yield t
+
+    def run_adaptive(self, pipeline, pipeline_cfg, csv_logger):
+        """Benchmark the pipeline on targets until metrics confidence intervals are narrow enough
+
+        See :class:`arline_benchmarks.metrics.statistics.AdaptiveSampleSize` for the ``adaptive`` target option.
+        Achieved confidence intervals are added to the .csv rows of the sampled stage.
+
+        :return: exit code
+        """
+        exit_code = 0
+        sampler = AdaptiveSampleSize(
+            pipeline_cfg["target"]["adaptive"], default_stage_id=pipeline_cfg["stages"][-1]["id"]
+        )
+        target_cfg = dict(pipeline_cfg["target"], number=sampler.max_number)
+        self.monitor.add_pipeline(sampler.max_number)
+        first_row = len(csv_logger)
+        num_jobs = 0
+
+        for t in tqdm(
+            self.iter_targets(pipeline_cfg, target_cfg),
+            total=sampler.max_number,
+            desc="Benchmarking pipeline {} (adaptive)".format(pipeline_cfg["id"]),
+            unit="target",
+        ):
+            if t is None:
+                exit_code = -2
+                continue
+            target, target_id = t
+            num_jobs += 1
+            if not self.run_job(pipeline, pipeline_cfg, target, target_id, csv_logger):
+                exit_code = -1
+                continue
+            sampler.add({stg_cfg["id"]: r for stg_cfg, r in zip(pipeline.stages, pipeline.analyser_report_history)})
+            if sampler.done():
+                break
+
+        self.monitor.remove_jobs(sampler.max_number - num_jobs)
+        csv_logger.update_results(sampler.report(), first_row=first_row, where={"Stage ID": sampler.stage_id})
+        self.log_writer.write(
+            "Pipeline {}: {} targets, {}".format(
+                pipeline_cfg["id"],
+                sampler.number,
+                "converged" if sampler.converged() else "confidence intervals above tolerance",
+            )
+        )
+        return exit_code
+
+    def run_job(self, pipeline, pipeline_cfg, target, target_id, csv_logger):
+        """Run pipeline on a single target and save results
+
+        :return: True if pipeline run succeeded
+        """
+        with tracer.context(pipeline_id=pipeline_cfg["id"], target_id=target_id), tracer.span("job"):
+            return self._run_job(pipeline, pipeline_cfg, target, target_id, csv_logger)
+
+    def _run_job(self, pipeline, pipeline_cfg, target, target_id, csv_logger):
+        self.monitor.job_started()
+        try:
+            self.log_writer.write("Target ID: {}, Target Name: {}".format(target_id, pipeline_cfg["target"]["name"]))
+            r = pipeline.run(target, target_id=target_id)
+        except Exception as e:
+            print(
+                f"\n\nError occurred when running pipeline {pipeline.id} on target_id {target_id}:", file=sys.stderr,
+            )
+            traceback.print_exc(file=sys.stderr)
+            print("Pipeline config:", file=sys.stderr)
+            pprint(pipeline_cfg, stream=sys.stderr)
+            self.monitor.job_finished(pipeline_cfg["id"], failed=True)
+            return False
+
+        with tracer.span("write"):
+            self.save_results(pipeline, pipeline_cfg, target_id, csv_logger)
+        self.monitor.job_finished(
+            pipeline_cfg["id"],
+            stage_times=[
+                (stg_cfg["id"], stg_report.get("Execution Time"))
+                for stg_cfg, stg_report in zip(pipeline.stages, pipeline.analyser_report_history)
+            ],
+        )
+        return True
+
+    def save_results(self, pipeline, pipeline_cfg, target_id, csv_logger):
+        save_flags = self.get_save_output_flags(pipeline_cfg, target_id)
+        for stg_cfg, stage_result, stg_report, save_flag in zip(
+            pipeline.stages, pipeline.stage_results, pipeline.analyser_report_history, save_flags
+        ):
+            # Save Gate Chain (identical circuits are stored once and referenced by hash)
+            qasm_path = ""
+            qasm_hash = ""
+            if save_flag and isinstance(stage_result, GateChain):
+                qasm_hash, qasm_path = self.circuit_store.put(stage_result)
+            # Add result to the .csv report
+
+            hardw = pipeline.strategy_list[-1].quantum_hardware  # Take hardware the last stage
+            csv_logger.add_results(
+                line_id=(
+                    self.run_id,  # "Run ID",
+                    pipeline_cfg["id"],  # "Pipeline ID",
+                    stg_cfg["id"],  # "Stage ID",
+                    stg_cfg["strategy"],  # "Strategy ID"
+                    pipeline_cfg["target"]["name"],  # "Test Target Generator Name",
+                    target_id,  # "Test Target ID",
+                    "{}".format(hardw.name),  # "Pipeline Output Hardware Name",
+                    hardw.num_qubits,  # "Pipeline Output Number of Qubits",
+                    qasm_path,  # "QASM path"
+                    qasm_hash,  # "QASM Hash"
+                    pipeline_cfg["test_type"],  # "Test Type"
+                ),
+                data=stg_report,
+            )
+        self.run_id += 1
+
+    def get_save_output_flags(self, pipeline_cfg, target_id):
+        """Decide for each pipeline stage if its output circuit is saved to disk
+
+        Sampling is deterministic for (pipeline, target) pair, so that all stages of the sampled run are saved.
+        """
+        job_key = "{}/{}/{}".format(pipeline_cfg["id"], pipeline_cfg["target"]["name"], target_id)
+        job_sample = zlib.crc32(job_key.encode("utf-8")) / 2 ** 32
+
+        flags = []
+        save_modes = self.save_output_modes[save_output_key(pipeline_cfg)]
+        for i, (mode, fraction) in enumerate(save_modes):
+            if mode == "final":
+                flags.append(i == len(save_modes) - 1)
+            elif mode == "sample":
+                flags.append(job_sample < fraction)
+            else:
+                flags.append(mode == "all")
+        return flags
+
+    def validate_config(self):
+        """Check options of all pipelines before running any job
+
+        :raises ValueError: on invalid options
+        """
+        self.save_output_modes = {}
+        for pipeline_cfg in iter_pipeline_configs(self.cfg):
+            check_stage_strategies(pipeline_cfg)
+            key = save_output_key(pipeline_cfg)
+            if key not in self.save_output_modes:
+                self.save_output_modes[key] = parse_stages_save_output(pipeline_cfg)
+            if "adaptive" in pipeline_cfg["target"]:
+                adaptive_cfg = pipeline_cfg["target"]["adaptive"]
+                check_stage_metrics(
+                    pipeline_cfg,
+                    adaptive_cfg.get("stage", pipeline_cfg["stages"][-1]["id"]),
+                    adaptive_cfg.get("metrics"),
+                    "adaptive",
+                )
+                # Checks sample size options
+                AdaptiveSampleSize(adaptive_cfg)
+            if "racing" in self.cfg:
+                racing_cfg = self.cfg["racing"]
+                if not isinstance(racing_cfg.get("objective"), str):
+                    raise ValueError("Racing objective must be a metric name")
+                check_stage_metrics(
+                    pipeline_cfg,
+                    racing_cfg.get("stage", pipeline_cfg["stages"][-1]["id"]),
+                    [racing_cfg["objective"]],
+                    "racing",
+                )
+
     def create_result_dir(self, d):
         rmtree(d, ignore_errors=True)
         makedirs(d)
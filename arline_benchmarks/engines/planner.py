@@ -0,0 +1,243 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import re
+from os import path
+
+import pandas as pd
+
+from arline_benchmarks.config_parser.hardware_cache import cached_hardware_by_name
+from arline_benchmarks.config_parser.pipeline_config_parser import iter_pipeline_configs
+from arline_benchmarks.targets.target import QasmChainTarget
+
+# Calibrated cost model used when the history has no data for a stage
+default_seconds_per_gate = 2e-3  # compilation time per input gate
+default_analyse_seconds_per_gate = 1e-4  # gate chain metrics
+fidelity_seconds_per_gate_amplitude = 1e-8  # statevector simulation of populated qubits
+base_memory_bytes = 300 * 2 ** 20  # interpreter with loaded compilation frameworks
+_qasm_non_gate_statements = ("OPENQASM", "include", "qreg", "creg", "barrier", "measure", "gate", "opaque", "//", "}")
+_qreg_re = re.compile(r"qreg\s+\w+\s*\[\s*(\d+)\s*\]")
+
+
+def scan_qasm_header(filename):
+    """Estimate number of qubits and gates of .qasm file without building the gate chain
+
+    :return: tuple (num_qubits, num_gates)
+    """
+    num_qubits = 0
+    num_gates = 0
+    with open(filename) as f:
+        for line in f:
+            for statement in line.split(";"):
+                statement = statement.strip()
+                if not statement:
+                    continue
+                m = _qreg_re.match(statement)
+                if m is not None:
+                    num_qubits += int(m.group(1))
+                elif not statement.startswith(_qasm_non_gate_statements):
+                    num_gates += 1
+    return num_qubits, num_gates
+
+
+def hardware_num_qubits(hardware_cfg):
+    try:
+        return hardware_cfg["args"]["num_qubits"]
+    except KeyError:
+        pass
+    try:
+        return hardware_cfg["num_qubits"]
+    except KeyError:
+        return cached_hardware_by_name(hardware_cfg).num_qubits
+
+
+def hardware_label(hardware_cfg):
+    if not isinstance(hardware_cfg, dict):
+        return str(hardware_cfg)
+    try:
+        return hardware_cfg["class"]
+    except KeyError:
+        return "Custom{}Q".format(hardware_num_qubits(hardware_cfg))
+
+
+def estimate_targets(target_cfg):
+    """Sizes of target circuits without generating them
+
+    :return: list of tuples (num_qubits, num_gates), one per target (None for missing .qasm files)
+    """
+    number = target_cfg.get("number")
+    if target_cfg["algo"] == "qasm":
+        qasm_list = QasmChainTarget(target_cfg).qasm_list
+        if number is not None and number >= 0:
+            qasm_list = qasm_list[:number]
+        return [scan_qasm_header(f) if path.isfile(f) else None for f in qasm_list]
+    if target_cfg["algo"] == "random_chain":
+        if number is None or number < 0:
+            raise ValueError("Number of targets of '{}' is not limited".format(target_cfg["name"]))
+        if "chain_length" in target_cfg:
+            num_gates = target_cfg["chain_length"]
+        else:
+            num_gates = (target_cfg.get("chain_length_min", 0) + target_cfg["chain_length_max"]) / 2
+        return [(hardware_num_qubits(target_cfg["hardware"]), num_gates)] * number
+    raise ValueError("Unknown target algo '{}'".format(target_cfg["algo"]))
+
+
+class RunHistory:
+    r"""Execution times of previous runs
+
+    **Description:**
+        Loaded from ``gate_chain_report.csv`` of a previous run. Time of a stage is predicted from the mean time of
+        the same (pipeline, stage, target generator); otherwise from the mean time per gate of the same strategy.
+    """
+
+    def __init__(self, report_file=None):
+        self.job_times = {}
+        self.strategy_times_per_gate = {}
+        if report_file is None or not path.isfile(report_file):
+            return
+        df = pd.read_csv(report_file)
+        if "Execution Time" not in df.columns:
+            return
+        df = df[df["Execution Time"].notna()]
+        key = ["Pipeline ID", "Stage ID", "Test Target Generator Name"]
+        self.job_times = df.groupby(key)["Execution Time"].mean().to_dict()
+        if "Total Gate Count" in df.columns:
+            df = df[df["Total Gate Count"] > 0]
+            per_gate = df["Execution Time"] / df["Total Gate Count"]
+            self.strategy_times_per_gate = per_gate.groupby(df["Strategy ID"]).mean().to_dict()
+
+    def __len__(self):
+        return len(self.job_times)
+
+    def stage_time(self, pipeline_id, stage_cfg, target_name, num_gates):
+        try:
+            return self.job_times[(pipeline_id, stage_cfg["id"], target_name)]
+        except KeyError:
+            pass
+        seconds_per_gate = self.strategy_times_per_gate.get(stage_cfg["strategy"], default_seconds_per_gate)
+        return seconds_per_gate * num_gates
+
+
+class RunPlanner:
+    r"""Dry-run Planner
+
+    **Description:**
+        Expands the config and estimates the number of jobs, CPU time and peak memory per
+        (pipeline, hardware, target) without running compilation. Target circuits are not generated:
+        random chain sizes are taken from the config and .qasm files are only scanned.
+        Jobs predicted to run longer than ``timeout`` seconds are flagged
+        (e.g. fidelity calculation for circuits with many qubits).
+    """
+
+    def __init__(self, cfg, history=None, timeout=3600.0):
+        self.cfg = cfg
+        self.history = history if history is not None else RunHistory()
+        self.timeout = timeout
+
+    def estimate_stage(self, pipeline_id, stage_cfg, target_name, num_qubits, num_gates):
+        """Predict (seconds, bytes) for one stage of one job
+        """
+        seconds = self.history.stage_time(pipeline_id, stage_cfg, target_name, num_gates)
+        memory = base_memory_bytes
+        analyser_options = stage_cfg.get("args", {}).get("analyser_options", {})
+        analyse_mode = stage_cfg.get("analyse", "full")
+        if analyse_mode != "none":
+            seconds += default_analyse_seconds_per_gate * num_gates
+        if analyse_mode == "full" and analyser_options.get("calculate_fidelity", False):
+            # Statevectors of target and result chains and tensordot temporaries
+            seconds += 2 * fidelity_seconds_per_gate_amplitude * num_gates * 2 ** num_qubits
+            memory += 4 * 16 * 2 ** num_qubits
+        return seconds, memory
+
+    def plan(self):
+        """Estimate all jobs of the config
+
+        :return: pandas DataFrame, one row per (pipeline, hardware, target)
+        """
+        rows = []
+        for pipeline_cfg in iter_pipeline_configs(self.cfg):
+            target_cfg = pipeline_cfg["target"]
+            targets = estimate_targets(target_cfg)
+            hardware_cfgs = [s["args"]["hardware"] for s in pipeline_cfg["stages"] if "hardware" in s.get("args", {})]
+            max_job_time = 0.0
+            cpu_time = 0.0
+            peak_memory = base_memory_bytes
+            num_flagged = 0
+            num_missing = sum(t is None for t in targets)
+            targets = [t for t in targets if t is not None]
+            for num_qubits, num_gates in targets:
+                job_time = 0.0
+                for stage_cfg in pipeline_cfg["stages"]:
+                    seconds, memory = self.estimate_stage(
+                        pipeline_cfg["id"], stage_cfg, target_cfg["name"], num_qubits, num_gates
+                    )
+                    job_time += seconds
+                    peak_memory = max(peak_memory, memory)
+                cpu_time += job_time
+                max_job_time = max(max_job_time, job_time)
+                num_flagged += job_time > self.timeout
+            rows.append(
+                {
+                    "Pipeline ID": pipeline_cfg["id"],
+                    "Hardware": hardware_label(hardware_cfgs[-1]) if hardware_cfgs else "",
+                    "Test Target Generator Name": target_cfg["name"],
+                    "Jobs": len(targets) + num_missing,
+                    "Max Qubits": max((q for q, _ in targets), default=0),
+                    "CPU Time, s": cpu_time,
+                    "Max Job Time, s": max_job_time,
+                    "Peak Memory, MB": peak_memory / 2 ** 20,
+                    "Over Timeout": num_flagged,
+                    "Missing Files": num_missing,
+                }
+            )
+        return pd.DataFrame(rows)
+
+    def report(self):
+        df = self.plan()
+        lines = [
+            df.to_string(index=False, float_format="{:.1f}".format),
+            "",
+            "Time estimates: {}".format(
+                "history of {} (pipeline, stage, target) runs".format(len(self.history))
+                if len(self.history)
+                else "calibrated model (no history)"
+            ),
+            "Total jobs: {}".format(df["Jobs"].sum() if len(df) else 0),
+            "Predicted CPU time: {:.1f} h".format(df["CPU Time, s"].sum() / 3600 if len(df) else 0),
+            "Predicted peak memory: {:.0f} MB".format(df["Peak Memory, MB"].max() if len(df) else 0),
+        ]
+        if len(df) and df["Over Timeout"].sum():
+            lines.append("Jobs predicted to exceed {:.0f} s timeout:".format(self.timeout))
+            for _, row in df[df["Over Timeout"] > 0].iterrows():
+                lines.append(
+                    "  {} / {} / {}: {} jobs, up to {:.0f} s".format(
+                        row["Pipeline ID"],
+                        row["Hardware"],
+                        row["Test Target Generator Name"],
+                        row["Over Timeout"],
+                        row["Max Job Time, s"],
+                    )
+                )
+        if len(df) and df["Missing Files"].sum():
+            lines.append("Targets with missing .qasm files:")
+            for _, row in df[df["Missing Files"] > 0].iterrows():
+                lines.append(
+                    "  {} / {}: {} files".format(
+                        row["Pipeline ID"], row["Test Target Generator Name"], row["Missing Files"]
+                    )
+                )
+        return "\n".join(lines)
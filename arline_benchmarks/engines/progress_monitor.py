@@ -0,0 +1,223 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import psutil
+from tqdm import tqdm
+
+
+class RateLimitedWriter:
+    r"""Console writer that prints at most one message per ``min_interval`` seconds
+
+    **Description:**
+        Suppressed messages are counted and reported with the next printed message.
+        With ``min_interval=0`` every message is printed.
+    """
+
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self._last_time = None
+        self._suppressed = 0
+        self._lock = threading.Lock()
+
+    def write(self, msg):
+        now = time.monotonic()
+        with self._lock:
+            if self._last_time is not None and now - self._last_time < self.min_interval:
+                self._suppressed += 1
+                return
+            if self._suppressed:
+                msg += " [{} messages suppressed]".format(self._suppressed)
+            self._suppressed = 0
+            self._last_time = now
+        tqdm.write(msg)
+
+
+class ProgressMonitor:
+    r"""Live Benchmark Progress Monitor
+
+    **Description:**
+        Collects live counters of the benchmark run:
+
+            * Number of jobs (pipeline runs on a single target) done, failed and running
+            * Throughput (jobs/s) and estimated time to completion
+            * Mean stage execution time per pipeline
+            * Resident memory of the engine process
+
+        Counters are exported in Prometheus text format to periodically rewritten file
+        and (optionally) to HTTP endpoint ``http://127.0.0.1:<port>/metrics``.
+    """
+
+    def __init__(self, num_pipelines=None, metrics_file=None, port=None, interval=5.0):
+        self.num_pipelines = num_pipelines
+        self.metrics_file = metrics_file
+        self.port = port
+        self.interval = interval
+
+        self.jobs_total = 0
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self.jobs_running = 0
+        self.pipelines_expanded = 0
+        self._stage_time_sum = defaultdict(float)
+        self._stage_time_cnt = defaultdict(int)
+        self._start_time = time.monotonic()
+        self._process = psutil.Process(os.getpid())
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def add_pipeline(self, num_jobs):
+        """Register pipeline with ``num_jobs`` targets
+        """
+        with self._lock:
+            self.pipelines_expanded += 1
+            self.jobs_total += num_jobs
+
+    def remove_jobs(self, num_jobs):
+        """Unregister jobs that will not be run (e.g. adaptive sampling stopped early)
+        """
+        with self._lock:
+            self.jobs_total -= num_jobs
+
+    def job_started(self):
+        with self._lock:
+            self.jobs_running += 1
+
+    def job_finished(self, pipeline_id, stage_times=(), failed=False):
+        """Register finished job
+
+        :param stage_times: list of (stage_id, execution time) pairs
+        """
+        with self._lock:
+            self.jobs_running -= 1
+            if failed:
+                self.jobs_failed += 1
+            else:
+                self.jobs_done += 1
+            for stage_id, t in stage_times:
+                if t is None:
+                    continue
+                self._stage_time_sum[(pipeline_id, stage_id)] += t
+                self._stage_time_cnt[(pipeline_id, stage_id)] += 1
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = time.monotonic() - self._start_time
+            finished = self.jobs_done + self.jobs_failed
+            jobs_total = self.jobs_total
+            # Extrapolate number of jobs for pipelines whose targets are not generated yet
+            if self.num_pipelines is not None and self.pipelines_expanded > 0:
+                remaining_pipelines = max(self.num_pipelines - self.pipelines_expanded, 0)
+                jobs_total += remaining_pipelines * self.jobs_total / self.pipelines_expanded
+            rate = finished / elapsed if elapsed > 0 else 0.0
+            eta = (jobs_total - finished) / rate if rate > 0 else float("nan")
+            stage_time_mean = {k: self._stage_time_sum[k] / self._stage_time_cnt[k] for k in self._stage_time_cnt}
+            return {
+                "jobs_total": jobs_total,
+                "jobs_done": self.jobs_done,
+                "jobs_failed": self.jobs_failed,
+                "jobs_running": self.jobs_running,
+                "jobs_per_second": rate,
+                "eta_seconds": eta,
+                "elapsed_seconds": elapsed,
+                "rss_bytes": self._process.memory_info().rss,
+                "stage_time_mean": stage_time_mean,
+            }
+
+    def to_prometheus(self):
+        s = self.snapshot()
+        lines = []
+
+        def metric(name, metric_type, help_str, samples):
+            lines.append(f"# HELP arline_{name} {help_str}")
+            lines.append(f"# TYPE arline_{name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"arline_{name}{labels} {value}")
+
+        metric("jobs_total", "gauge", "Total number of jobs (estimated).", [("", s["jobs_total"])])
+        metric("jobs_done_total", "counter", "Number of finished jobs.", [("", s["jobs_done"])])
+        metric("jobs_failed_total", "counter", "Number of failed jobs.", [("", s["jobs_failed"])])
+        metric("jobs_running", "gauge", "Number of running jobs.", [("", s["jobs_running"])])
+        metric("jobs_per_second", "gauge", "Job throughput.", [("", s["jobs_per_second"])])
+        metric("eta_seconds", "gauge", "Estimated time to completion.", [("", s["eta_seconds"])])
+        metric("elapsed_seconds", "gauge", "Time since the start of the run.", [("", s["elapsed_seconds"])])
+        metric("rss_bytes", "gauge", "Resident memory of the engine process.", [("", s["rss_bytes"])])
+        metric(
+            "stage_time_seconds_mean",
+            "gauge",
+            "Mean stage execution time.",
+            [
+                ('{{pipeline="{}",stage="{}"}}'.format(_escape(p), _escape(st)), v)
+                for (p, st), v in sorted(s["stage_time_mean"].items())
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+    def write_metrics_file(self):
+        if self.metrics_file is None:
+            return
+        tmp_file = self.metrics_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_file, self.metrics_file)  # Atomic update for scrapers
+
+    def start(self):
+        if self.port is not None:
+            monitor = self
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    body = monitor.to_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            self._server = HTTPServer(("127.0.0.1", self.port), MetricsHandler)
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+        if self.metrics_file is not None:
+            self._thread = threading.Thread(target=self._write_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.write_metrics_file()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _write_loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.write_metrics_file()
+
+
+def _escape(label_value):
+    return str(label_value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
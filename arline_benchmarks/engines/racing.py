@@ -0,0 +1,133 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import math
+
+import numpy as np
+
+from arline_benchmarks.metrics.statistics import confidence_interval
+
+
+class PipelineRace:
+    r"""Racing of Pipelines
+
+    **Description:**
+        Pipelines benchmarked on the same targets are evaluated in rounds on growing batches of targets.
+        After each round a pipeline is eliminated if it is statistically dominated by the current leader:
+        confidence interval of the mean paired difference of the objective (on common targets) does not contain 0.
+        With ``halving_eta`` set, only ``ceil(n / halving_eta)`` best survivors are kept after each round
+        (successive halving) in addition to statistical elimination.
+
+        Config (``racing`` key of the config)::
+
+            {
+                objective: 'Circuit Cost Function',
+                stage: 'mapping_compression',  // default: the last stage of each pipeline
+                minimize: true,
+                initial_targets: 3,  // targets in the first round
+                growth: 2,  // batch size multiplier between rounds
+                confidence: 0.95,
+                halving_eta: null,
+            }
+    """
+
+    def __init__(self, pipeline_keys, config):
+        self.objective = config["objective"]
+        self.stage_id = config.get("stage")
+        self.sign = 1.0 if config.get("minimize", True) else -1.0
+        self.batch_size = config.get("initial_targets", 3)
+        self.growth = config.get("growth", 2)
+        self.confidence = config.get("confidence", 0.95)
+        self.halving_eta = config.get("halving_eta")
+        self.survivors = list(pipeline_keys)
+        self.values = {k: {} for k in pipeline_keys}
+        # Final decision for every pipeline: 'survived', 'eliminated', 'halved' or 'failed'
+        self.status = {k: "survived" for k in pipeline_keys}
+        self.round = 0
+
+    def next_batch(self, start, num_targets):
+        """Target indices range of the next round
+        """
+        stop = min(start + self.batch_size, num_targets)
+        self.batch_size = int(math.ceil(self.batch_size * self.growth))
+        self.round += 1
+        return range(start, stop)
+
+    def add(self, key, target_index, value):
+        self.values[key][target_index] = self.sign * float(value)
+
+    def fail(self, key):
+        """Drop a pipeline that failed on a target of the current round
+
+        :return: decision dict (see :meth:`eliminate`), ``leader`` is None
+        """
+        self.survivors.remove(key)
+        self.status[key] = "failed"
+        return {
+            "key": key,
+            "decision": "failed",
+            "leader": None,
+            "mean": self.sign * self.mean(key),
+            "diff_mean": float("nan"),
+            "diff_half_width": float("nan"),
+        }
+
+    def mean(self, key):
+        v = self.values[key]
+        return np.mean(list(v.values())) if v else float("inf")
+
+    def eliminate(self):
+        """Eliminate dominated pipelines after a round
+
+        :return: list of decisions, dicts with keys ``key``, ``decision``, ``leader``, ``mean``, ``diff_mean``,
+            ``diff_half_width``
+        """
+        if not self.survivors:
+            return []
+        leader = min(self.survivors, key=self.mean)
+        decisions = []
+        keep = []
+        for key in self.survivors:
+            common = sorted(set(self.values[key]) & set(self.values[leader]))
+            diffs = [self.values[key][i] - self.values[leader][i] for i in common]
+            diff_mean, half_width = confidence_interval(diffs, self.confidence)
+            dominated = key != leader and diff_mean - half_width > 0
+            decisions.append(
+                {
+                    "key": key,
+                    "decision": "eliminated" if dominated else "survived",
+                    "leader": leader,
+                    "mean": self.sign * self.mean(key),
+                    "diff_mean": self.sign * diff_mean,
+                    "diff_half_width": half_width,
+                }
+            )
+            if not dominated:
+                keep.append(key)
+
+        if self.halving_eta is not None and len(keep) > 1:
+            num_keep = max(1, int(math.ceil(len(self.survivors) / self.halving_eta)))
+            halved = set(sorted(keep, key=self.mean)[num_keep:])
+            for d in decisions:
+                if d["key"] in halved:
+                    d["decision"] = "halved"
+            keep = [k for k in keep if k not in halved]
+
+        for d in decisions:
+            self.status[d["key"]] = d["decision"]
+        self.survivors = keep
+        return decisions
@@ -0,0 +1,97 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import numpy as np
+
+
+def populated_qubits(gate_chain):
+    """Sorted list of qubits touched by at least one gate
+    """
+    return sorted({q for g in gate_chain.chain for q in g.connections})
+
+
+def populated_qubits_union(*gate_chains):
+    """Sorted list of qubits touched by at least one gate of any of the chains
+    """
+    return sorted(set().union(*(populated_qubits(c) for c in gate_chains)))
+
+
+def apply_chain(gate_chain, qubits, state, batch_dims=0):
+    """Apply gate chain to state tensor
+
+    :param qubits: qubits of state axes, must include all populated qubits of the chain
+    :type qubits: list
+    :param state: tensor of shape ``batch_shape + [2] * len(qubits)``
+    :param batch_dims: number of leading batch axes, gates are applied to all states of the batch at once
+    :return: state tensor of the same shape
+    """
+    axis_by_qubit = {q: i + batch_dims for i, q in enumerate(qubits)}
+    for g in gate_chain.chain:
+        axes = [axis_by_qubit[q] for q in g.connections]
+        n = len(axes)
+        # First connection corresponds to the most significant index of the gate matrix
+        u = np.asarray(g.gate.u, dtype=np.complex128).reshape([2] * (2 * n))
+        state = np.tensordot(u, state, axes=(list(range(n, 2 * n)), axes))
+        state = np.moveaxis(state, list(range(n)), axes)
+    return state
+
+
+def statevector(gate_chain, qubits):
+    """Simulate gate chain applied to |0...0> state on a subset of qubits
+
+    :param qubits: qubits to simulate, must include all populated qubits of the chain
+    :type qubits: list
+    :return: state tensor of shape ``[2] * len(qubits)``, axis ``i`` corresponds to qubit ``qubits[i]``
+    """
+    state = np.zeros([2] * len(qubits), dtype=np.complex128)
+    state[(0,) * len(qubits)] = 1
+    return apply_chain(gate_chain, qubits, state)
+
+
+def random_product_states(num_qubits, num_samples, rng):
+    """Batch of Haar random product states
+
+    :return: tensor of shape ``[num_samples] + [2] * num_qubits``
+    """
+    states = np.ones(num_samples, dtype=np.complex128)
+    for _ in range(num_qubits):
+        qubit_states = rng.normal(size=(num_samples, 2)) + 1j * rng.normal(size=(num_samples, 2))
+        qubit_states /= np.linalg.norm(qubit_states, axis=1, keepdims=True)
+        states = states[..., None] * qubit_states.reshape((num_samples,) + (1,) * (states.ndim - 1) + (2,))
+    return states
+
+
+def random_state_fidelities(chain_1, chain_2, num_samples=4, seed=0):
+    """Fidelities of outputs of two chains applied to the same random product states
+
+    Qubits of the chains are matched by index. Equivalent chains give fidelities equal to 1,
+    non-equivalent chains are detected with high probability by a few samples.
+
+    :return: array of ``num_samples`` fidelities
+    """
+    qubits = populated_qubits_union(chain_1, chain_2)
+    states = random_product_states(len(qubits), num_samples, np.random.default_rng(seed))
+    out_1 = apply_chain(chain_1, qubits, states, batch_dims=1).reshape(num_samples, -1)
+    out_2 = apply_chain(chain_2, qubits, states, batch_dims=1).reshape(num_samples, -1)
+    return np.abs(np.sum(out_1.conj() * out_2, axis=1)) ** 2
+
+
+def state_to_psi(state):
+    """Flatten state tensor to statevector, qubit 0 (axis 0) is the least significant bit
+    """
+    return np.transpose(state, list(reversed(range(state.ndim)))).reshape(-1)
+
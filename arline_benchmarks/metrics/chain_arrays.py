@@ -0,0 +1,100 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from itertools import combinations
+
+import numpy as np
+
+
+class GateChainArrays:
+    r"""Gate Chain as NumPy Arrays
+
+    **Description:**
+        Gates of the chain are extracted once into arrays, so that hardware constraints are checked with vectorized
+        indexing instead of walking the chain object by object:
+
+            * ``gate_ids`` - index of the gate class in ``gate_classes``
+            * ``arity`` - number of qubits of the gate
+            * ``connections`` - qubits of the gate, shape ``(num_gates, max arity)`` padded with ``-1``
+
+        Violations are returned as lists of ``(gate position, gate name, connections)``.
+    """
+
+    def __init__(self, gate_chain):
+        self.gate_classes = []
+        class_ids = {}
+        gate_ids = []
+        connections = []
+        for gc in gate_chain.chain:
+            gate_class = type(gc.gate)
+            try:
+                gate_ids.append(class_ids[gate_class])
+            except KeyError:
+                class_ids[gate_class] = len(self.gate_classes)
+                gate_ids.append(len(self.gate_classes))
+                self.gate_classes.append(gate_class)
+            connections.append(tuple(gc.connections))
+
+        self.gate_ids = np.array(gate_ids, dtype=np.int64)
+        self.arity = np.array([len(c) for c in connections], dtype=np.int64)
+        max_arity = int(self.arity.max()) if len(connections) else 1
+        self.connections = np.full((len(connections), max_arity), -1, dtype=np.int64)
+        for n in np.unique(self.arity):
+            rows = np.flatnonzero(self.arity == n)
+            self.connections[rows, :n] = [connections[i] for i in rows]
+
+    def __len__(self):
+        return len(self.gate_ids)
+
+    def violations(self, mask):
+        """Gates selected by boolean ``mask`` in violations list format
+        """
+        return [
+            (
+                int(i),
+                self.gate_classes[self.gate_ids[i]].__name__,
+                tuple(int(q) for q in self.connections[i, : self.arity[i]]),
+            )
+            for i in np.flatnonzero(mask)
+        ]
+
+    def qubit_number_mask(self, num_qubits):
+        """Gates acting on qubits outside of ``range(num_qubits)``
+        """
+        return (self.connections >= num_qubits).any(axis=1)
+
+    def connectivity_mask(self, adj_matrix):
+        """Multi-qubit gates acting on pairs of qubits not connected in ``adj_matrix``
+
+        Gates on 3 and more qubits require all pairs of their qubits to be connected.
+        """
+        adjacency = np.asarray(adj_matrix) == 1
+        mask = self.qubit_number_mask(adjacency.shape[0])
+        valid = ~mask
+        for n in np.unique(self.arity):
+            if n < 2:
+                continue
+            rows = np.flatnonzero((self.arity == n) & valid)
+            for a, b in combinations(range(n), 2):
+                mask[rows] |= ~adjacency[self.connections[rows, a], self.connections[rows, b]]
+        return mask
+
+    def gate_set_mask(self, gate_list):
+        """Gates which classes are not in ``gate_list``
+        """
+        allowed = np.array([c in gate_list for c in self.gate_classes], dtype=bool)
+        return ~allowed[self.gate_ids] if len(self.gate_classes) else np.zeros(0, dtype=bool)
@@ -16,12 +16,27 @@
 
 import os
 import tempfile
+from timeit import default_timer as timer
 
+import numpy as np
 from arline_quantum.gates import __gates_by_names__
-from arline_quantum.utils.fidelity import meas_fidelity, matrix_to_psi
+from arline_quantum.utils.fidelity import meas_fidelity
 from arline_quantum.estimators import Estimator
 
-from jkq import qcec
+from arline_benchmarks.metrics.active_qubits import (
+    populated_qubits,
+    populated_qubits_union,
+    random_state_fidelities,
+    state_to_psi,
+    statevector,
+)
+from arline_benchmarks.metrics.chain_arrays import GateChainArrays
+from arline_benchmarks.metrics.latency import schedule_latency
+from arline_benchmarks.metrics.stabilizer import StabilizerTableau, is_clifford, measurement_fidelity
+from arline_benchmarks.metrics.target_cache import target_cache
+from arline_benchmarks.metrics.two_qubit import chain_unitaries, gate_arrays, min_cnot_counts, process_fidelities
+from arline_benchmarks.profiling.import_timer import import_framework
+from arline_benchmarks.profiling.tracer import tracer
 
 DEBUG = 0
 
@@ -34,9 +49,20 @@ class Analyser:
         self.report = {}
         self.anls_list = None
 
+    # Analyse functions of light analysis (cheap metrics only)
+    light_anls = []
+
     def run_all(self, target, gate_chain):
-        for f_name in self.available_anls():
-            getattr(self, f_name)(target, gate_chain)
+        with tracer.span("analyse"):
+            for f_name in self.available_anls():
+                getattr(self, f_name)(target, gate_chain)
+        return self.report
+
+    def run_light(self, target, gate_chain):
+        self.report = {}
+        with tracer.span("analyse"):
+            for f_name in self.light_anls:
+                getattr(self, f_name)(target, gate_chain)
         return self.report
 
     def available_anls(self):
@@ -72,13 +98,20 @@ class BasicAnalyser(Analyser):
             * Gate count by gate type
             * Circuit depth
             * Number of populated qubits (qubits involved in calculation)
+            * Critical path latency and qubit idle time of ASAP schedule (if gate durations are defined by
+              ``gate_durations`` option, {gate name: duration, "default": duration}, or ``gate_durations``
+              attribute of the hardware)
 
     """
 
-    def __init__(self, verbose=False, cost_cfg={"class": "IbmCostFunction", "args": {}}):
+    light_anls = ["total_gate_count", "gate_count_by_num_qubits"]
+
+    def __init__(self, verbose=False, cost_cfg={"class": "IbmCostFunction", "args": {}}, gate_durations=None):
         super().__init__()
         self.verbose = verbose
         self.cost_model = Estimator.from_config(cost_cfg)
+        self.gate_durations = gate_durations
+        self._chain_arrays = None
 
     @analyse
     def depth(self, target, gate_chain):
@@ -108,7 +141,7 @@ class BasicAnalyser(Analyser):
             elif n == 2:
                 gcm["Two-Qubit Gate Count"] = v
             else:
-                gcm["{n}-Qubit Gate Count"] = v
+                gcm[f"{n}-Qubit Gate Count"] = v
         return gcm
 
     @analyse
@@ -166,26 +199,62 @@ class BasicAnalyser(Analyser):
                 populated_qubits += 1
         return {"Number of Populated Qubits": populated_qubits}
 
+    @analyse
+    def latency(self, target, gate_chain):
+        gate_durations = self.gate_durations or getattr(gate_chain.quantum_hardware, "gate_durations", None)
+        if not gate_durations:
+            return {}
+        arrays = self.chain_arrays(gate_chain)
+        num_qubits = max(gate_chain.quantum_hardware.num_qubits, int(arrays.connections.max(initial=-1)) + 1)
+        latency, idle_times = schedule_latency(gate_chain, gate_durations, num_qubits)
+        return {
+            "Critical Path Latency": latency,
+            "Total Qubit Idle Time": sum(idle_times),
+            "Max Qubit Idle Time": max(idle_times, default=0.0),
+        }
+
+    def run_all(self, target, gate_chain):
+        # Chain may be modified in place between runs
+        self._chain_arrays = None
+        return super().run_all(target, gate_chain)
+
+    def run_light(self, target, gate_chain):
+        self._chain_arrays = None
+        return super().run_light(target, gate_chain)
+
+    def chain_arrays(self, gate_chain):
+        """Arrays of the gate chain shared by all checks of the analysed chain
+        """
+        if self._chain_arrays is None or self._chain_arrays[0] is not gate_chain:
+            self._chain_arrays = (gate_chain, GateChainArrays(gate_chain))
+        return self._chain_arrays[1]
+
+    def check_result(self, arrays, mask):
+        return arrays.violations(mask) if self.verbose else not mask.any()
+
     @analyse
     def connectivity_check(self, target, gate_chain):
         """Check Connectivity Violations
         """
-        violations = gate_chain.check_connectivity()
-        return {"Connectivity Satisfied": (violations if self.verbose else (len(violations) == 0))}
+        arrays = self.chain_arrays(gate_chain)
+        mask = arrays.connectivity_mask(gate_chain.quantum_hardware.qubit_connectivity.connectivity)
+        return {"Connectivity Satisfied": self.check_result(arrays, mask)}
 
     @analyse
     def gate_set_check(self, target, gate_chain):
         """Check Gate Set Violations
         """
-        violations = gate_chain.check_gate_set()
-        return {"Gate Set Satisfied": (violations if self.verbose else (len(violations) == 0))}
+        arrays = self.chain_arrays(gate_chain)
+        mask = arrays.gate_set_mask(gate_chain.quantum_hardware.gate_set.gate_list)
+        return {"Gate Set Satisfied": self.check_result(arrays, mask)}
 
     @analyse
     def qubit_number_check(self, target, gate_chain):
         """Check Qubit Number Violations
         """
-        violations = gate_chain.check_qubit_number()
-        return {"Qubit Number Satisfied": (violations if self.verbose else (len(violations) == 0))}
+        arrays = self.chain_arrays(gate_chain)
+        mask = arrays.qubit_number_mask(gate_chain.quantum_hardware.num_qubits)
+        return {"Qubit Number Satisfied": self.check_result(arrays, mask)}
 
 
 class GateChainTransformAnalyser(BasicAnalyser):
@@ -197,6 +266,13 @@ class GateChainTransformAnalyser(BasicAnalyser):
             * Gate chain hardware (hardware class name corresponding to the current compilation pipeline stage)
             * Gate set for the current pipeline stage
             * Total number of qubits in the gate chain
+            * Measurement infidelity (if ``calculate_fidelity`` is set)
+            * Process infidelity of chains with at most 2 populated qubits and minimal CNOT count of such targets
+              (unless ``two_qubit_fidelity`` is unset)
+            * Equivalence to the target (if ``check_equiv`` is set) and the method that decided it:
+              stabilizer tableaux for Clifford chains, outputs for ``equiv_precheck_samples`` random product states
+              (non-equivalence or ``probably_equivalent`` for chains with more than ``equiv_max_qubits`` qubits)
+              or qcec (with ``equiv_time_budget_s`` timeout)
 
     """
 
@@ -206,34 +282,84 @@ class GateChainTransformAnalyser(BasicAnalyser):
         cost_cfg={"class": "IbmCostFunction", "args": {}},
         calculate_fidelity=False,
         fidelity_tol=0.999,
-        check_equiv=False
+        check_equiv=False,
+        gate_durations=None,
+        equiv_precheck_samples=4,
+        equiv_precheck_max_qubits=24,
+        equiv_max_qubits=None,
+        equiv_time_budget_s=None,
+        two_qubit_fidelity=True,
     ):
-        super().__init__(verbose, cost_cfg)
+        super().__init__(verbose, cost_cfg, gate_durations)
         self.calculate_fidelity = calculate_fidelity
         self.fidelity_tol = fidelity_tol
         self.check_equiv = check_equiv
+        self.equiv_precheck_samples = equiv_precheck_samples
+        self.equiv_precheck_max_qubits = equiv_precheck_max_qubits
+        self.equiv_max_qubits = equiv_max_qubits
+        self.equiv_time_budget_s = equiv_time_budget_s
+        self.two_qubit_fidelity = two_qubit_fidelity
+
+    @staticmethod
+    def stabilizer_tableaux(target, gate_chain):
+        # Both tableaux are built on the union of populated qubits, qubits are matched by index
+        qubits = populated_qubits_union(target, gate_chain)
+        target_tableau = target_cache.get(
+            target,
+            "tableau/" + ",".join(str(q) for q in qubits),
+            lambda: StabilizerTableau.from_gate_chain(target, qubits),
+        )
+        return target_tableau, StabilizerTableau.from_gate_chain(gate_chain, qubits)
 
     @analyse
     def fidelity(self, target, gate_chain):
         if not self.calculate_fidelity:
             return {}
 
-        if target.quantum_hardware.num_qubits != gate_chain.quantum_hardware.num_qubits:
-            # workaround when chains have different number of qubits
-            num_qubits = max(target.quantum_hardware.num_qubits, gate_chain.quantum_hardware.num_qubits)
+        if is_clifford(target) and is_clifford(gate_chain):
+            # Clifford chains are simulated with stabilizer tableaux
+            target_tableau, tableau = self.stabilizer_tableaux(target, gate_chain)
+            fidelity = measurement_fidelity(target_tableau, tableau)
+        else:
+            # Only populated qubits of the chains are simulated, qubits are matched by index (identity layout).
+            # E.g. a 5 qubit target mapped to 16 qubit hardware needs 2^5 dimensional statevectors if the compiler
+            # does not move qubits. Target state is shared by all stages and pipelines (see TargetCache)
+            qubits = populated_qubits_union(target, gate_chain)
+            target_psi = target_cache.get(
+                target,
+                "psi/" + ",".join(str(q) for q in qubits),
+                lambda: state_to_psi(statevector(target, qubits)),
+            )
+            fidelity = meas_fidelity(target_psi, state_to_psi(statevector(gate_chain, qubits)))
+        return {"Measurement Infidelity": abs(1-fidelity)}
 
-            if target.quantum_hardware.num_qubits != num_qubits:
-                target = target.copy()
-                target.quantum_hardware.num_qubits = num_qubits
+    @analyse
+    def process_fidelity(self, target, gate_chain):
+        # Exact unitaries of chains with at most 2 populated qubits (e.g. 'kak' benchmarks) are cheap,
+        # qubits are matched by index
+        qubits = populated_qubits_union(target, gate_chain)
+        if not self.two_qubit_fidelity or len(qubits) > 2:
+            return {}
+        fidelity = process_fidelities(
+            self.target_unitary(target, qubits), chain_unitaries([gate_arrays(gate_chain, qubits)])
+        )[0]
+        return {"Process Infidelity": abs(1 - fidelity)}
 
-            if gate_chain.quantum_hardware.num_qubits != num_qubits:
-                gate_chain = gate_chain.copy()
-                gate_chain.quantum_hardware.num_qubits = num_qubits
+    @analyse
+    def min_cnot_count(self, target, gate_chain):
+        # Per-target optimal baseline for two-qubit gate counts
+        qubits = populated_qubits(target)
+        if not self.two_qubit_fidelity or len(qubits) > 2:
+            return {}
+        return {"Minimal CNOT Count": int(min_cnot_counts(self.target_unitary(target, qubits)[None])[0])}
 
-        target_psi = matrix_to_psi(target.matrix)
-        current_psi = matrix_to_psi(gate_chain.matrix)
-        fidelity = meas_fidelity(target_psi, current_psi)
-        return {"Measurement Infidelity": abs(1-fidelity)}
+    @staticmethod
+    def target_unitary(target, qubits):
+        return target_cache.get(
+            target,
+            "unitary/" + ",".join(str(q) for q in qubits),
+            lambda: chain_unitaries([gate_arrays(target, qubits)])[0],
+        )
 
     @analyse
     def gate_chain_hardware(self, target, gate_chain):
@@ -251,22 +377,46 @@ class GateChainTransformAnalyser(BasicAnalyser):
 
     @analyse
     def check_equivalence(self, target, gate_chain):
-        # Equivalence checker needs input/output .qasm files
-        # Saving original and transformed gate chain to temporary files
         if not self.check_equiv:
             return {}
+        if is_clifford(target) and is_clifford(gate_chain):
+            # Clifford chains are equal up to global phase iff their stabilizer tableaux are equal
+            target_tableau, tableau = self.stabilizer_tableaux(target, gate_chain)
+            equiv = "equivalent_up_to_global_phase" if target_tableau == tableau else "not_equivalent"
+            return {"Equivalence Checking": equiv, "Equivalence Checking Method": "stabilizer"}
+
+        start = timer()
+        num_qubits = len(set(populated_qubits(target)) | set(populated_qubits(gate_chain)))
+        if self.equiv_precheck_samples and num_qubits <= self.equiv_precheck_max_qubits:
+            # Cheap pre-check: outputs for a few random product states, mismatch proves non-equivalence
+            fidelities = random_state_fidelities(target, gate_chain, self.equiv_precheck_samples)
+            if np.any(fidelities < self.fidelity_tol):
+                return {"Equivalence Checking": "not_equivalent", "Equivalence Checking Method": "random_states"}
+            if self.equiv_max_qubits is not None and num_qubits > self.equiv_max_qubits:
+                return {"Equivalence Checking": "probably_equivalent", "Equivalence Checking Method": "random_states"}
+        elif self.equiv_max_qubits is not None and num_qubits > self.equiv_max_qubits:
+            return {"Equivalence Checking": "no_information", "Equivalence Checking Method": "none"}
+
+        options = {}
+        if self.equiv_time_budget_s is not None:
+            options["timeout"] = max(1, int(self.equiv_time_budget_s - (timer() - start)))
+        # qcec is imported only when equivalence checking is enabled
+        qcec = import_framework("qcec")
+        # Equivalence checker needs input/output .qasm files
+        # Saving original and transformed gate chain to temporary files
         with tempfile.TemporaryDirectory() as tmpdirname:
             fname_target = os.path.join(tmpdirname, "target.qasm")
             fname_chain = os.path.join(tmpdirname, "gate_chain.qasm")
-            target.save_to_qasm(fname_target)
+            with open(fname_target, "w") as f:
+                f.write(target_cache.get(target, "qasm", target.to_qasm))
             gate_chain.save_to_qasm(fname_chain)
 
             # Checking circuit equivalence with qcec package
             equiv = qcec.verify(
-                fname_chain, fname_target, fidelity=self.fidelity_tol, removeDiagonalGatesBeforeMeasure=True
+                fname_chain, fname_target, fidelity=self.fidelity_tol, removeDiagonalGatesBeforeMeasure=True, **options
             )
 
-        return {"Equivalence Checking": equiv["equivalence"]}
+        return {"Equivalence Checking": equiv["equivalence"], "Equivalence Checking Method": "qcec"}
 
 
 class SynthesisAnalyser(BasicAnalyser):
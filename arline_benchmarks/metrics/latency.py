@@ -0,0 +1,53 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+def schedule_latency(gate_chain, gate_durations, num_qubits=None):
+    r"""Critical path latency of ASAP schedule of the gate chain
+
+    **Description:**
+        Each gate starts when all its qubits are ready and occupies them for its duration.
+        Computed in one pass over the chain with per-qubit ready times.
+        Idle time of a qubit is the part of the schedule (from 0 to the critical path latency)
+        when the populated qubit is not busy.
+
+    :param gate_durations: dict {gate name: duration}, optional key ``default`` for other gates
+    :param num_qubits: number of qubits (by default the number of hardware qubits of the chain)
+    :return: tuple (critical path latency, list of per-qubit idle times of populated qubits)
+    """
+    if num_qubits is None:
+        num_qubits = gate_chain.quantum_hardware.num_qubits
+    default_duration = gate_durations.get("default")
+    ready = [0.0] * num_qubits
+    busy = [0.0] * num_qubits
+    populated = [False] * num_qubits
+    for gc in gate_chain.chain:
+        name = gc.gate.name
+        try:
+            duration = gate_durations[name]
+        except KeyError:
+            if default_duration is None:
+                raise KeyError("Duration of gate {} is not defined".format(name))
+            duration = default_duration
+        connections = gc.connections
+        start = max(ready[q] for q in connections)
+        end = start + duration
+        for q in connections:
+            ready[q] = end
+            busy[q] += duration
+            populated[q] = True
+    latency = max(ready, default=0.0)
+    return latency, [latency - b for b, p in zip(busy, populated) if p]
@@ -0,0 +1,50 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from arline_quantum.estimators import Estimator
+
+
+class ResultSelector:
+    r"""Metric used to select the best of gate chains produced by parallel attempts
+
+    **Description:**
+        Supported metrics (the least value wins):
+
+            * ``two_qubit_gate_count`` - number of two-qubit gates
+            * ``depth`` - circuit depth
+            * ``cost`` - cost function defined by ``cost_cfg``
+    """
+
+    metrics = ("two_qubit_gate_count", "depth", "cost")
+
+    def __init__(self, metric="two_qubit_gate_count", cost_cfg={"class": "IbmCostFunction", "args": {}}):
+        if metric not in self.metrics:
+            raise ValueError("Unknown selection metric '{}', expected one of {}".format(metric, self.metrics))
+        self.metric = metric
+        self.cost_model = Estimator.from_config(cost_cfg) if metric == "cost" else None
+
+    def __call__(self, gate_chain):
+        if self.metric == "two_qubit_gate_count":
+            return sum(1 for g in gate_chain.chain if g.gate.num_qubits == 2)
+        if self.metric == "depth":
+            return gate_chain.get_depth()
+        return self.cost_model.calculate_cost(gate_chain)
+
+    def best(self, gate_chains):
+        """:return: index of the best gate chain"""
+        values = [self(c) for c in gate_chains]
+        return min(range(len(values)), key=lambda i: values[i])
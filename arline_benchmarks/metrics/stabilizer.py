@@ -0,0 +1,201 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import numpy as np
+
+from arline_benchmarks.metrics.active_qubits import populated_qubits
+
+# Clifford gates as sequences of (tableau operation, qubit positions), applied left to right
+clifford_gates = {
+    "I": [],
+    "X": [("pauli_x", (0,))],
+    "Y": [("pauli_y", (0,))],
+    "Z": [("pauli_z", (0,))],
+    "H": [("h", (0,))],
+    "S": [("s", (0,))],
+    "Sd": [("s", (0,))] * 3,
+    "Cnot": [("cnot", (0, 1))],
+    "Cz": [("h", (1,)), ("cnot", (0, 1)), ("h", (1,))],
+    "Cy": [("s", (1,))] * 3 + [("cnot", (0, 1)), ("s", (1,))],
+    "Swap": [("cnot", (0, 1)), ("cnot", (1, 0)), ("cnot", (0, 1))],
+}
+
+
+def is_clifford(gate_chain):
+    """Check that all gates of the chain are Clifford gates supported by :class:`StabilizerTableau`
+    """
+    return all(g.gate.name in clifford_gates for g in gate_chain.chain)
+
+
+class StabilizerTableau:
+    r"""Stabilizer Tableau of Clifford Circuit
+
+    **Description:**
+        Aaronson-Gottesman tableau: images of destabilizers :math:`X_i` (rows ``0..n-1``) and
+        stabilizers :math:`Z_i` (rows ``n..2n-1``) under conjugation by the circuit, as x/z bits and sign bits.
+        Columns are bit-packed over rows, so a gate updates ``2n / 8`` bytes per touched qubit.
+
+        Two Clifford circuits are equal up to global phase iff their tableaux are equal.
+        Stabilizer rows describe the output state of the circuit applied to :math:`|0 \ldots 0\rangle`,
+        its measurement outcomes are uniformly distributed over an affine subspace of bitstrings.
+
+    :param num_qubits: number of qubits
+    :type num_qubits: int
+    """
+
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        rows = np.arange(2 * num_qubits)
+        qubits = np.arange(num_qubits)[:, None]
+        # x[q], z[q] - packed bits of qubit q in all rows, r - packed sign bits
+        self.x = np.packbits(rows[None, :] == qubits, axis=1, bitorder="little")
+        self.z = np.packbits(rows[None, :] == qubits + num_qubits, axis=1, bitorder="little")
+        self.r = np.zeros(self.x.shape[1], dtype=np.uint8)
+
+    @classmethod
+    def from_gate_chain(cls, gate_chain, qubits=None):
+        """Tableau of Clifford gate chain, ``qubits`` are mapped to tableau qubits ``0, 1, ...`` in the given order
+
+        Tableaux of chains that are compared must be built with the same ``qubits``.
+
+        :param qubits: qubits of the tableau, must include all populated qubits of the chain
+                       (default: populated qubits of the chain in ascending order)
+        :type qubits: list
+        """
+        if qubits is None:
+            qubits = populated_qubits(gate_chain)
+        index = {q: i for i, q in enumerate(qubits)}
+        tableau = cls(len(qubits))
+        for g in gate_chain.chain:
+            tableau.apply(g.gate.name, [index[q] for q in g.connections])
+        return tableau
+
+    def apply(self, gate_name, qubits):
+        for operation, positions in clifford_gates[gate_name]:
+            getattr(self, operation)(*[qubits[p] for p in positions])
+
+    def pauli_x(self, a):
+        self.r ^= self.z[a]
+
+    def pauli_y(self, a):
+        self.r ^= self.x[a] ^ self.z[a]
+
+    def pauli_z(self, a):
+        self.r ^= self.x[a]
+
+    def h(self, a):
+        self.r ^= self.x[a] & self.z[a]
+        self.x[a], self.z[a] = self.z[a].copy(), self.x[a].copy()
+
+    def s(self, a):
+        self.r ^= self.x[a] & self.z[a]
+        self.z[a] ^= self.x[a]
+
+    def cnot(self, a, b):
+        self.r ^= self.x[a] & self.z[b] & ~(self.x[b] ^ self.z[a])
+        self.x[b] ^= self.x[a]
+        self.z[a] ^= self.z[b]
+
+    def __eq__(self, other):
+        return (
+            self.num_qubits == other.num_qubits
+            and np.array_equal(self.x, other.x)
+            and np.array_equal(self.z, other.z)
+            and np.array_equal(self._unpack(self.r[None, :])[0], self._unpack(other.r[None, :])[0])
+        )
+
+    def _unpack(self, packed):
+        return np.unpackbits(packed, axis=1, count=2 * self.num_qubits, bitorder="little").astype(bool)
+
+    def stabilizers(self):
+        """Stabilizer generators of the output state
+
+        :return: tuple of bool arrays (x, z, r), x and z have shape (num_qubits, num_qubits), one row per generator
+        """
+        n = self.num_qubits
+        x = self._unpack(self.x).T[n:]
+        z = self._unpack(self.z).T[n:]
+        r = self._unpack(self.r[None, :])[0][n:]
+        return x, z, r
+
+    def measurement_constraints(self):
+        """Measurement outcomes of the output state are the solutions of ``m @ bits = b (mod 2)``
+
+        :return: tuple of bool arrays (m, b), independent rows
+        """
+        x, z, r = (a.copy() for a in self.stabilizers())
+        n = self.num_qubits
+        used = np.zeros(n, dtype=bool)
+        for col in range(n):
+            candidates = np.flatnonzero(x[:, col] & ~used)
+            if len(candidates) == 0:
+                continue
+            pivot = candidates[0]
+            used[pivot] = True
+            for row in np.flatnonzero(x[:, col]):
+                if row != pivot:
+                    r[row] = _pauli_product_sign(x[pivot], z[pivot], r[pivot], x[row], z[row], r[row])
+                    x[row] ^= x[pivot]
+                    z[row] ^= z[pivot]
+        # Generators without X part are Z type stabilizers (-1)^b Z^m, outcomes satisfy m @ bits = b
+        return z[~used], r[~used]
+
+
+def _pauli_product_sign(x1, z1, r1, x2, z2, r2):
+    """Sign bit of product of commuting Pauli operators (rowsum of Aaronson-Gottesman)
+    """
+    x1, z1, x2, z2 = (np.asarray(a, dtype=np.int64) for a in (x1, z1, x2, z2))
+    g = np.where(
+        x1 & z1,
+        z2 - x2,
+        np.where(x1, z2 * (2 * x2 - 1), np.where(z1, x2 * (1 - 2 * z2), 0)),
+    )
+    return bool(((2 * int(r1) + 2 * int(r2) + int(g.sum())) % 4) // 2)
+
+
+def gf2_rank(m):
+    """Rank of bool matrix over GF(2)
+    """
+    m = np.array(m, dtype=bool)
+    rank = 0
+    for col in range(m.shape[1]):
+        rows = np.flatnonzero(m[rank:, col]) + rank
+        if len(rows) == 0:
+            continue
+        m[[rank, rows[0]]] = m[[rows[0], rank]]
+        others = np.flatnonzero(m[:, col])
+        m[others[others != rank]] ^= m[rank]
+        rank += 1
+        if rank == m.shape[0]:
+            break
+    return rank
+
+
+def measurement_fidelity(tableau_1, tableau_2):
+    """Classical fidelity of measurement outcome distributions of output states of two tableaux
+
+    Outcomes are uniform over affine subspaces A and B, the fidelity is :math:`|A \\cap B|^2 / (|A| |B|)`.
+    """
+    m1, b1 = tableau_1.measurement_constraints()
+    m2, b2 = tableau_2.measurement_constraints()
+    m = np.vstack([m1, m2])
+    b = np.concatenate([b1, b2])
+    rank = gf2_rank(m)
+    if gf2_rank(np.column_stack([m, b])) > rank:
+        # Inconsistent constraints, supports do not intersect
+        return 0.0
+    return 2.0 ** (len(m1) + len(m2) - 2 * rank)
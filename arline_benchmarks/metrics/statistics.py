@@ -0,0 +1,108 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import math
+
+import numpy as np
+from scipy import stats
+
+
+def confidence_interval(values, confidence=0.95):
+    """Student's t confidence interval of the mean
+
+    :return: tuple (mean, half width of the interval), half width is inf for less than 2 values
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return float("nan"), float("inf")
+    mean = values.mean()
+    if len(values) < 2:
+        return mean, float("inf")
+    sem = values.std(ddof=1) / math.sqrt(len(values))
+    return mean, stats.t.ppf(0.5 + confidence / 2, len(values) - 1) * sem
+
+
+class AdaptiveSampleSize:
+    r"""Adaptive Sample Size
+
+    **Description:**
+        Decides when enough targets have been benchmarked in a (pipeline, hardware, target generator) cell.
+        Sampling stops when for every metric of ``stage`` the confidence interval half width is below
+        ``max(abs_tol, rel_tol * |mean|)`` (but not before ``min_number`` targets) or when ``max_number``
+        targets are done.
+
+        Config (``adaptive`` key of the target config)::
+
+            {
+                metrics: ['Two-Qubit Gate Count', 'Execution Time'],
+                stage: 'mapping_compression',  // default: the last stage of the pipeline
+                confidence: 0.95,
+                rel_tol: 0.05,
+                abs_tol: 0,
+                min_number: 5,
+                max_number: 100,
+            }
+    """
+
+    def __init__(self, config, default_stage_id=None):
+        self.metrics = list(config["metrics"])
+        self.stage_id = config.get("stage", default_stage_id)
+        self.confidence = config.get("confidence", 0.95)
+        self.rel_tol = config.get("rel_tol", 0.05)
+        self.abs_tol = config.get("abs_tol", 0.0)
+        self.min_number = max(config.get("min_number", 5), 2)
+        self.max_number = config.get("max_number", 100)
+        if self.max_number < self.min_number:
+            raise ValueError("Adaptive sampling: max_number must be >= min_number")
+        self.values = {m: [] for m in self.metrics}
+
+    def add(self, stage_reports):
+        """Add results of a job
+
+        :param stage_reports: dict {stage_id: analyser report}
+        """
+        report = stage_reports[self.stage_id]
+        for m in self.metrics:
+            if m not in report:
+                raise KeyError("Adaptive sampling: metric '{}' is not reported by stage {}".format(m, self.stage_id))
+            self.values[m].append(float(report[m]))
+
+    @property
+    def number(self):
+        return len(self.values[self.metrics[0]])
+
+    def intervals(self):
+        """:return: dict {metric: (mean, half width)}"""
+        return {m: confidence_interval(v, self.confidence) for m, v in self.values.items()}
+
+    def converged(self):
+        if self.number < self.min_number:
+            return False
+        return all(
+            half_width <= max(self.abs_tol, self.rel_tol * abs(mean)) for mean, half_width in self.intervals().values()
+        )
+
+    def done(self):
+        return self.number >= self.max_number or self.converged()
+
+    def report(self):
+        """Columns added to the .csv report
+        """
+        r = {"Adaptive Sample Size": self.number, "Adaptive Sampling Converged": self.converged()}
+        for m, (mean, half_width) in self.intervals().items():
+            r["{} CI Half Width".format(m)] = half_width
+        return r
@@ -0,0 +1,140 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import hashlib
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+
+def value_size(value):
+    """Approximate memory size (bytes) of cached value
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(value_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(value_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class TargetCache:
+    r"""Run-wide Cache of Target-side Analysis Results
+
+    **Description:**
+        Target circuits are analysed once per stage of every pipeline, and the same targets are regenerated
+        by every pipeline of a run. Values that depend only on the target (analyser report of the
+        ``target_analysis`` stage, target statevectors used for fidelity, target .qasm used for equivalence
+        checking) are computed once and shared.
+
+        Entries are keyed by the hash of the target hardware name and its .qasm serialization, so equal
+        targets generated by different pipelines share entries. Keys are memoized per target object.
+        The least recently used entries are evicted when the total size exceeds ``max_bytes``
+        (``max_bytes = 0`` disables caching).
+
+        Cached values are shared and must not be modified.
+
+    :param max_bytes: memory limit of cached values
+    :type max_bytes: int
+    """
+
+    def __init__(self, max_bytes=512 * 2**20):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._keys = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys = weakref.WeakKeyDictionary()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def target_key(self, target):
+        """Content hash of target gate chain, None if target is not a gate chain
+        """
+        try:
+            return self._keys[target]
+        except (KeyError, TypeError):
+            pass
+        if not hasattr(target, "to_qasm"):
+            return None
+        data = "{}\n{}".format(target.quantum_hardware.name, target.to_qasm(qreg_name="q"))
+        key = hashlib.sha256(data.encode("utf-8")).hexdigest()
+        try:
+            self._keys[target] = key
+        except TypeError:
+            pass
+        return key
+
+    def get(self, target, name, compute):
+        """Return cached value ``name`` of target, call ``compute()`` on cache miss
+        """
+        if self.max_bytes <= 0:
+            return compute()
+        target_key = self.target_key(target)
+        if target_key is None:
+            return compute()
+        key = (target_key, name)
+        with self._lock:
+            try:
+                value, size = self._entries[key]
+            except KeyError:
+                pass
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = compute()
+        size = value_size(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+        return value
+
+    def __len__(self):
+        return len(self._entries)
+
+    def summary(self):
+        return (
+            f"Target cache: {self.hits} hits, {self.misses} misses, {self.evictions} evictions, "
+            f"{len(self)} entries, {self.size} bytes"
+        )
+
+
+target_cache = TargetCache()
@@ -0,0 +1,130 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import numpy as np
+
+from arline_benchmarks.metrics.active_qubits import populated_qubits
+
+_identity_2 = np.eye(2, dtype=np.complex128)
+_swap = np.eye(4, dtype=np.complex128)[[0, 2, 1, 3]]
+
+
+def gate_arrays(gate_chain, qubits=None):
+    """Stacked 4x4 matrices of gates of a chain with at most 2 populated qubits
+
+    ``qubits`` are mapped to ``0, 1`` in the given order, qubit 0 is the least significant bit.
+    Chains that are compared must use the same ``qubits``.
+
+    :param qubits: at most 2 qubits, must include all populated qubits of the chain
+                   (default: populated qubits of the chain in ascending order)
+    :type qubits: list
+    :return: array of shape (num_gates, 4, 4)
+    """
+    if qubits is None:
+        qubits = populated_qubits(gate_chain)
+    index = {q: i for i, q in enumerate(qubits)}
+    if len(index) > 2:
+        raise ValueError(f"Expected chain with at most 2 populated qubits, got {len(index)}")
+    arrays = np.empty((len(gate_chain.chain), 4, 4), dtype=np.complex128)
+    one_qubit = {0: [], 1: []}
+    for i, g in enumerate(gate_chain.chain):
+        u = np.asarray(g.gate.u, dtype=np.complex128)
+        if len(g.connections) == 1:
+            one_qubit[index[g.connections[0]]].append((i, u))
+        elif index[g.connections[0]] == 1:
+            # First connection corresponds to the most significant index of the gate matrix
+            arrays[i] = u
+        else:
+            arrays[i] = _swap @ u @ _swap
+    for qubit, gates in one_qubit.items():
+        if gates:
+            positions, u = zip(*gates)
+            # Batched Kronecker products I x u (qubit 0) or u x I (qubit 1)
+            pair = (_identity_2, np.stack(u)) if qubit == 0 else (np.stack(u), _identity_2)
+            subscripts = "ab,ncd->nacbd" if qubit == 0 else "nab,cd->nacbd"
+            arrays[list(positions)] = np.einsum(subscripts, *pair).reshape(-1, 4, 4)
+    return arrays
+
+
+def chain_unitaries(arrays_list):
+    """Unitaries of several chains given by stacked gate matrices (see :func:`gate_arrays`)
+
+    Chains are padded with identities to the same length and the gate products are reduced pairwise,
+    each reduction step is a single batched matrix multiplication over all chains.
+
+    :return: array of shape (num_chains, 4, 4)
+    """
+    length = max([len(a) for a in arrays_list] + [1])
+    batch = np.tile(np.eye(4, dtype=np.complex128), (len(arrays_list), length, 1, 1))
+    for i, a in enumerate(arrays_list):
+        batch[i, :len(a)] = a
+    while batch.shape[1] > 1:
+        if batch.shape[1] % 2:
+            batch = np.concatenate([batch, np.tile(np.eye(4), (batch.shape[0], 1, 1, 1))], axis=1)
+        # Later gates multiply from the left
+        batch = np.matmul(batch[:, 1::2], batch[:, 0::2])
+    return batch[:, 0]
+
+
+def process_fidelities(target_unitary, unitaries):
+    """Process fidelities :math:`|Tr(U^\\dagger V)|^2 / 16` of unitaries with the target
+
+    Qubits of the unitaries are matched to the target by index (see :func:`gate_arrays`).
+
+    :param target_unitary: 4x4 unitary
+    :param unitaries: array of shape (num_chains, 4, 4)
+    :return: array of num_chains fidelities
+    """
+    overlaps = np.einsum("ij,nij->n", target_unitary.conj(), unitaries)
+    return np.abs(overlaps) ** 2 / 16
+
+
+_yy = np.kron(np.array([[0, -1j], [1j, 0]]), np.array([[0, -1j], [1j, 0]]))
+
+
+def min_cnot_counts(unitaries, atol=1e-6):
+    r"""Minimal number of CNOT gates needed to implement two-qubit unitaries (with any single-qubit gates)
+
+    **Description:**
+        Uses invariants of the local equivalence class (equivalent to Makhlin invariants and the position of the
+        unitary in the Weyl chamber of KAK decomposition) computed from
+        :math:`\gamma(U) = U (Y \otimes Y) U^T (Y \otimes Y)`, :math:`U \in SU(4)`
+        (V. Shende, I. Markov, S. Bullock, Phys. Rev. A 69, 062321 (2004)):
+
+            * 0 CNOTs iff :math:`\gamma(U) = \pm I`
+            * 1 CNOT iff eigenvalues of :math:`\gamma(U)` are :math:`\{i, i, -i, -i\}`
+            * 2 CNOTs iff :math:`Tr \, \gamma(U)` is real
+            * 3 CNOTs otherwise
+
+        All checks are vectorized over the batch.
+
+    :param unitaries: array of shape (num_unitaries, 4, 4)
+    :return: int array of minimal CNOT counts
+    """
+    unitaries = np.asarray(unitaries, dtype=np.complex128)
+    # Normalize to SU(4), gamma is defined up to sign
+    su = unitaries / (np.linalg.det(unitaries) ** 0.25)[:, None, None]
+    gamma = su @ _yy @ np.transpose(su, (0, 2, 1)) @ _yy
+    identity = np.eye(4)
+    trace = np.trace(gamma, axis1=1, axis2=2)
+    zero = np.all(np.isclose(gamma, identity, atol=atol), axis=(1, 2)) | np.all(
+        np.isclose(gamma, -identity, atol=atol), axis=(1, 2)
+    )
+    # Unitary gamma with eigenvalues +-i squares to -I, zero trace gives two eigenvalues of each sign
+    one = np.all(np.isclose(gamma @ gamma, -identity, atol=atol), axis=(1, 2)) & np.isclose(trace, 0, atol=atol)
+    two = np.isclose(trace.imag, 0, atol=atol)
+    return np.select([zero, one, two], [0, 1, 2], default=3)
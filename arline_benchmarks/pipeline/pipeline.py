@@ -17,45 +17,85 @@
 
 from tqdm import tqdm
 
+from arline_benchmarks.profiling.tracer import tracer
 from arline_benchmarks.strategies.strategy import Strategy
 
 
+def stage_analyse_mode(st_cfg):
+    """Analysis of the stage output: ``full`` (default), ``light`` (gate counts and timing) or ``none`` (timing)
+
+    :raises ValueError: on unknown ``analyse`` option
+    """
+    mode = st_cfg.get("analyse", "full")
+    if mode not in ("full", "light", "none"):
+        raise ValueError("Unknown analyse option '{}' of stage {}".format(mode, st_cfg["id"]))
+    return mode
+
+
 class Pipeline:
     r"""Abstract Class for Pipeline
     """
 
-    def __init__(self, pipeline_id, stages, run_analyser):
+    def __init__(self, pipeline_id, stages, run_analyser, log_writer=None, profiler=None, strategy_pool=None):
         self.stages = stages
+        self.log_writer = log_writer
+        self.profiler = profiler
         self.run_analyser = run_analyser
         self.stage_results = []
         self.analyser_report_history = []
         self.id = pipeline_id
         self.strategy_list = []
         for st_cfg in stages:
-            self.strategy_list.append(Strategy.from_config(st_cfg))
+            self.strategy_list.append(Strategy.from_config(st_cfg, strategy_pool))
 
-    def run(self, target):
+    def run(self, target, target_id=None):
         self.stage_results = []
         self.analyser_report_history.clear()
         prev_stage_result = target
         # Sequentially execute strategies (stages) in compilation pipeline
-        for strategy in self.strategy_list:
-            tqdm.write("Pipeline ID: {}; Strategy: {}".format(self.id, str(strategy)))
-            prev_stage_result = strategy.run(prev_stage_result, self.run_analyser)
+        for st_cfg, strategy in zip(self.stages, self.strategy_list):
+            self.log("Pipeline ID: {}; Strategy: {}".format(self.id, str(strategy)))
+            analyse_mode = self.get_analyse_mode(st_cfg)
+            strategy.analyse_mode = analyse_mode
+            run_analyser = analyse_mode != "none"
+            with tracer.context(stage_id=st_cfg["id"]):
+                stage_start = tracer.begin_stage()
+                if self.profiler is not None and self.profiler.is_profiled(st_cfg):
+                    with self.profiler.profile(self.id, target_id, st_cfg):
+                        prev_stage_result = strategy.run(prev_stage_result, run_analyser)
+                else:
+                    prev_stage_result = strategy.run(prev_stage_result, run_analyser)
+                tracer.end_stage(stage_start, strategy=st_cfg["strategy"])
             self.stage_results.append(prev_stage_result)
             # Return analyser results for the current compilation stage
             if self.run_analyser:
-                strategy.analyser_report["Total Execution Time"] = self.get_accumulated_execution_time(
-                    strategy.analyser_report["Execution Time"]
-                )
-                strategy.analyser_report["Full Check"] = (
-                    strategy.analyser_report["Connectivity Satisfied"]
-                    and strategy.analyser_report["Gate Set Satisfied"]
-                    and strategy.analyser_report["Qubit Number Satisfied"]
-                )
-                self.analyser_report_history.append(strategy.analyser_report)
+                if run_analyser:
+                    report = strategy.analyser_report
+                else:
+                    report = {"Execution Time": strategy.execution_time}
+                report["Total Execution Time"] = self.get_accumulated_execution_time(report["Execution Time"])
+                if analyse_mode == "full":
+                    report["Full Check"] = (
+                        report["Connectivity Satisfied"]
+                        and report["Gate Set Satisfied"]
+                        and report["Qubit Number Satisfied"]
+                    )
+                self.analyser_report_history.append(report)
         return prev_stage_result
 
+    def get_analyse_mode(self, st_cfg):
+        """Analysis of the stage output, ``none`` for all stages if the analyser is disabled
+        """
+        if not self.run_analyser:
+            return "none"
+        return stage_analyse_mode(st_cfg)
+
+    def log(self, msg):
+        if self.log_writer is None:
+            tqdm.write(msg)
+        else:
+            self.log_writer.write(msg)
+
     def get_accumulated_execution_time(self, last_stage_execution_time):
         if not self.analyser_report_history:
             return last_stage_execution_time
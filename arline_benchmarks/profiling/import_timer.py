@@ -0,0 +1,63 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import importlib
+import sys
+from collections import OrderedDict
+from timeit import default_timer as timer
+
+# Top-level modules of compilation frameworks and other heavy dependencies
+framework_modules = {
+    "qiskit": ["qiskit"],
+    "cirq": ["cirq"],
+    "pytket": ["pytket"],
+    "pyzx": ["pyzx"],
+    "voqc": ["pyvoqc"],
+    "qcec": ["jkq.qcec"],
+}
+
+# Import time in seconds by framework (or module) name, in the order of import
+import_costs = OrderedDict()
+
+
+def timed_import(module_name, cost_name=None):
+    """Import module and record import time under ``cost_name`` (module name by default)
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    start_time = timer()
+    module = importlib.import_module(module_name)
+    cost_name = module_name if cost_name is None else cost_name
+    import_costs[cost_name] = import_costs.get(cost_name, 0) + timer() - start_time
+    return module
+
+
+def import_framework(framework):
+    """Import all top-level modules of the framework, returns the last imported module
+    """
+    module = None
+    for module_name in framework_modules[framework]:
+        module = timed_import(module_name, cost_name=framework)
+    return module
+
+
+def import_cost_report():
+    lines = ["Import time by framework/module:"]
+    for name, cost in import_costs.items():
+        lines.append("    {:<50} {:8.3f} s".format(name, cost))
+    lines.append("    {:<50} {:8.3f} s".format("Total", sum(import_costs.values())))
+    return "\n".join(lines)
@@ -0,0 +1,161 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import cProfile
+import io
+import pstats
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from os import makedirs, path
+
+from tqdm import tqdm
+
+
+class SamplingProfiler:
+    r"""Sampling Profiler
+
+    **Description:**
+        Periodically samples the call stack of a thread and counts collapsed stacks
+        (``module:function;module:function count`` format accepted by flamegraph tools).
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._thread_id = None
+
+    def start(self, thread_id=None):
+        self._thread_id = threading.get_ident() if thread_id is None else thread_id
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+        return self.stacks
+
+    def _sample_loop(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(
+                    "{}:{}".format(frame.f_globals.get("__name__", frame.f_code.co_filename), frame.f_code.co_name)
+                )
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+
+def save_collapsed_stacks(stacks, filename):
+    with open(filename, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write("{} {}\n".format(stack, count))
+
+
+class StageProfiler:
+    r"""Pipeline Stage Profiler
+
+    **Description:**
+        Profiles selected pipeline stages with :mod:`cProfile` (``cprofile`` mode) or :class:`SamplingProfiler`
+        (``sampling`` mode). Profilers are not combined, so that sampled stacks do not include cProfile overhead.
+        Stages are selected by stage id or by ``profile`` option in the stage config
+        (``true`` for the default mode, ``cprofile`` or ``sampling``).
+
+        For every (pipeline, target, stage) run saves ``<pipeline>_<target>_<stage>.pstats``
+        (or ``.collapsed`` in sampling mode) file; profiles aggregated over all targets are saved to
+        ``<pipeline>_<stage>_all_targets.pstats`` (``.collapsed``) by :meth:`save_aggregated`.
+        Output directory is created when the first profile is saved.
+    """
+
+    modes = ("cprofile", "sampling")
+
+    def __init__(self, output_dir, stage_ids=(), sampling_interval=0.001, mode="cprofile"):
+        if mode not in self.modes:
+            raise ValueError(f"Unknown profiler mode '{mode}', expected one of {self.modes}")
+        self.output_dir = output_dir
+        self.stage_ids = set(stage_ids)
+        self.sampling_interval = sampling_interval
+        self.mode = mode
+        self._stats = {}
+        self._stacks = {}
+
+    def get_mode(self, stage_cfg):
+        """Profiler mode of the stage, None if the stage is not profiled
+        """
+        option = stage_cfg.get("profile", False)
+        if option in self.modes:
+            return option
+        if option is True or stage_cfg["id"] in self.stage_ids:
+            return self.mode
+        return None
+
+    def is_profiled(self, stage_cfg):
+        return self.get_mode(stage_cfg) is not None
+
+    def _file_name(self, *ids):
+        makedirs(self.output_dir, exist_ok=True)
+        return path.join(self.output_dir, "_".join(re.sub(r"[^\w.-]", "_", str(i)) for i in ids))
+
+    @contextmanager
+    def profile(self, pipeline_id, target_id, stage_cfg):
+        key = (pipeline_id, stage_cfg["id"])
+        file_name = self._file_name(pipeline_id, target_id, stage_cfg["id"])
+        if self.get_mode(stage_cfg) == "sampling":
+            sampler = SamplingProfiler(self.sampling_interval)
+            sampler.start()
+            try:
+                yield
+            finally:
+                stacks = sampler.stop()
+                save_collapsed_stacks(stacks, file_name + ".collapsed")
+                self._stacks.setdefault(key, Counter()).update(stacks)
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(file_name + ".pstats")
+            if key in self._stats:
+                self._stats[key].add(profiler)
+            else:
+                self._stats[key] = pstats.Stats(profiler)
+
+    def save_aggregated(self):
+        """Save profiles aggregated over targets and print the most expensive functions
+        """
+        for (pipeline_id, stage_id), stats in self._stats.items():
+            file_name = self._file_name(pipeline_id, stage_id, "all_targets")
+            stats.dump_stats(file_name + ".pstats")
+            stream = io.StringIO()
+            stats.stream = stream
+            stats.sort_stats("cumulative").print_stats(15)
+            tqdm.write(
+                "\nProfile of pipeline {}, stage {} (all targets):\n{}".format(pipeline_id, stage_id, stream.getvalue())
+            )
+        for (pipeline_id, stage_id), stacks in self._stacks.items():
+            file_name = self._file_name(pipeline_id, stage_id, "all_targets")
+            save_collapsed_stacks(stacks, file_name + ".collapsed")
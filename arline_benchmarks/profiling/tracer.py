@@ -0,0 +1,182 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from timeit import default_timer as timer
+
+
+class Tracer:
+    r"""Span Tracer
+
+    **Description:**
+        Records time spans of benchmark run phases:
+
+            * ``job`` - pipeline run on a single target, including saving of results
+            * ``generate`` - target circuit generation
+            * ``stage`` - single pipeline stage (strategy run)
+            * ``convert-in``, ``compile``, ``convert-out``, ``analyse`` - phases of the stage
+            * ``write`` - saving output circuits and report lines
+
+        Each span has start/end time, process and thread id and the ids of pipeline, target and stage it belongs to.
+        Spans are streamed to .jsonl file and to a file in Chrome Trace Event format
+        (viewable in Perfetto or chrome://tracing), spans are not kept in memory.
+
+        ``compile`` span of a stage is reported by the strategy itself (see :meth:`Strategy.record_execution_time`),
+        ``convert-in`` and ``convert-out`` spans are the remaining parts of the stage before and after it.
+        Tracing is disabled by default and costs nothing in this case.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._jsonl_file = None
+        self._chrome_trace_file = None
+        self._num_events = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = timer()
+
+    def start(self, jsonl_path=None, chrome_trace_path=None):
+        if jsonl_path is not None:
+            self._jsonl_file = open(jsonl_path, "w")
+        if chrome_trace_path is not None:
+            self._chrome_trace_file = open(chrome_trace_path, "w")
+            self._chrome_trace_file.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+            self._num_events = 0
+        self.enabled = True
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        if self._jsonl_file is not None:
+            self._jsonl_file.close()
+            self._jsonl_file = None
+        if self._chrome_trace_file is not None:
+            self._chrome_trace_file.write("\n]}\n")
+            self._chrome_trace_file.close()
+            self._chrome_trace_file = None
+
+    def _get_context(self):
+        try:
+            return self._local.context
+        except AttributeError:
+            self._local.context = {}
+            return self._local.context
+
+    def _get_phases(self):
+        try:
+            return self._local.phases
+        except AttributeError:
+            self._local.phases = {}
+            return self._local.phases
+
+    @contextmanager
+    def context(self, **ids):
+        """Attach ids (e.g. ``pipeline_id``, ``target_id``, ``stage_id``) to all spans recorded in this thread
+        """
+        if not self.enabled:
+            yield
+            return
+        ctx = self._get_context()
+        old_ctx = ctx.copy()
+        ctx.update(ids)
+        try:
+            yield
+        finally:
+            ctx.clear()
+            ctx.update(old_ctx)
+
+    @contextmanager
+    def span(self, phase, **args):
+        if not self.enabled:
+            yield
+            return
+        start = timer()
+        try:
+            yield
+        finally:
+            self.add_span(phase, start, timer(), **args)
+
+    def add_span(self, phase, start, end, **args):
+        if not self.enabled:
+            return
+        self._get_phases()[phase] = (start, end)
+        span = {
+            "phase": phase,
+            "start": start - self._origin,
+            "end": end - self._origin,
+            "pid": os.getpid(),
+            "thread": threading.get_ident(),
+        }
+        span.update(self._get_context())
+        span.update(args)
+        with self._lock:
+            if self._jsonl_file is not None:
+                self._jsonl_file.write(json.dumps(span, default=str) + "\n")
+                self._jsonl_file.flush()
+            if self._chrome_trace_file is not None:
+                if self._num_events:
+                    self._chrome_trace_file.write(",\n")
+                self._chrome_trace_file.write(json.dumps(self.chrome_trace_event(span), default=str))
+                self._num_events += 1
+
+    def begin_stage(self):
+        """Forget phases recorded for the previous stage
+        """
+        if self.enabled:
+            self._get_phases().clear()
+        return timer()
+
+    def end_stage(self, stage_start, **args):
+        """Record ``stage`` span and derive ``convert-in``/``convert-out`` spans around ``compile`` span
+        """
+        if not self.enabled:
+            return
+        stage_end = timer()
+        phases = self._get_phases()
+        if "compile" in phases:
+            compile_start, compile_end = phases["compile"]
+            convert_out_end = phases["analyse"][0] if "analyse" in phases else stage_end
+            self.add_span("convert-in", stage_start, max(compile_start, stage_start))
+            self.add_span("convert-out", compile_end, max(convert_out_end, compile_end))
+        self.add_span("stage", stage_start, stage_end, **args)
+
+    @staticmethod
+    def chrome_trace_event(span):
+        """Span as complete event (``ph: X``) of Chrome Trace Event format
+        """
+        args = {k: v for k, v in span.items() if k not in ("phase", "start", "end", "pid", "thread")}
+        name = span["phase"]
+        if "stage_id" in span and span["phase"] != "job":
+            name = "{}: {}".format(span["stage_id"], span["phase"])
+        return {
+            "name": name,
+            "cat": span["phase"],
+            "ph": "X",
+            "ts": span["start"] * 1e6,
+            "dur": (span["end"] - span["start"]) * 1e6,
+            "pid": span["pid"],
+            "tid": span["thread"],
+            "args": args,
+        }
+
+
+# Process-wide tracer
+tracer = Tracer()
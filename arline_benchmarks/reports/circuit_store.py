@@ -0,0 +1,80 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import hashlib
+from os import makedirs, path
+
+
+class CircuitStore:
+    r"""Content-Addressed Circuit Store
+
+    **Description:**
+        Saves gate chains to .qasm files named by the hash of their canonical serialization.
+        Identical circuits (e.g. ``target_analysis`` outputs shared by all pipelines, or byte-identical
+        outputs of different compilers) are written to disk only once and are referenced by hash.
+
+    :param root_dir: directory for .qasm files
+    :type root_dir: str
+    :param hash_name: name of :mod:`hashlib` hash function
+    :type hash_name: str
+    """
+
+    def __init__(self, root_dir, hash_name="sha256"):
+        self.root_dir = root_dir
+        self.hash_name = hash_name
+        self._stored = set()
+        self.num_circuits = 0
+        self.bytes_written = 0
+        self.bytes_deduplicated = 0
+        makedirs(self.root_dir, exist_ok=True)
+
+    @staticmethod
+    def serialize(gate_chain):
+        """Canonical serialization of gate chain
+        """
+        return gate_chain.to_qasm(qreg_name="q").encode("utf-8")
+
+    def get_path(self, digest):
+        return path.join(self.root_dir, digest + ".qasm")
+
+    def put(self, gate_chain):
+        """Save gate chain if it is not stored yet
+
+        :return: tuple (hash, path to .qasm file)
+        """
+        data = self.serialize(gate_chain)
+        digest = hashlib.new(self.hash_name, data).hexdigest()
+        file_path = self.get_path(digest)
+        self.num_circuits += 1
+        if digest in self._stored or path.exists(file_path):
+            self.bytes_deduplicated += len(data)
+        else:
+            with open(file_path, "wb") as f:
+                f.write(data)
+            self.bytes_written += len(data)
+        self._stored.add(digest)
+        return digest, file_path
+
+    @property
+    def num_unique_circuits(self):
+        return len(self._stored)
+
+    def summary(self):
+        return (
+            f"Circuit store: {self.num_circuits} circuits, {self.num_unique_circuits} unique, "
+            f"{self.bytes_written} bytes written, {self.bytes_deduplicated} bytes deduplicated"
+        )
@@ -184,8 +184,14 @@ class BenchmarkPlotter:
             plt.subplots_adjust(top=0.9)
 
         if baseline:
+            # Per-target baseline column (e.g. 'Minimal CNOT Count') is averaged over targets like the bars,
+            # constant value is used if the report has no such column
+            baseline_value = baseline.get("value")
+            column = baseline.get("column")
+            if column is not None and column in data.columns and data[column].notna().any():
+                baseline_value = data[column].mean()
             plt.hlines(
-                baseline["value"],
+                baseline_value,
                 plt.gca().get_xlim()[0],
                 plt.gca().get_xlim()[1],
                 **baseline["style"],
@@ -42,6 +42,18 @@ class CsvResultsLogger:
         d.update({k: v for k, v in zip(self._id_columns_names, line_id)})
         self._data.append(d)
 
+    def __len__(self):
+        return len(self._data)
+
+    def update_results(self, data, first_row=0, where=None):
+        """Add ``data`` to already logged rows starting from ``first_row``
+
+        :param where: update only rows with these column values, dict {column name: value}
+        """
+        for d in self._data[first_row:]:
+            if where is None or all(d.get(k) == v for k, v in where.items()):
+                d.update(data)
+
     def close(self):
         columns_names = list(self._id_columns_names)
         columns_names += self._columns_order
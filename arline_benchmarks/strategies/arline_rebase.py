@@ -40,7 +40,7 @@ class ArlineRebase(RebaseStrategy):
         else:
             raise NotImplementedError()
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain.quantum_hardware = self.quantum_hardware
 
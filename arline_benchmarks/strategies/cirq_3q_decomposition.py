@@ -41,7 +41,7 @@ class Cirq3qDecomposition(CompressionStrategy):
         operations = three_qubit_matrix_to_operations(a, b, c, matrix_u)
         circuit_object = cirq.Circuit(operations)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = GateChain.convert_from(circuit_object, format_id="cirq")
         gate_chain.quantum_hardware = self.quantum_hardware
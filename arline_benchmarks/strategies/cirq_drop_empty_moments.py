@@ -38,7 +38,7 @@ class CirqDropEmptyMoments(CompressionStrategy):
         # drop empty moments
         DropEmptyMoments().optimize_circuit(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = GateChain.convert_from(circuit_object, format_id="cirq")
         gate_chain.quantum_hardware = self.quantum_hardware
@@ -46,7 +46,7 @@ class CirqEjectPhasedPaulis(CompressionStrategy):
         eject_paulis = EjectPhasedPaulis()
         eject_paulis.optimize_circuit(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = GateChain.convert_from(circuit_object, format_id="cirq")
         gate_chain.quantum_hardware = self.quantum_hardware
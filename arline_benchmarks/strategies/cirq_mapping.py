@@ -20,6 +20,8 @@ from typing import List
 
 import cirq.contrib.routing as ccr
 from arline_benchmarks.strategies.strategy import MappingStrategy
+from arline_benchmarks.strategies.parallel import derive_seeds, parallel_map
+from arline_benchmarks.config_parser.hardware_cache import cached_hardware_conversion
 from arline_quantum.gate_chain.gate_chain import GateChain
 from arline_quantum.qubit_connectivities.qubit_connectivity import All2All
 from cirq import CNotPowGate, ExpandComposite, LineQubit, NamedQubit
@@ -27,8 +29,48 @@ from cirq import CNotPowGate, ExpandComposite, LineQubit, NamedQubit
 _strategy_class_name = "CirqMapping"
 
 
+def _route_attempt(circuit_object, cirq_hardware, router, algo_name, random_state, max_search_radius):
+    return ccr.route_circuit(
+        circuit_object,
+        cirq_hardware,
+        router=router,
+        algo_name=algo_name,
+        random_state=random_state,
+        max_search_radius=max_search_radius,
+    )
+
+
+def route_circuit_best_of(
+    circuit_object, cirq_hardware, routing_attempts, router, algo_name, random_state, max_search_radius, max_workers
+):
+    """Route circuit ``routing_attempts`` times with distinct seeds derived from ``random_state``
+
+    Attempts run concurrently in up to ``max_workers`` processes.
+
+    :return: the best swap network
+    """
+    swap_networks: List[ccr.SwapNetwork] = parallel_map(
+        _route_attempt,
+        [
+            (circuit_object, cirq_hardware, router, algo_name, seed, max_search_radius)
+            for seed in derive_seeds(random_state, routing_attempts)
+        ],
+        max_workers=max_workers,
+    )
+    assert len(swap_networks) > 0, "Unable to get routing for circuit"
+    # Sort by the least number of qubits first (as routing sometimes adds extra ancilla qubits),
+    # and then the length of the circuit second.
+    swap_networks.sort(key=lambda swap_network: (len(swap_network.circuit.all_qubits()), len(swap_network.circuit)))
+    return swap_networks[0]
+
+
 class CirqMapping(MappingStrategy):
     r"""Cirq Mapping Strategy
+
+    **Description:**
+        Routing is repeated ``routing_attempts`` times with distinct seeds (the first one is ``random_state``)
+        in up to ``max_workers`` processes (number of attempts, at most the number of CPUs, by default),
+        the best swap network is kept.
     """
 
     def __init__(
@@ -39,15 +81,19 @@ class CirqMapping(MappingStrategy):
         algo_name="greedy",
         random_state=1,
         max_search_radius=1,
+        max_workers=None,
         analyser_options={},
     ):
         super().__init__(hardware, analyser_options)
-        self.cirq_hardware = self.quantum_hardware.convert_to_cirq_hardware()
+        self.cirq_hardware = cached_hardware_conversion(
+            hardware, "cirq", self.quantum_hardware.convert_to_cirq_hardware
+        )
         self.routing_attempts = routing_attempts
         self.router = router
         self.algo_name = algo_name
         self.random_state = random_state
         self.max_search_radius = max_search_radius
+        self.max_workers = max_workers
 
     def run(self, target, run_analyser=True):
         circuit_object = target.convert_to("cirq")
@@ -59,25 +105,17 @@ class CirqMapping(MappingStrategy):
             print("All2All connectivity, skipping routing")
         else:
             # only 'greedy' routing is implemented in Cirq
-            swap_networks: List[ccr.SwapNetwork] = []
-
-            routing_attempts = self.routing_attempts
-            for _ in range(routing_attempts):
-                swap_network = ccr.route_circuit(
-                    circuit_object,
-                    self.cirq_hardware,
-                    router=self.router,
-                    algo_name=self.algo_name,
-                    random_state=self.random_state,
-                    max_search_radius=self.max_search_radius
-                )
-                swap_networks.append(swap_network)
-            assert len(swap_networks) > 0, "Unable to get routing for circuit"
-            # Sort by the least number of qubits first (as routing sometimes adds extra ancilla qubits),
-            # and then the length of the circuit second.
-            swap_networks.sort(key=lambda swap_network: (len(swap_network.circuit.all_qubits()), len(swap_network.circuit)))
-
-            circuit_object = swap_networks[0].circuit
+            swap_network = route_circuit_best_of(
+                circuit_object,
+                self.cirq_hardware,
+                routing_attempts=self.routing_attempts,
+                router=self.router,
+                algo_name=self.algo_name,
+                random_state=self.random_state,
+                max_search_radius=self.max_search_radius,
+                max_workers=self.max_workers,
+            )
+            circuit_object = swap_network.circuit
 
             qubit_order = {LineQubit(n): NamedQubit(f"q_{n}") for n in range(self.quantum_hardware.num_qubits)}
 
@@ -85,7 +123,7 @@ class CirqMapping(MappingStrategy):
             no_decomp = lambda op: isinstance(op.gate, CNotPowGate)
             ExpandComposite(no_decomp=no_decomp).optimize_circuit(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
         gate_chain = GateChain.convert_from(circuit_object, format_id="cirq")
         gate_chain.quantum_hardware = self.quantum_hardware
 
@@ -16,15 +16,15 @@
 
 
 from timeit import default_timer as timer
-from typing import List
 
+from arline_benchmarks.strategies.cirq_mapping import route_circuit_best_of
 from arline_benchmarks.strategies.strategy import CompressionStrategy
+from arline_benchmarks.config_parser.hardware_cache import cached_hardware_conversion
 from arline_quantum.gate_chain.gate_chain import GateChain
 from arline_quantum.qubit_connectivities.qubit_connectivity import All2All
 from arline_quantum.gate_sets.cx_rz_rx import CnotRzRxGateSet
 from arline_quantum.gate_chain.basis_translator import ArlineTranslator
 
-import cirq.contrib.routing as ccr
 from cirq import CNotPowGate, ExpandComposite, LineQubit, NamedQubit
 
 from cirq.optimizers import EjectZ, EjectPhasedPaulis, DropNegligible, DropEmptyMoments
@@ -37,6 +37,9 @@ _strategy_class_name = "CirqMappingCompression"
 
 class CirqMappingCompression(CompressionStrategy):
     r"""Cirq Mapping+Compression Strategy
+
+    **Description:**
+        Routing attempts run in parallel as in :class:`arline_benchmarks.strategies.cirq_mapping.CirqMapping`.
     """
 
     def __init__(
@@ -47,15 +50,19 @@ class CirqMappingCompression(CompressionStrategy):
         algo_name="greedy",
         random_state=1,
         max_search_radius=1,
+        max_workers=None,
         analyser_options={},
     ):
         super().__init__(hardware, analyser_options)
-        self.cirq_hardware = self.quantum_hardware.convert_to_cirq_hardware()
+        self.cirq_hardware = cached_hardware_conversion(
+            hardware, "cirq", self.quantum_hardware.convert_to_cirq_hardware
+        )
         self.routing_attempts = routing_attempts
         self.router = router
         self.algo_name = algo_name
         self.random_state = random_state
         self.max_search_radius = max_search_radius
+        self.max_workers = max_workers
 
     def run(self, target, run_analyser=True):
         # Check if gates in target gate chain are from ['Cz', 'Rz', 'Rx'] set
@@ -76,23 +83,17 @@ class CirqMappingCompression(CompressionStrategy):
         else:
             # First perform circuit routing
             # only 'greedy' routing is implemented in Cirq
-            swap_networks: List[ccr.SwapNetwork] = []
-            routing_attempts = self.routing_attempts
-            for _ in range(routing_attempts):
-                swap_network = ccr.route_circuit(
-                    circuit_object,
-                    self.cirq_hardware,
-                    router=self.router,
-                    algo_name=self.algo_name,
-                    random_state=self.random_state,
-                    max_search_radius=self.max_search_radius
-                )
-                swap_networks.append(swap_network)
-            assert len(swap_networks) > 0, "Unable to get routing for circuit"
-            # Sort by the least number of qubits first (as routing sometimes adds extra ancilla qubits),
-            # and then the length of the circuit second.
-            swap_networks.sort(key=lambda swap_network: (len(swap_network.circuit.all_qubits()), len(swap_network.circuit)))
-            circuit_object = swap_networks[0].circuit
+            swap_network = route_circuit_best_of(
+                circuit_object,
+                self.cirq_hardware,
+                routing_attempts=self.routing_attempts,
+                router=self.router,
+                algo_name=self.algo_name,
+                random_state=self.random_state,
+                max_search_radius=self.max_search_radius,
+                max_workers=self.max_workers,
+            )
+            circuit_object = swap_network.circuit
 
             # decompose composite gates
             no_decomp = lambda op: isinstance(op.gate, CNotPowGate)
@@ -115,7 +116,7 @@ class CirqMappingCompression(CompressionStrategy):
         # Drop empty moments
         DropEmptyMoments().optimize_circuit(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = GateChain.convert_from(circuit_object, format_id="cirq")
         gate_chain.quantum_hardware = self.quantum_hardware
@@ -38,7 +38,7 @@ class CirqMerge1Q(CompressionStrategy):
         # Merge single qubit gates into PhasedX and PhasedZ gates
         merge_single_qubit_gates_into_phased_x_z(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = GateChain.convert_from(circuit_object, format_id="cirq")
         gate_chain.quantum_hardware = self.quantum_hardware
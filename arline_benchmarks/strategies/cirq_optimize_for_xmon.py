@@ -43,7 +43,7 @@ class CirqOptimizeForXmon(CompressionStrategy):
 
         circuit_object = optimized_for_xmon(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = GateChain.convert_from(circuit_object, format_id="cirq")
         gate_chain.quantum_hardware = self.quantum_hardware
@@ -0,0 +1,109 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+# Process pool shared by all calls of parallel_map in the process, sized to the largest request
+_executor = None
+_executor_workers = 0
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def derive_seeds(seed, num_seeds):
+    """Distinct seeds for repeated randomized attempts
+
+    The first seed is ``seed`` itself, so that a single attempt gives the same result as before,
+    others are derived from it with ``numpy.random.SeedSequence``. No seeds are returned for ``num_seeds < 1``.
+    """
+    if num_seeds < 1:
+        return []
+    children = np.random.SeedSequence(seed).spawn(num_seeds - 1)
+    return [seed] + [int(c.generate_state(1)[0]) for c in children]
+
+
+def get_executor(num_workers):
+    """Process pool with at least ``num_workers`` workers shared by all calls in the current process
+
+    The pool is created on first use and reused, so that worker processes are not started for every target.
+    It is replaced by a larger one when more workers are requested. A forked child process creates its own pool.
+    """
+    global _executor, _executor_workers, _executor_pid
+    with _executor_lock:
+        if _executor_pid != os.getpid():
+            # Pool of the parent process can not be used by a forked child
+            _executor = None
+            _executor_pid = os.getpid()
+        if _executor is None or _executor_workers < num_workers:
+            if _executor is not None:
+                # Running calls keep their futures, idle workers are stopped
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=num_workers)
+            _executor_workers = num_workers
+        return _executor
+
+
+def shutdown_executors():
+    """Shut down the shared process pool of the current process
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown()
+        _executor = None
+
+
+def parallel_map(func, args_list, max_workers=None):
+    """Call ``func(*args)`` for all ``args`` in ``args_list`` in the shared process pool
+
+    ``func`` and arguments must be picklable. Calls are done in the current process
+    if ``max_workers == 1`` or there is a single call. By default the number of workers is
+    the number of calls, but not more than the number of CPUs. At most ``max_workers`` calls run
+    at the same time, even if the shared pool is larger.
+
+    :return: list of results in the order of ``args_list``
+    """
+    global _executor
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 1 or len(args_list) <= 1:
+        return [func(*args) for args in args_list]
+    num_workers = min(max_workers, len(args_list))
+    executor = get_executor(num_workers)
+    results = [None] * len(args_list)
+    try:
+        pending = {}
+        next_index = 0
+        while next_index < len(args_list) or pending:
+            while next_index < len(args_list) and len(pending) < num_workers:
+                pending[executor.submit(func, *args_list[next_index])] = next_index
+                next_index += 1
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                results[pending.pop(f)] = f.result()
+        return results
+    except BrokenProcessPool:
+        # A worker died, the pool can not be used anymore
+        with _executor_lock:
+            if _executor is executor:
+                _executor = None
+        raise
@@ -0,0 +1,184 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import traceback
+from timeit import default_timer as timer
+
+from arline_benchmarks.metrics.result_selector import ResultSelector
+from arline_benchmarks.strategies.parallel import shutdown_executors
+from arline_benchmarks.strategies.strategy import CompressionStrategy, Strategy
+
+_strategy_class_name = "Portfolio"
+
+# Interval of checks for member processes that exited without result
+_poll_interval_s = 1.0
+
+
+def _run_member(member_index, strategy, target, result_queue):
+    # Own process group, so that worker processes started by the member are terminated with it
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    try:
+        start_time = timer()
+        gate_chain = strategy.run(target, run_analyser=False)
+        result_queue.put((member_index, gate_chain, timer() - start_time, None))
+    except Exception:
+        result_queue.put((member_index, None, None, traceback.format_exc()))
+    finally:
+        shutdown_executors()
+
+
+def _terminate_member(process):
+    """Terminate member process and its worker processes
+    """
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            return
+        except (ProcessLookupError, PermissionError):
+            # Process group is not created yet
+            pass
+    process.terminate()
+
+
+class Portfolio(CompressionStrategy):
+    r"""Portfolio Strategy
+
+    **Description:**
+        Runs several member strategies on the same input concurrently (one process per member) and returns
+        the output with the least ``select_metric``
+        (see :class:`arline_benchmarks.metrics.result_selector.ResultSelector`).
+        Members still running when ``time_budget_s`` expires are terminated.
+        Member processes are not daemonic, so members can run their own process pools
+        (e.g. ``routing_attempts`` of ``cirq_mapping``, ``num_seeds`` of ``qiskit_transpile``).
+        Members are given ``hardware`` of the portfolio unless their args define it::
+
+            {
+                id: 'portfolio',
+                strategy: 'portfolio',
+                args: {
+                    hardware: hardware,
+                    members: [
+                        {id: 'qiskit', strategy: 'qiskit_transpile', args: {}},
+                        {id: 'cirq', strategy: 'cirq_mapping_compression', args: {}},
+                    ],
+                    time_budget_s: 60,
+                    select_metric: 'two_qubit_gate_count',
+                },
+            }
+
+        Winning member and execution time of every member (empty if it failed or was terminated) are added to
+        the report.
+    """
+
+    def __init__(
+        self, hardware, members, time_budget_s=None, select_metric="two_qubit_gate_count", analyser_options={},
+    ):
+        super().__init__(hardware, analyser_options)
+        self.member_ids = []
+        self.members = []
+        for member_cfg in members:
+            member_cfg = dict(member_cfg, args=dict(member_cfg.get("args", {})))
+            member_cfg["args"].setdefault("hardware", hardware)
+            self.member_ids.append(member_cfg.get("id", member_cfg["strategy"]))
+            self.members.append(Strategy.from_config(member_cfg))
+        if len(set(self.member_ids)) != len(self.member_ids):
+            raise ValueError("Portfolio member ids must be unique: {}".format(self.member_ids))
+        self.time_budget_s = time_budget_s
+        self.selector = ResultSelector(
+            select_metric, cost_cfg=analyser_options.get("cost_cfg", {"class": "IbmCostFunction", "args": {}})
+        )
+
+    def run(self, target, run_analyser=True):
+        start_time = timer()
+        result_queue = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=_run_member, args=(i, strategy, target, result_queue))
+            for i, strategy in enumerate(self.members)
+        ]
+
+        # Collect results until all members finish or time budget expires
+        results = {}
+        member_times = {}
+        errors = {}
+        deadline = None if self.time_budget_s is None else start_time + self.time_budget_s
+        try:
+            for p in processes:
+                p.start()
+            # Members seen exited while the queue was empty
+            exited = set()
+            while len(results) + len(errors) < len(processes):
+                timeout = _poll_interval_s if deadline is None else min(deadline - timer(), _poll_interval_s)
+                if timeout <= 0:
+                    break
+                try:
+                    member_index, gate_chain, member_time, error = result_queue.get(timeout=timeout)
+                except queue.Empty:
+                    # Members killed by a signal (e.g. segfault in a native compiler, OOM killer) post nothing.
+                    # Results are flushed to the queue before a member exits, so a member that stays without result
+                    # for a whole poll interval after its exit has failed
+                    for i, p in enumerate(processes):
+                        if i in results or i in errors or p.exitcode is None:
+                            continue
+                        if i in exited:
+                            errors[i] = "Member process exited with code {} without result".format(p.exitcode)
+                        else:
+                            exited.add(i)
+                    continue
+                if error is not None:
+                    errors[member_index] = error
+                else:
+                    results[member_index] = gate_chain
+                    member_times[member_index] = member_time
+        finally:
+            # Cancel stragglers
+            for p in processes:
+                if p.is_alive():
+                    _terminate_member(p)
+            for p in processes:
+                if p.pid is not None:
+                    p.join()
+            result_queue.close()
+
+        for member_index, error in errors.items():
+            print("Portfolio member {} failed:\n{}".format(self.member_ids[member_index], error), file=sys.stderr)
+        if not results:
+            raise RuntimeError(
+                "No portfolio member finished"
+                + ("" if self.time_budget_s is None else " within {} s".format(self.time_budget_s))
+            )
+        finished = sorted(results)
+        # Cost function of the selector depends on the hardware of the gate chain
+        for i in finished:
+            results[i].quantum_hardware = self.members[i].quantum_hardware
+        best = finished[self.selector.best([results[i] for i in finished])]
+        gate_chain = results[best]
+
+        self.record_execution_time(start_time)
+
+        if run_analyser:
+            self.analyse(target, gate_chain)
+            self.analyser_report["Execution Time"] = self.execution_time
+            self.analyser_report["Portfolio Winner"] = self.member_ids[best]
+            for i, member_id in enumerate(self.member_ids):
+                self.analyser_report["Portfolio {} Time".format(member_id)] = member_times.get(i)
+        return gate_chain
@@ -46,7 +46,7 @@ class PostProcessing(CircuitProcessingStrategy):
                 if not isinstance(el.gate, Measure):
                     gate_chain.add_gate(el.gate, el.connections)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
         gate_chain.quantum_hardware = self.quantum_hardware
         if run_analyser:
             self.analyse(target, gate_chain)
@@ -59,7 +59,7 @@ class PreProcessing(CircuitProcessingStrategy):
             for q in qubits:
                 gate_chain.add_gate(Measure(), connections=[q], cregs=[q])
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
         if run_analyser:
             self.analyse(target, gate_chain)
             self.analyser_report["Execution Time"] = self.execution_time
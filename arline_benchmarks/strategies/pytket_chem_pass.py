@@ -29,7 +29,7 @@ class PytketChemPass(CompressionStrategy):
         chem_pass = SequencePass([PauliSimp(), FullPeepholeOptimise()])
         chem_pass.apply(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = PytketGateChainConverter().to_gate_chain(circuit_object)
         gate_chain.quantum_hardware = self.quantum_hardware
@@ -21,7 +21,7 @@ class PytketCommuteThroughMultis(CompressionStrategy):
 
         start_time = timer()
         CommuteThroughMultis().apply(circuit_object)
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
         gate_chain = PytketGateChainConverter().to_gate_chain(circuit_object)
         gate_chain.quantum_hardware = self.quantum_hardware
 
@@ -3,6 +3,7 @@
 from timeit import default_timer as timer
 
 from arline_benchmarks.strategies.strategy import MappingStrategy
+from arline_benchmarks.config_parser.hardware_cache import cached_hardware_conversion
 from arline_quantum.gate_chain.converters import PytketGateChainConverter
 
 from pytket.transform import Transform
@@ -24,7 +25,7 @@ class PytketMapping(MappingStrategy):
         analyser_options={},
     ):
         super().__init__(hardware, analyser_options)
-        self.pytket_hardware = self.convert_to_pytket_hardware()
+        self.pytket_hardware = cached_hardware_conversion(hardware, "pytket", self.convert_to_pytket_hardware)
 
     def run(self, target, run_analyser=True):
         circuit_object = PytketGateChainConverter().from_gate_chain(target)
@@ -36,7 +37,7 @@ class PytketMapping(MappingStrategy):
         Transform.DecomposeBRIDGE().apply(circuit_object)
         Transform.DecomposeSWAPtoCX(self.pytket_hardware).apply(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = PytketGateChainConverter().to_gate_chain(circuit_object)
         gate_chain.quantum_hardware = self.quantum_hardware
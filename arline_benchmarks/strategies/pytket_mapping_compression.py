@@ -3,6 +3,7 @@
 from timeit import default_timer as timer
 
 from arline_benchmarks.strategies.strategy import CompressionStrategy
+from arline_benchmarks.config_parser.hardware_cache import cached_hardware_conversion
 from arline_quantum.gate_chain.converters import PytketGateChainConverter
 
 from pytket.transform import Transform
@@ -27,7 +28,7 @@ class PytketMappingCompression(CompressionStrategy):
         chem_pass=False,
     ):
         super().__init__(hardware, analyser_options)
-        self.pytket_hardware = self.convert_to_pytket_hardware()
+        self.pytket_hardware = cached_hardware_conversion(hardware, "pytket", self.convert_to_pytket_hardware)
         self.chem_pass = chem_pass
 
     def run(self, target, run_analyser=True):
@@ -63,7 +64,7 @@ class PytketMappingCompression(CompressionStrategy):
         Transform.DecomposeSWAPtoCX(self.pytket_hardware).apply(circuit_object)
         # Rebase to CX, U1, U3 and optimize
         SynthesiseIBM().apply(circuit_object)
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = PytketGateChainConverter().to_gate_chain(circuit_object, qmap=qmap)
         gate_chain.quantum_hardware = self.quantum_hardware
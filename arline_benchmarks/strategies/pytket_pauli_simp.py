@@ -28,7 +28,7 @@ class PytketPauliSimp(CompressionStrategy):
 
         PauliSimp().apply(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = PytketGateChainConverter().to_gate_chain(circuit_object)
         gate_chain.quantum_hardware = self.quantum_hardware
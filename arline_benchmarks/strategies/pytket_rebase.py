@@ -41,7 +41,7 @@ class PytketRebase(RebaseStrategy):
         else:
             raise NotImplementedError()
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = self.save_gate_chain(circuit_object)
         gate_chain.quantum_hardware = self.quantum_hardware
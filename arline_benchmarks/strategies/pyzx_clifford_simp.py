@@ -27,7 +27,7 @@ class PyzxCliffordSimp(CompressionStrategy):
         # Convert optimized graph back to circuit
         optimised_circuit = zx.extract_circuit(graph)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         qasm_data = optimised_circuit.to_qasm()
         lines = qasm_data.split("\n")
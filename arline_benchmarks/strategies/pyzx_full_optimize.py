@@ -24,7 +24,7 @@ class PyzxFullOptimize(CompressionStrategy):
         circuit_object = zx.Circuit(None).from_qasm(qasm_data)
         zx.optimize.full_optimize(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         qasm_data = circuit_object.to_qasm()
         lines = qasm_data.split("\n")
@@ -55,7 +55,7 @@ class QiskitKakBlocks(CompressionStrategy):
         pm = PassManager().append(passes)
         circuit_object = transpile(circuit_object, pass_manager=pm)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = GateChain.convert_from(circuit_object, format_id="qiskit")
         gate_chain.quantum_hardware = self.quantum_hardware
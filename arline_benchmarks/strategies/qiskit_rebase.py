@@ -43,7 +43,7 @@ class QiskitRebase(RebaseStrategy):
         rebased_dag = BasisTranslator(sel, basis_gates).run(dag)
         optimised_circuit = dag_to_circuit(rebased_dag)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = GateChain.convert_from(optimised_circuit, format_id="qiskit")
         gate_chain.quantum_hardware = self.quantum_hardware
@@ -15,9 +15,13 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import os
 from timeit import default_timer as timer
 
+from arline_benchmarks.metrics.result_selector import ResultSelector
+from arline_benchmarks.strategies.parallel import derive_seeds
 from arline_benchmarks.strategies.strategy import CompressionStrategy
+from arline_benchmarks.config_parser.hardware_cache import cached_hardware_conversion
 from arline_quantum.gate_chain.gate_chain import GateChain
 
 from qiskit.compiler import transpile
@@ -25,8 +29,24 @@ from qiskit.compiler import transpile
 _strategy_class_name = "QiskitTranspile"
 
 
+def _cpu_time():
+    """CPU time of the process and its finished child processes
+    """
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
 class QiskitTranspile(CompressionStrategy):
     r"""Qiskit Transpile Strategy
+
+    **Description:**
+        With ``num_seeds > 1`` the circuit is transpiled with ``num_seeds`` seeds (the first one is
+        ``seed_transpiler``) in parallel and the result with the least ``select_metric`` is kept
+        (see :class:`arline_benchmarks.metrics.result_selector.ResultSelector`, cost function is ``cost_cfg``
+        of ``analyser_options``).
+
+        Winning seed and CPU time of the seed sweep (including worker processes) are added to the report,
+        wall time of the sweep is ``Execution Time``.
     """
 
     def __init__(
@@ -36,33 +56,56 @@ class QiskitTranspile(CompressionStrategy):
         optimization_level=3,
         routing_method='sabre',
         layout_method='sabre',
+        num_seeds=1,
+        select_metric="two_qubit_gate_count",
         analyser_options={},
     ):
         super().__init__(hardware, analyser_options)
-        self.qiskit_hardware = self.quantum_hardware.convert_to_qiskit_hardware()
+        self.qiskit_hardware = cached_hardware_conversion(
+            hardware, "qiskit", self.quantum_hardware.convert_to_qiskit_hardware
+        )
         self.seed_transpiler = seed_transpiler
         self.optimization_level = optimization_level
         self.routing_method = routing_method
         self.layout_method = layout_method
+        self.num_seeds = num_seeds
+        self.selector = ResultSelector(
+            select_metric, cost_cfg=analyser_options.get("cost_cfg", {"class": "IbmCostFunction", "args": {}})
+        )
 
     def run(self, target, run_analyser=True):
         circuit_object = target.convert_to("qiskit")
+        seeds = derive_seeds(self.seed_transpiler, self.num_seeds)
+        start_cpu_time = _cpu_time()
         start_time = timer()
-        circuit_object = transpile(
-            circuit_object,
+        # List of circuits is transpiled by Qiskit in parallel processes
+        circuit_objects = transpile(
+            [circuit_object] * self.num_seeds if self.num_seeds > 1 else circuit_object,
             backend=self.qiskit_hardware,
-            seed_transpiler=self.seed_transpiler,
+            seed_transpiler=seeds if self.num_seeds > 1 else self.seed_transpiler,
             optimization_level=self.optimization_level,
             routing_method=self.routing_method,
             layout_method=self.layout_method
         )
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
+        sweep_cpu_time = _cpu_time() - start_cpu_time
 
-        gate_chain = GateChain.convert_from(circuit_object, format_id="qiskit")
-        gate_chain.quantum_hardware = self.quantum_hardware
+        if self.num_seeds > 1:
+            candidates = [GateChain.convert_from(c, format_id="qiskit") for c in circuit_objects]
+            # Cost function of the selector depends on the hardware of the gate chain
+            for c in candidates:
+                c.quantum_hardware = self.quantum_hardware
+            best = self.selector.best(candidates)
+            gate_chain = candidates[best]
+        else:
+            gate_chain = GateChain.convert_from(circuit_objects, format_id="qiskit")
+            gate_chain.quantum_hardware = self.quantum_hardware
 
         if run_analyser:
             self.analyse(target, gate_chain)
             self.analyser_report["Execution Time"] = self.execution_time
+            if self.num_seeds > 1:
+                self.analyser_report["Best Seed"] = seeds[best]
+                self.analyser_report["Seed Sweep CPU Time"] = sweep_cpu_time
         return gate_chain
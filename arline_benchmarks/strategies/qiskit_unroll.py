@@ -18,6 +18,7 @@
 from timeit import default_timer as timer
 
 from arline_benchmarks.strategies.strategy import RebaseStrategy
+from arline_benchmarks.config_parser.hardware_cache import cached_hardware_conversion
 from arline_quantum.gate_chain.gate_chain import GateChain
 
 from qiskit.transpiler.passes import Unroll3qOrMore
@@ -36,7 +37,9 @@ class QiskitUnroll(RebaseStrategy):
         analyser_options={},
     ):
         super().__init__(hardware, analyser_options)
-        self.qiskit_hardware = self.quantum_hardware.convert_to_qiskit_hardware()
+        self.qiskit_hardware = cached_hardware_conversion(
+            hardware, "qiskit", self.quantum_hardware.convert_to_qiskit_hardware
+        )
 
     def run(self, target, run_analyser=True):
         circuit_object = target.convert_to("qiskit")
@@ -48,7 +51,7 @@ class QiskitUnroll(RebaseStrategy):
         else:
             unrolled_dag = Unroll3qOrMore().run(circuit_to_dag(circuit_object))
             circuit_object = dag_to_circuit(unrolled_dag)
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = GateChain.convert_from(circuit_object, 'qiskit')
         gate_chain.quantum_hardware = self.quantum_hardware
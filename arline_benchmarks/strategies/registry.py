@@ -0,0 +1,69 @@
+# Arline Benchmarks
+# Copyright (C) 2019-2022 Turation Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Registry of strategies: {strategy name (module name): (strategy class name, frameworks used by strategy)}
+# Allows to resolve and validate strategy names from config without importing strategy modules,
+# frameworks are imported only when the strategy is instantiated.
+strategy_registry = {
+    "arline_rebase": ("ArlineRebase", ()),
+    "cirq_3q_decomposition": ("Cirq3qDecomposition", ("cirq",)),
+    "cirq_drop_empty_moments": ("CirqDropEmptyMoments", ("cirq",)),
+    "cirq_drop_negligible": ("CirqDropNegligible", ("cirq",)),
+    "cirq_eject_phased_paulis": ("CirqEjectPhasedPaulis", ("cirq",)),
+    "cirq_eject_z": ("CirqEjectZ", ("cirq",)),
+    "cirq_mapping": ("CirqMapping", ("cirq",)),
+    "cirq_mapping_compression": ("CirqMappingCompression", ("cirq",)),
+    "cirq_merge_1q": ("CirqMerge1Q", ("cirq",)),
+    "cirq_merge_interactions": ("CirqMergeInteractions", ("cirq",)),
+    "cirq_optimize_for_xmon": ("CirqOptimizeForXmon", ("cirq",)),
+    "portfolio": ("Portfolio", ()),
+    "post_processing": ("PostProcessing", ()),
+    "pre_processing": ("PreProcessing", ()),
+    "pytket_chem_pass": ("PytketChemPass", ("pytket",)),
+    "pytket_commute_multis": ("PytketCommuteThroughMultis", ("pytket",)),
+    "pytket_cx_directed": ("PytketCxDirected", ("pytket",)),
+    "pytket_default_mapping": ("PytketDefaultMapping", ("pytket",)),
+    "pytket_mapping": ("PytketMapping", ("pytket",)),
+    "pytket_mapping_compression": ("PytketMappingCompression", ("pytket",)),
+    "pytket_pauli_simp": ("PytketPauliSimp", ("pytket",)),
+    "pytket_peephole": ("PytketPeephole", ("pytket",)),
+    "pytket_postrouting": ("PytketPostrouting", ("pytket",)),
+    "pytket_rebase": ("PytketRebase", ("pytket",)),
+    "pytket_remove_redundancies": ("PytketRemoveRedundancies", ("pytket",)),
+    "pytket_synthesise_ibm": ("PytketSynthesiseIbm", ("pytket",)),
+    "pyzx_clifford_simp": ("PyzxCliffordSimp", ("pyzx",)),
+    "pyzx_full_optimize": ("PyzxFullOptimize", ("pyzx",)),
+    "pyzx_full_reduce": ("PyzxFullReduce", ("pyzx",)),
+    "qiskit_commutative_cancellation": ("QiskitCommutativeCancellation", ("qiskit",)),
+    "qiskit_kak_blocks": ("QiskitKakBlocks", ("qiskit",)),
+    "qiskit_rebase": ("QiskitRebase", ("qiskit",)),
+    "qiskit_transpile": ("QiskitTranspile", ("qiskit",)),
+    "qiskit_unroll": ("QiskitUnroll", ("qiskit",)),
+    "target_analysis": ("TargetAnalysis", ()),
+    "voqc_1q_gates_cancel": ("VoqcSingleQubitCancel", ("qiskit", "voqc")),
+    "voqc_2q_gates_cancel": ("VoqcTwoQubitCancel", ("qiskit", "voqc")),
+    "voqc_hadamard_reduction": ("VoqcHadamardReduction", ("qiskit", "voqc")),
+    "voqc_merge_rotations": ("VoqcMergeRotations", ("qiskit", "voqc")),
+    "voqc_not_propagation": ("Voqc", ("qiskit", "voqc")),
+}
+
+
+def check_strategy_name(strategy_name):
+    """:raises ValueError: if strategy is not registered in :data:`strategy_registry`
+    """
+    if strategy_name not in strategy_registry:
+        raise ValueError("Unknown strategy '{}'".format(strategy_name))
@@ -15,11 +15,15 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
-import importlib
+import threading
 from contextlib import suppress
+from timeit import default_timer as timer
 
 from arline_benchmarks.metrics.gate_chain_analyser import GateChainTransformAnalyser, SynthesisAnalyser
-from arline_quantum.hardware import hardware_by_name
+from arline_benchmarks.profiling.import_timer import import_framework, timed_import
+from arline_benchmarks.profiling.tracer import tracer
+from arline_benchmarks.strategies.registry import check_strategy_name, strategy_registry
+from arline_benchmarks.config_parser.hardware_cache import cached_hardware_by_name, canonical_config_key
 from arline_quantum.utils.fidelity import statevector_fidelity
 
 
@@ -31,11 +35,69 @@ class Strategy:
         self,
         analyser_options={}
     ):
-        self.execution_time = 0
-        self.analyser = None
-        self.analyser_report = None
+        # Per-run state (execution time, analyser and its report) is stored per thread,
+        # so that a strategy instance can be shared between pipelines and run concurrently
+        self._run_state = threading.local()
         self.analyser_options = analyser_options
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_run_state"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._run_state = threading.local()
+
+    @property
+    def execution_time(self):
+        return getattr(self._run_state, "execution_time", 0)
+
+    @execution_time.setter
+    def execution_time(self, value):
+        self._run_state.execution_time = value
+
+    def record_execution_time(self, start_time):
+        """Set execution time of the compilation step started at ``start_time``, called by strategies right after
+        the compilation step
+
+        The step is reported to the tracer as ``compile`` span.
+        """
+        end_time = timer()
+        self.execution_time = end_time - start_time
+        tracer.add_span("compile", start_time, end_time)
+
+    @property
+    def analyser(self):
+        return getattr(self._run_state, "analyser", None)
+
+    @analyser.setter
+    def analyser(self, value):
+        self._run_state.analyser = value
+
+    @property
+    def analyser_report(self):
+        return getattr(self._run_state, "analyser_report", None)
+
+    @analyser_report.setter
+    def analyser_report(self, value):
+        self._run_state.analyser_report = value
+
+    @property
+    def analyse_mode(self):
+        """Analysis of the next run: ``full`` (all metrics) or ``light`` (gate counts only)
+        """
+        return getattr(self._run_state, "analyse_mode", "full")
+
+    @analyse_mode.setter
+    def analyse_mode(self, value):
+        self._run_state.analyse_mode = value
+
+    def analyser_run(self, target, result):
+        if self.analyse_mode == "light":
+            return self.analyser.run_light(target, result)
+        return self.analyser.run_all(target, result)
+
     def run(self, target, run_analyser=True):
         raise NotImplementedError()
 
@@ -43,10 +105,36 @@ class Strategy:
         raise NotImplementedError()
 
     @staticmethod
-    def from_config(cfg):
-        strategy_name = cfg["strategy"]
-        m = importlib.import_module("arline_benchmarks.strategies." + strategy_name)
-        strategy_class = getattr(m, m._strategy_class_name)
+    def get_class(strategy_name):
+        """Import strategy module (and frameworks it uses) and return strategy class
+
+        :raises ValueError: for strategies not registered in
+            :data:`arline_benchmarks.strategies.registry.strategy_registry`
+        """
+        check_strategy_name(strategy_name)
+        class_name, frameworks = strategy_registry[strategy_name]
+        # Import frameworks first, so that import time is attributed to the framework
+        for framework in frameworks:
+            import_framework(framework)
+        m = timed_import("arline_benchmarks.strategies." + strategy_name)
+        return getattr(m, class_name)
+
+    @staticmethod
+    def from_config(cfg, strategy_pool=None):
+        """Create strategy from stage config
+
+        :param strategy_pool: optional dict used to intern strategies, strategies with the same name and args
+                              are created once and shared
+        """
+        if strategy_pool is not None:
+            key = (cfg["strategy"], canonical_config_key(cfg["args"]))
+            try:
+                return strategy_pool[key]
+            except KeyError:
+                strategy = Strategy.from_config(cfg)
+                strategy_pool[key] = strategy
+                return strategy
+        strategy_class = Strategy.get_class(cfg["strategy"])
         strategy_cfg = cfg["args"]
         return strategy_class(**strategy_cfg)
 
@@ -67,12 +155,13 @@ class CircuitProcessingStrategy(Strategy):
         analyser_options={}
     ):
         super().__init__(analyser_options)
-        self.quantum_hardware = hardware_by_name(hardware)
+        self.hardware_cfg = hardware
+        self.quantum_hardware = cached_hardware_by_name(hardware)
 
     def analyse(self, target, result):
         if self.analyser is None:
             self.analyser = GateChainTransformAnalyser(**self.analyser_options)
-        self.analyser_report = self.analyser.run_all(target, result)
+        self.analyser_report = self.analyser_run(target, result)
 
 
 class MappingStrategy(Strategy):
@@ -85,12 +174,13 @@ class MappingStrategy(Strategy):
         analyser_options={}
     ):
         super().__init__(analyser_options)
-        self.quantum_hardware = hardware_by_name(hardware)
+        self.hardware_cfg = hardware
+        self.quantum_hardware = cached_hardware_by_name(hardware)
 
     def analyse(self, target, result):
         if self.analyser is None:
             self.analyser = GateChainTransformAnalyser(**self.analyser_options)
-        self.analyser_report = self.analyser.run_all(target, result)
+        self.analyser_report = self.analyser_run(target, result)
 
 
 class RebaseStrategy(Strategy):
@@ -103,12 +193,13 @@ class RebaseStrategy(Strategy):
         analyser_options={}
     ):
         super().__init__(analyser_options)
-        self.quantum_hardware = hardware_by_name(hardware)
+        self.hardware_cfg = hardware
+        self.quantum_hardware = cached_hardware_by_name(hardware)
 
     def analyse(self, target, result):
         if self.analyser is None:
             self.analyser = GateChainTransformAnalyser(**self.analyser_options)
-        self.analyser_report = self.analyser.run_all(target, result)
+        self.analyser_report = self.analyser_run(target, result)
 
 
 class CompressionStrategy(Strategy):
@@ -121,12 +212,13 @@ class CompressionStrategy(Strategy):
         analyser_options={}
     ):
         super().__init__(analyser_options)
-        self.quantum_hardware = hardware_by_name(hardware)
+        self.hardware_cfg = hardware
+        self.quantum_hardware = cached_hardware_by_name(hardware)
 
     def analyse(self, target, result):
         if self.analyser is None:
             self.analyser = GateChainTransformAnalyser(**self.analyser_options)
-        self.analyser_report = self.analyser.run_all(target, result)
+        self.analyser_report = self.analyser_run(target, result)
 
 
 class QSPStrategy(Strategy):
@@ -139,7 +231,8 @@ class QSPStrategy(Strategy):
         analyser_options={}
     ):
         super().__init__(analyser_options)
-        self.quantum_hardware = hardware_by_name(hardware)
+        self.hardware_cfg = hardware
+        self.quantum_hardware = cached_hardware_by_name(hardware)
 
     def analyse(self, target, result):
         if self.analyser is None:
@@ -148,4 +241,4 @@ class QSPStrategy(Strategy):
                 return statevector_fidelity(t, u)
 
             self.analyser = SynthesisAnalyser(fidelity_function)
-        self.analyser_report = self.analyser.run_all(target, result)
+        self.analyser_report = self.analyser_run(target, result)
@@ -39,7 +39,7 @@ class VoqcSingleQubitCancel(CompressionStrategy):
         pm.append(QisVOQC(["cancel_single_qubit_gates"]))
         new_circuit = pm.run(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = GateChain.convert_from(new_circuit, "qiskit")
         gate_chain.quantum_hardware = self.quantum_hardware
@@ -38,7 +38,7 @@ class VoqcHadamardReduction(CompressionStrategy):
         pm.append(QisVOQC(["hadamard_reduction"]))
         new_circuit = pm.run(circuit_object)
 
-        self.execution_time = timer() - start_time
+        self.record_execution_time(start_time)
 
         gate_chain = GateChain.convert_from(new_circuit, "qiskit")
         gate_chain.quantum_hardware = self.quantum_hardware
@@ -24,7 +24,7 @@ import numpy as np
 from arline_quantum.gate_chain.gate_chain import GateChain
 from arline_quantum.gates.u3 import U3
 
-from arline_quantum.hardware import hardware_by_name
+from arline_benchmarks.config_parser.hardware_cache import cached_hardware_by_name
 
 
 def limit_targets_number(f):
@@ -106,7 +106,7 @@ class RandomChainTarget(GateChainTarget):
 
     def __init__(self, config):
         super().__init__(config=config)
-        self._quantum_hardware = hardware_by_name(self._cfg["hardware"])
+        self._quantum_hardware = cached_hardware_by_name(self._cfg["hardware"])
         self._actions = []
         self.two_qubit_actions = []
         self.id = 0
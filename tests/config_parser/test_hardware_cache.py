@@ -0,0 +1,56 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+from unittest import mock
+
+from arline_benchmarks.config_parser import hardware_cache
+from arline_benchmarks.config_parser.hardware_cache import (
+    cached_hardware_by_name,
+    cached_hardware_conversion,
+    canonical_config_key,
+    clear_hardware_cache,
+)
+
+
+class TestHardwareCache(unittest.TestCase):
+    def setUp(self):
+        clear_hardware_cache()
+
+    def tearDown(self):
+        clear_hardware_cache()
+
+    def test_canonical_config_key(self):
+        cfg_1 = {"hardware": {"class": "IbmAll2All", "args": {"num_qubits": 5, "gate_set": ["U3", "Cnot"]}}}
+        cfg_2 = {"hardware": {"args": {"gate_set": ["U3", "Cnot"], "num_qubits": 5}, "class": "IbmAll2All"}}
+        self.assertEqual(canonical_config_key(cfg_1), canonical_config_key(cfg_2))
+        # Values and list order are significant
+        cfg_3 = {"hardware": {"class": "IbmAll2All", "args": {"num_qubits": 6, "gate_set": ["U3", "Cnot"]}}}
+        cfg_4 = {"hardware": {"class": "IbmAll2All", "args": {"num_qubits": 5, "gate_set": ["Cnot", "U3"]}}}
+        self.assertNotEqual(canonical_config_key(cfg_1), canonical_config_key(cfg_3))
+        self.assertNotEqual(canonical_config_key(cfg_1), canonical_config_key(cfg_4))
+
+    def test_cached_hardware_by_name(self):
+        with mock.patch.object(hardware_cache, "hardware_by_name", side_effect=lambda cfg: object()) as factory:
+            hw_1 = cached_hardware_by_name({"class": "IbmAll2All", "args": {"num_qubits": 5}})
+            hw_2 = cached_hardware_by_name({"args": {"num_qubits": 5}, "class": "IbmAll2All"})
+            hw_3 = cached_hardware_by_name({"class": "IbmAll2All", "args": {"num_qubits": 6}})
+            self.assertIs(hw_1, hw_2)
+            self.assertIsNot(hw_1, hw_3)
+            self.assertEqual(factory.call_count, 2)
+            clear_hardware_cache()
+            self.assertIsNot(cached_hardware_by_name({"class": "IbmAll2All", "args": {"num_qubits": 5}}), hw_1)
+            self.assertEqual(factory.call_count, 3)
+
+    def test_cached_hardware_conversion(self):
+        cfg = {"class": "IbmAll2All", "args": {"num_qubits": 5}}
+        convert = mock.Mock(side_effect=lambda: object())
+        device_1 = cached_hardware_conversion(cfg, "qiskit", convert)
+        device_2 = cached_hardware_conversion(dict(reversed(list(cfg.items()))), "qiskit", convert)
+        device_3 = cached_hardware_conversion(cfg, "cirq", convert)
+        self.assertIs(device_1, device_2)
+        self.assertIsNot(device_1, device_3)
+        self.assertEqual(convert.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
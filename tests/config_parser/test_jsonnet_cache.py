@@ -0,0 +1,38 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import json
+import os
+import tempfile
+import unittest
+
+from arline_benchmarks.config_parser.jsonnet_cache import evaluate_file_cached
+
+
+class TestJsonnetCache(unittest.TestCase):
+    def test_invalidation(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = os.path.join(tmp_dir, "cache")
+            root_path = os.path.join(tmp_dir, "root.jsonnet")
+            lib_path = os.path.join(tmp_dir, "lib.libsonnet")
+            with open(root_path, "w") as f:
+                f.write("local lib = import 'lib.libsonnet'; {x: lib.x, e: std.extVar('ARLINE_TEST_VAR')}")
+            with open(lib_path, "w") as f:
+                f.write("{x: 1}")
+            os.environ["ARLINE_TEST_VAR"] = "a"
+            try:
+                self.assertEqual(json.loads(evaluate_file_cached(root_path, cache_dir)), {"x": 1, "e": "a"})
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                self.assertEqual(json.loads(evaluate_file_cached(root_path, cache_dir)), {"x": 1, "e": "a"})
+                # Imported file changed
+                with open(lib_path, "w") as f:
+                    f.write("{x: 2}")
+                self.assertEqual(json.loads(evaluate_file_cached(root_path, cache_dir)), {"x": 2, "e": "a"})
+                # External variable changed
+                os.environ["ARLINE_TEST_VAR"] = "b"
+                self.assertEqual(json.loads(evaluate_file_cached(root_path, cache_dir)), {"x": 2, "e": "b"})
+            finally:
+                del os.environ["ARLINE_TEST_VAR"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+
+from arline_benchmarks.config_parser.pipeline_config_parser import count_pipeline_configs, iter_pipeline_configs
+
+
+class TestPipelineConfigParser(unittest.TestCase):
+    def test_pipeline_matrix_expansion(self):
+        template = {
+            "id": "Pl",
+            "target": "$target",
+            "test_type": "$test_type",
+            "stages": [{"id": "stage", "strategy": "qiskit_transpile", "args": {"hardware": "$hardware"}}],
+        }
+        cfg = {
+            "pipelines": [{"id": "Explicit"}],
+            "pipeline_matrix": [
+                {
+                    "test_type": "multiqubit",
+                    "hardware": [{"class": "IbmAll2All"}, {"class": "IbmRueschlikonSymmetrical"}],
+                    "targets": [{"name": "t1"}, {"name": "t2"}, {"name": "t3"}],
+                    "pipelines": [template, dict(template, id="Pl2")],
+                }
+            ],
+        }
+        pipelines = list(iter_pipeline_configs(cfg))
+
+        self.assertEqual(count_pipeline_configs(cfg), 13)
+        self.assertEqual(len(pipelines), 13)
+        self.assertEqual(pipelines[0], {"id": "Explicit"})
+        self.assertEqual(pipelines[1]["target"], {"name": "t1"})
+        self.assertEqual(pipelines[1]["test_type"], "multiqubit")
+        self.assertEqual(pipelines[1]["stages"][0]["args"]["hardware"], {"class": "IbmAll2All"})
+        self.assertEqual(pipelines[2]["id"], "Pl2")
+        self.assertEqual(pipelines[-1]["target"], {"name": "t3"})
+        self.assertEqual(pipelines[-1]["stages"][0]["args"]["hardware"], {"class": "IbmRueschlikonSymmetrical"})
+        # Templates are not modified
+        self.assertEqual(template["stages"][0]["args"]["hardware"], "$hardware")
+
+
+if __name__ == "__main__":
+    unittest.main()
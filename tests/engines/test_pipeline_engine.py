@@ -0,0 +1,198 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+
+from arline_benchmarks.engines import pipeline_engine
+from arline_benchmarks.engines.pipeline_engine import PipelineEngine, parse_stages_save_output
+from arline_benchmarks.reports.results_logger import CsvResultsLogger
+
+
+def make_cfg(save_output="all", stage_save_output=None):
+    stage = {"id": "compress", "strategy": "qiskit_transpile", "args": {}}
+    if stage_save_output is not None:
+        stage["save_output"] = stage_save_output
+    pipeline = {
+        "id": "Pl",
+        "target": {"name": "random"},
+        "test_type": "t",
+        "save_output": save_output,
+        "stages": [{"id": "target_analysis", "strategy": "target_analysis", "args": {}}, stage],
+    }
+    return {"pipelines": [pipeline]}
+
+
+class TestSaveOutput(unittest.TestCase):
+    def test_stage_options(self):
+        pipeline_cfg = make_cfg("final", "sample:0.5")["pipelines"][0]
+        self.assertEqual(parse_stages_save_output(pipeline_cfg), [("final", 1.0), ("sample", 0.5)])
+        engine = PipelineEngine(make_cfg("final"), SimpleNamespace())
+        engine.validate_config()
+        self.assertEqual(engine.get_save_output_flags(make_cfg("final")["pipelines"][0], 0), [False, True])
+
+    def test_invalid_options_fail_before_run(self):
+        for cfg in (make_cfg(stage_save_output="final"), make_cfg(stage_save_output="sample:2"), make_cfg("some")):
+            engine = PipelineEngine(cfg, SimpleNamespace(output="/nonexistent/output"))
+            with self.assertRaises(ValueError):
+                # Raised by validation, before output directory is created
+                engine.run()
+
+
+class TestStrategyValidation(unittest.TestCase):
+    def test_unknown_strategy(self):
+        cfg = make_cfg()
+        cfg["pipelines"][0]["stages"][-1]["strategy"] = "qiskit_transpil"
+        with self.assertRaisesRegex(ValueError, "qiskit_transpil"):
+            PipelineEngine(cfg, SimpleNamespace()).validate_config()
+        cfg = make_cfg()
+        cfg["pipelines"][0]["stages"][-1].update(
+            strategy="portfolio", args={"members": [{"id": "a", "strategy": "qiskit_transpile"}, {"strategy": "x"}]}
+        )
+        with self.assertRaisesRegex(ValueError, "Unknown strategy 'x'"):
+            PipelineEngine(cfg, SimpleNamespace()).validate_config()
+
+    def test_unknown_analyse_mode(self):
+        cfg = make_cfg()
+        cfg["pipelines"][0]["stages"][-1]["analyse"] = "partial"
+        with self.assertRaisesRegex(ValueError, "Unknown analyse option 'partial' of stage compress"):
+            PipelineEngine(cfg, SimpleNamespace()).validate_config()
+        for mode in ("full", "light", "none"):
+            cfg["pipelines"][0]["stages"][-1]["analyse"] = mode
+            PipelineEngine(cfg, SimpleNamespace()).validate_config()
+
+
+def make_adaptive_cfg(analyse="full", **adaptive):
+    cfg = make_cfg()
+    pipeline_cfg = cfg["pipelines"][0]
+    pipeline_cfg["target"]["adaptive"] = dict({"metrics": ["Two-Qubit Gate Count"]}, **adaptive)
+    pipeline_cfg["stages"][-1]["analyse"] = analyse
+    return cfg
+
+
+class TestAdaptiveValidation(unittest.TestCase):
+    def test_valid_options(self):
+        for cfg in (
+            make_adaptive_cfg(),
+            make_adaptive_cfg("light", metrics=["Two-Qubit Gate Count", "3-Qubit Gate Count", "Execution Time"]),
+            make_adaptive_cfg("none", metrics=["Total Execution Time"]),
+            make_adaptive_cfg("none", stage="target_analysis", metrics=["Depth"]),
+        ):
+            PipelineEngine(cfg, SimpleNamespace()).validate_config()
+
+    def test_invalid_options(self):
+        for cfg in (
+            make_adaptive_cfg(stage="mapping"),
+            make_adaptive_cfg(metrics=[]),
+            make_adaptive_cfg("light", metrics=["Depth"]),
+            make_adaptive_cfg("none"),
+            make_adaptive_cfg(min_number=10, max_number=5),
+        ):
+            with self.assertRaises(ValueError):
+                PipelineEngine(cfg, SimpleNamespace()).validate_config()
+
+
+class TestTargetGeneration(unittest.TestCase):
+    def test_generation_errors(self):
+        class Generator:
+            def __init__(self):
+                self.calls = 0
+
+            def __next__(self):
+                self.calls += 1
+                if self.calls == 2:
+                    raise RuntimeError("generation failed")
+                if self.calls > 3:
+                    raise StopIteration
+                return "t{}".format(self.calls), self.calls
+
+        engine = PipelineEngine(make_cfg(), SimpleNamespace())
+        pipeline_cfg = make_cfg()["pipelines"][0]
+        with mock.patch.object(pipeline_engine.Target, "from_config", return_value=Generator()), mock.patch(
+            "sys.stderr"
+        ):
+            self.assertEqual(engine.generate_targets(pipeline_cfg), ([("t1", 1), ("t3", 3)], -2))
+        with mock.patch.object(pipeline_engine.Target, "from_config", return_value=Generator()), mock.patch(
+            "sys.stderr"
+        ):
+            self.assertEqual(
+                list(engine.iter_targets(pipeline_cfg, pipeline_cfg["target"])), [("t1", 1), None, ("t3", 3)]
+            )
+        self.assertFalse(hasattr(engine, "targets_exit_code"))
+
+
+def make_racing_cfg(pipeline_ids=("A", "B"), analyse="full", **racing):
+    cfg = {"pipelines": [], "racing": dict({"objective": "Two-Qubit Gate Count"}, **racing)}
+    for pipeline_id in pipeline_ids:
+        pipeline_cfg = make_cfg()["pipelines"][0]
+        pipeline_cfg["id"] = pipeline_id
+        pipeline_cfg["stages"][-1]["analyse"] = analyse
+        cfg["pipelines"].append(pipeline_cfg)
+    return cfg
+
+
+class TestRacing(unittest.TestCase):
+    def test_validation(self):
+        PipelineEngine(make_racing_cfg(analyse="light"), SimpleNamespace()).validate_config()
+        for cfg in (
+            make_racing_cfg(analyse="none"),
+            make_racing_cfg(stage="mapping"),
+            make_racing_cfg(objective=None),
+        ):
+            with self.assertRaises(ValueError):
+                PipelineEngine(cfg, SimpleNamespace()).validate_config()
+
+    def test_failed_pipeline_dropped(self):
+        # Pipeline A is better than C, pipeline B fails on the second target
+        costs = {"A": 10, "B": 10, "C": 20}
+        engine = PipelineEngine(make_racing_cfg(["A", "B", "C"], initial_targets=2), SimpleNamespace())
+        engine.monitor = mock.Mock()
+
+        def create_pipeline(pipeline_cfg):
+            hardware = SimpleNamespace(name="hw", num_qubits=3)
+            return SimpleNamespace(
+                id=pipeline_cfg["id"],
+                stages=pipeline_cfg["stages"],
+                analyser_report_history=[],
+                strategy_list=[SimpleNamespace(quantum_hardware=hardware)],
+            )
+
+        def run_job(pipeline, pipeline_cfg, target, target_id, csv_logger):
+            if pipeline.id == "B" and target_id == 1:
+                return False
+            report = {"Two-Qubit Gate Count": costs[pipeline.id] + target_id % 2}
+            pipeline.analyser_report_history = [{}, report]
+            csv_logger.add_results((pipeline.id, target_id), report)
+            return True
+
+        targets = [("t{}".format(i), i) for i in range(14)]
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.object(
+            engine, "generate_targets", return_value=(targets, 0)
+        ), mock.patch.object(engine, "create_pipeline", side_effect=create_pipeline), mock.patch.object(
+            engine, "run_job", side_effect=run_job
+        ), mock.patch(
+            "sys.stderr"
+        ), mock.patch(
+            "arline_benchmarks.engines.pipeline_engine.tqdm.write"
+        ):
+            csv_logger = CsvResultsLogger(os.path.join(tmp_dir, "report.csv"), ["Pipeline ID", "Test Target ID"])
+            log_file = os.path.join(tmp_dir, "racing.csv")
+            self.assertEqual(engine.run_racing(csv_logger, log_file), -1)
+            decisions = pd.read_csv(log_file)
+
+        final = decisions.groupby("Pipeline ID")["Decision"].last().to_dict()
+        self.assertEqual(final, {"A": "survived", "B": "failed", "C": "eliminated"})
+        rows = csv_logger._data
+        self.assertEqual({r["Racing Decision"] for r in rows if r["Pipeline ID"] == "B"}, {"failed"})
+        self.assertEqual(len([r for r in rows if r["Pipeline ID"] == "B"]), 1)
+        self.assertEqual(len([r for r in rows if r["Pipeline ID"] == "A"]), len(targets))
+        self.assertLess(len([r for r in rows if r["Pipeline ID"] == "C"]), len(targets))
+        self.assertEqual({r["Racing Decision"] for r in rows if r["Pipeline ID"] == "C"}, {"eliminated"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import os
+import tempfile
+import unittest
+
+from arline_benchmarks.engines.planner import RunPlanner, estimate_targets, scan_qasm_header
+
+
+class TestPlanner(unittest.TestCase):
+    def test_scan_qasm_header(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fname = os.path.join(tmp_dir, "c.qasm")
+            with open(fname, "w") as f:
+                f.write('OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[3];\ncreg c[3];\n')
+                f.write("h q[0];\ncx q[0],q[1]; t q[2];\n")
+            self.assertEqual(scan_qasm_header(fname), (3, 3))
+            target_cfg = {"name": "qasm", "algo": "qasm", "qasm_path": [fname, os.path.join(tmp_dir, "missing.qasm")]}
+            self.assertEqual(estimate_targets(target_cfg), [(3, 3), None])
+
+    def test_fidelity_over_timeout(self):
+        target_cfg = {
+            "name": "random",
+            "algo": "random_chain",
+            "number": 4,
+            "chain_length": 100,
+            "hardware": {"gate_set": ["U3", "Cnot"], "num_qubits": 32},
+        }
+        stages = [{"id": "stage", "strategy": "qiskit_transpile", "args": {"hardware": {"class": "IbmAll2All"}}}]
+        fidelity_stages = [dict(stages[0], args=dict(stages[0]["args"], analyser_options={"calculate_fidelity": True}))]
+        cfg = {
+            "pipelines": [
+                {"id": "Pl", "target": target_cfg, "test_type": "t", "stages": stages},
+                {"id": "PlFidelity", "target": target_cfg, "test_type": "t", "stages": fidelity_stages},
+            ]
+        }
+        df = RunPlanner(cfg, timeout=3600).plan()
+        self.assertEqual(list(df["Jobs"]), [4, 4])
+        self.assertEqual(list(df["Over Timeout"]), [0, 4])
+        self.assertEqual(list(df["Hardware"]), ["IbmAll2All", "IbmAll2All"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from arline_benchmarks.engines.progress_monitor import ProgressMonitor, RateLimitedWriter
+
+
+class TestProgressMonitor(unittest.TestCase):
+    def test_prometheus_text(self):
+        monitor = ProgressMonitor(num_pipelines=2)
+        monitor.add_pipeline(4)
+        for t in (1.0, 3.0):
+            monitor.job_started()
+            monitor.job_finished("Pl", stage_times=[("compress", t), ("target_analysis", None)])
+        monitor.job_started()
+        monitor.job_finished('P"l', failed=True)
+        lines = monitor.to_prometheus().splitlines()
+        # Jobs of the second pipeline are extrapolated from the first one
+        self.assertIn("arline_jobs_total 8.0", lines)
+        self.assertIn("arline_jobs_done_total 2", lines)
+        self.assertIn("arline_jobs_failed_total 1", lines)
+        self.assertIn("# TYPE arline_jobs_done_total counter", lines)
+        self.assertIn('arline_stage_time_seconds_mean{pipeline="Pl",stage="compress"} 2.0', lines)
+        self.assertFalse(any("target_analysis" in line for line in lines))
+
+    def test_metrics_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            metrics_file = os.path.join(tmp_dir, "metrics.prom")
+            monitor = ProgressMonitor(metrics_file=metrics_file, interval=60)
+            monitor.start()
+            monitor.stop()
+            with open(metrics_file) as f:
+                self.assertIn("arline_jobs_running 0", f.read().splitlines())
+            self.assertEqual(os.listdir(tmp_dir), ["metrics.prom"])
+
+
+class TestRateLimitedWriter(unittest.TestCase):
+    def test_suppressed_messages(self):
+        writer = RateLimitedWriter(min_interval=1.0)
+        with mock.patch("arline_benchmarks.engines.progress_monitor.time.monotonic") as monotonic, mock.patch(
+            "arline_benchmarks.engines.progress_monitor.tqdm.write"
+        ) as write:
+            for now, msg in [(0.0, "a"), (0.5, "b"), (0.9, "c"), (1.2, "d"), (1.3, "e")]:
+                monotonic.return_value = now
+                writer.write(msg)
+        self.assertEqual([c.args[0] for c in write.call_args_list], ["a", "d [2 messages suppressed]"])
+
+    def test_no_limit(self):
+        writer = RateLimitedWriter(min_interval=0)
+        with mock.patch("arline_benchmarks.engines.progress_monitor.tqdm.write") as write:
+            for msg in "abc":
+                writer.write(msg)
+        self.assertEqual(write.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+
+import numpy as np
+
+from arline_benchmarks.engines.racing import PipelineRace
+
+
+class TestPipelineRace(unittest.TestCase):
+    def run_race(self, means, config, num_targets=40):
+        rng = np.random.RandomState(0)
+        noise = rng.normal(0, 1, size=num_targets)  # common per-target difficulty
+        race = PipelineRace(list(means), config)
+        decisions = []
+        start = 0
+        while start < num_targets:
+            batch = race.next_batch(start, num_targets)
+            for key in race.survivors:
+                for t in batch:
+                    race.add(key, t, means[key] + 10 * noise[t] + rng.normal(0, 0.1))
+            start = batch.stop
+            if len(race.survivors) > 1:
+                decisions += race.eliminate()
+        return race, decisions
+
+    def test_dominated_pipeline_eliminated(self):
+        race, decisions = self.run_race({"good": 10.0, "bad": 12.0, "close": 10.01}, {"objective": "Cost"})
+        self.assertNotIn("bad", race.survivors)
+        self.assertIn("good", race.survivors)
+        eliminated = [d for d in decisions if d["decision"] == "eliminated"]
+        self.assertEqual(eliminated[0]["key"], "bad")
+        self.assertEqual(eliminated[0]["leader"], "good")
+
+    def test_maximize_and_halving(self):
+        race = PipelineRace(range(8), {"objective": "Score", "minimize": False, "initial_targets": 1, "halving_eta": 2})
+        for key in range(8):
+            race.add(key, 0, float(key))
+        # Single target is not enough for statistical elimination, successive halving keeps 4 best
+        decisions = race.eliminate()
+        self.assertEqual(sorted(race.survivors), [4, 5, 6, 7])
+        self.assertEqual([d["decision"] for d in decisions], ["halved"] * 4 + ["survived"] * 4)
+        self.assertEqual(decisions[0]["leader"], 7)
+        self.assertEqual(race.status[0], "halved")
+        self.assertEqual(race.status[7], "survived")
+
+    def test_failed_pipeline(self):
+        race = PipelineRace(["a", "b", "c"], {"objective": "Cost"})
+        race.add("a", 0, 1.0)
+        decision = race.fail("a")
+        self.assertEqual(decision["decision"], "failed")
+        self.assertEqual(decision["mean"], 1.0)
+        self.assertEqual(race.survivors, ["b", "c"])
+        self.assertEqual(race.status, {"a": "failed", "b": "survived", "c": "survived"})
+        for key in race.survivors:
+            race.add(key, 0, 2.0)
+        # Failed pipeline does not take part in elimination
+        self.assertEqual([d["key"] for d in race.eliminate()], ["b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+from types import SimpleNamespace
+
+
+class StubGateChain(SimpleNamespace):
+    """Duck-typed stand-in for arline_quantum GateChain"""
+
+    def get_depth(self):
+        return self.depth
+
+    def get_num_gates(self):
+        return len(self.chain)
+
+
+def make_gate(**attrs):
+    return SimpleNamespace(**attrs)
+
+
+def make_chain(gates, depth=None, quantum_hardware=None):
+    """Gate chain of ``(gate, connections)`` pairs, gates are exposed as both ``gate`` and ``_gate``"""
+    chain = [SimpleNamespace(gate=g, _gate=g, connections=list(c)) for g, c in gates]
+    return StubGateChain(chain=chain, depth=depth, quantum_hardware=quantum_hardware)
+
+
+def make_named_chain(gates, unitaries=None, **kwargs):
+    """Gate chain of ``(gate name, connections)`` pairs, gate matrices are taken from ``unitaries`` if given"""
+    return make_chain(
+        [
+            (make_gate(name=n, num_qubits=len(c), **({} if unitaries is None else {"u": unitaries[n]})), c)
+            for n, c in gates
+        ],
+        **kwargs,
+    )
+
+
+def make_chain_by_num_qubits(num_qubits_by_gate, **kwargs):
+    """Gate chain of gates acting on the given numbers of qubits"""
+    return make_chain([(make_gate(num_qubits=n), range(n)) for n in num_qubits_by_gate], **kwargs)
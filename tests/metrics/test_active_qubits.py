@@ -0,0 +1,60 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+
+import numpy as np
+
+from arline_benchmarks.metrics.active_qubits import (
+    populated_qubits,
+    populated_qubits_union,
+    random_state_fidelities,
+    state_to_psi,
+    statevector,
+)
+from tests.gate_chain_stubs import make_chain, make_gate
+
+H = make_gate(u=np.array([[1, 1], [1, -1]]) / np.sqrt(2))
+X = make_gate(u=np.array([[0, 1], [1, 0]]))
+CNOT = make_gate(u=np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]]))
+
+
+def meas_fidelity(psi_1, psi_2):
+    return np.sum(np.sqrt(np.abs(psi_1) ** 2 * np.abs(psi_2) ** 2)) ** 2
+
+
+class TestActiveQubits(unittest.TestCase):
+    def test_statevector(self):
+        # X on qubit 0, then Cnot with control 0 and target 2: |101> with qubit 0 as the least significant bit
+        chain = make_chain([(X, [0]), (CNOT, [0, 2])])
+        psi = state_to_psi(statevector(chain, [0, 1, 2]))
+        self.assertEqual(np.argmax(np.abs(psi)), 5)
+        self.assertEqual(populated_qubits(chain), [0, 2])
+        self.assertEqual(state_to_psi(statevector(chain, [0, 2])).shape, (4,))
+
+    def test_identity_layout(self):
+        target = make_chain([(X, [0]), (H, [1]), (CNOT, [1, 2])])
+        # Compiled chain with an extra gate pair on ancilla qubit 5
+        compiled = make_chain([(H, [1]), (X, [0]), (CNOT, [1, 2]), (H, [5]), (H, [5])])
+        # Same circuit on permuted qubits, final layout is not known and qubits are matched by index
+        permuted = make_chain([(X, [2]), (H, [0]), (CNOT, [0, 1])])
+        self.assertEqual(populated_qubits_union(target, compiled), [0, 1, 2, 5])
+        self.assertEqual(populated_qubits_union(target, make_chain([])), [0, 1, 2])
+
+        def fidelity(chain):
+            qubits = populated_qubits_union(target, chain)
+            return meas_fidelity(state_to_psi(statevector(target, qubits)), state_to_psi(statevector(chain, qubits)))
+
+        self.assertAlmostEqual(fidelity(compiled), 1)
+        self.assertLess(fidelity(permuted), 0.9)
+
+    def test_random_state_fidelities(self):
+        chain = make_chain([(H, [0]), (CNOT, [0, 1])])
+        # Cnot conjugated by Hadamards on both qubits is Cnot with swapped control and target
+        same = make_chain([(H, [0]), (H, [0]), (H, [1]), (CNOT, [1, 0]), (H, [0]), (H, [1])])
+        np.testing.assert_allclose(random_state_fidelities(chain, same), 1)
+        self.assertTrue(np.all(random_state_fidelities(chain, make_chain([(H, [0]), (CNOT, [1, 0])])) < 0.999))
+        self.assertEqual(random_state_fidelities(chain, make_chain([(H, [0])]), num_samples=7).shape, (7,))
+
+
+if __name__ == "__main__":
+    unittest.main()
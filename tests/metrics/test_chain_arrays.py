@@ -0,0 +1,54 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+
+import numpy as np
+
+from arline_benchmarks.metrics.chain_arrays import GateChainArrays
+from tests.gate_chain_stubs import make_chain
+
+
+class H:
+    pass
+
+
+class Cnot:
+    pass
+
+
+class Toffoli:
+    pass
+
+
+class TestGateChainArrays(unittest.TestCase):
+    def test_checks(self):
+        # Line connectivity 0 - 1 - 2 (both directions)
+        adj_matrix = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]])
+        chain = make_chain(
+            [
+                (H(), [0]),
+                (Cnot(), [0, 1]),
+                (Cnot(), [0, 2]),  # not connected
+                (Toffoli(), [0, 1, 2]),  # pair (0, 2) not connected
+                (H(), [3]),  # out of range
+                (Cnot(), [2, 1]),
+            ]
+        )
+        arrays = GateChainArrays(chain)
+        self.assertEqual(len(arrays), 6)
+        self.assertEqual(
+            arrays.violations(arrays.connectivity_mask(adj_matrix)),
+            [(2, "Cnot", (0, 2)), (3, "Toffoli", (0, 1, 2)), (4, "H", (3,))],
+        )
+        self.assertEqual(arrays.violations(arrays.qubit_number_mask(3)), [(4, "H", (3,))])
+        self.assertEqual(np.flatnonzero(arrays.gate_set_mask([H, Cnot])).tolist(), [3])
+
+    def test_empty_chain(self):
+        arrays = GateChainArrays(make_chain([]))
+        self.assertFalse(arrays.connectivity_mask(np.ones((2, 2))).any())
+        self.assertFalse(arrays.gate_set_mask([H]).any())
+        self.assertFalse(arrays.qubit_number_mask(2).any())
+
+
+if __name__ == "__main__":
+    unittest.main()
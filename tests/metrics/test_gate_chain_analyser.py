@@ -0,0 +1,31 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from arline_benchmarks.metrics import gate_chain_analyser
+from arline_benchmarks.metrics.gate_chain_analyser import BasicAnalyser
+from tests.gate_chain_stubs import make_chain_by_num_qubits, make_gate
+
+
+class TestLightAnalysis(unittest.TestCase):
+    def test_light_report(self):
+        with mock.patch.object(gate_chain_analyser, "Estimator"):
+            analyser = BasicAnalyser()
+        gate_list = [make_gate(num_qubits=n) for n in (1, 2, 3)]
+        hardware = SimpleNamespace(gate_set=SimpleNamespace(gate_list=gate_list))
+        report = analyser.run_light(None, make_chain_by_num_qubits([1, 2, 2, 3, 1, 1], quantum_hardware=hardware))
+        self.assertEqual(
+            report,
+            {
+                "Total Gate Count": 6,
+                "Single-Qubit Gate Count": 3,
+                "Two-Qubit Gate Count": 2,
+                "3-Qubit Gate Count": 1,
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+from types import SimpleNamespace
+
+from arline_benchmarks.metrics.latency import schedule_latency
+from tests.gate_chain_stubs import make_named_chain
+
+
+class TestScheduleLatency(unittest.TestCase):
+    def test_critical_path(self):
+        chain = make_named_chain(
+            [("H", [0]), ("Cnot", [0, 1]), ("H", [2]), ("H", [2]), ("Cnot", [1, 2])],
+            quantum_hardware=SimpleNamespace(num_qubits=4),
+        )
+        latency, idle_times = schedule_latency(chain, {"H": 1, "Cnot": 10})
+        # H(0) -> Cnot(0, 1) -> Cnot(1, 2)
+        self.assertEqual(latency, 21)
+        # Qubit 3 is not populated
+        self.assertEqual(idle_times, [21 - 11, 21 - 20, 21 - 12])
+
+    def test_default_duration(self):
+        chain = make_named_chain([("H", [0]), ("T", [0])], quantum_hardware=SimpleNamespace(num_qubits=1))
+        self.assertEqual(schedule_latency(chain, {"H": 2, "default": 3})[0], 5)
+        with self.assertRaises(KeyError):
+            schedule_latency(chain, {"H": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+from unittest import mock
+
+from arline_benchmarks.metrics import result_selector
+from arline_benchmarks.metrics.result_selector import ResultSelector
+from tests.gate_chain_stubs import make_chain_by_num_qubits
+
+
+class TestResultSelector(unittest.TestCase):
+    def setUp(self):
+        self.chains = [
+            make_chain_by_num_qubits([2, 2, 1], depth=4),
+            make_chain_by_num_qubits([1, 1, 2, 1], depth=6),
+            make_chain_by_num_qubits([2, 1], depth=2),
+        ]
+
+    def test_metrics(self):
+        selector = ResultSelector("two_qubit_gate_count")
+        self.assertEqual([selector(c) for c in self.chains], [2, 1, 1])
+        # The first of equal candidates wins
+        self.assertEqual(selector.best(self.chains), 1)
+        self.assertEqual(ResultSelector("depth").best(self.chains), 2)
+
+    def test_cost(self):
+        cost_cfg = {"class": "StubCost", "args": {}}
+        cost_model = mock.Mock(**{"calculate_cost.side_effect": lambda c: 10 * c.depth - len(c.chain)})
+        with mock.patch.object(result_selector, "Estimator") as estimator:
+            estimator.from_config.return_value = cost_model
+            selector = ResultSelector("cost", cost_cfg=cost_cfg)
+            estimator.from_config.assert_called_once_with(cost_cfg)
+        self.assertEqual(selector.best(self.chains), 2)
+        self.assertEqual(cost_model.calculate_cost.call_count, 3)
+
+    def test_unknown_metric(self):
+        with self.assertRaises(ValueError):
+            ResultSelector("gate_count")
+
+
+if __name__ == "__main__":
+    unittest.main()
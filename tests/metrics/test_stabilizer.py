@@ -0,0 +1,83 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+
+import numpy as np
+
+from arline_benchmarks.metrics.active_qubits import state_to_psi, statevector
+from arline_benchmarks.metrics.stabilizer import StabilizerTableau, is_clifford, measurement_fidelity
+from tests.gate_chain_stubs import make_named_chain
+
+gate_matrices = {
+    "H": np.array([[1, 1], [1, -1]]) / np.sqrt(2),
+    "S": np.diag([1, 1j]),
+    "Sd": np.diag([1, -1j]),
+    "X": np.array([[0, 1], [1, 0]]),
+    "Y": np.array([[0, -1j], [1j, 0]]),
+    "Z": np.diag([1, -1]),
+    "Cnot": np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]]),
+    "Cz": np.diag([1, 1, 1, -1]),
+    "Swap": np.eye(4)[[0, 2, 1, 3]],
+    "T": np.diag([1, np.exp(1j * np.pi / 4)]),
+}
+
+
+def random_clifford_chain(rng, num_qubits, length):
+    names = ["H", "S", "Sd", "X", "Y", "Z", "Cnot", "Cz", "Swap"]
+    # Z gates populate all qubits without changing measurement outcomes
+    gates = [("Z", [q]) for q in range(num_qubits)]
+    for name in rng.choice(names, length):
+        num_gate_qubits = int(np.log2(len(gate_matrices[name])))
+        gates.append((name, list(rng.choice(num_qubits, num_gate_qubits, replace=False))))
+    return make_named_chain(gates, gate_matrices)
+
+
+def dense_measurement_fidelity(chain_1, chain_2, num_qubits):
+    p_1 = np.abs(state_to_psi(statevector(chain_1, list(range(num_qubits))))) ** 2
+    p_2 = np.abs(state_to_psi(statevector(chain_2, list(range(num_qubits))))) ** 2
+    return np.sum(np.sqrt(p_1 * p_2)) ** 2
+
+
+class TestStabilizerTableau(unittest.TestCase):
+    def test_measurement_fidelity(self):
+        rng = np.random.default_rng(0)
+        qubits = list(range(4))
+        for _ in range(50):
+            chain_1, chain_2 = random_clifford_chain(rng, 4, 12), random_clifford_chain(rng, 4, 12)
+            fidelity = measurement_fidelity(
+                StabilizerTableau.from_gate_chain(chain_1, qubits), StabilizerTableau.from_gate_chain(chain_2, qubits)
+            )
+            self.assertAlmostEqual(fidelity, dense_measurement_fidelity(chain_1, chain_2, 4))
+
+    def test_equivalence(self):
+        chain = make_named_chain([("H", [0]), ("Cnot", [0, 1]), ("S", [1])], gate_matrices)
+        # Cz = H Cnot H, S Sd = I
+        same = make_named_chain(
+            [("H", [0]), ("H", [1]), ("Cz", [0, 1]), ("H", [1]), ("S", [1]), ("S", [2]), ("Sd", [2])], gate_matrices
+        )
+        other = make_named_chain([("H", [0]), ("Cnot", [0, 1]), ("Sd", [1])], gate_matrices)
+        qubits = [0, 1, 2]
+        tableau = StabilizerTableau.from_gate_chain(chain, qubits)
+        self.assertEqual(tableau, StabilizerTableau.from_gate_chain(same, qubits))
+        self.assertNotEqual(tableau, StabilizerTableau.from_gate_chain(other, qubits))
+        # Phase gates do not change measurement outcomes
+        self.assertEqual(measurement_fidelity(tableau, StabilizerTableau.from_gate_chain(other, qubits)), 1)
+        self.assertTrue(is_clifford(chain))
+        self.assertFalse(is_clifford(make_named_chain([("T", [0])], gate_matrices)))
+
+    def test_shared_qubits(self):
+        chain = make_named_chain([("Cnot", [0, 2])], gate_matrices)
+        # Identity on an idle qubit in between populated qubits
+        same = make_named_chain([("Cnot", [0, 2]), ("H", [1]), ("H", [1])], gate_matrices)
+        moved = make_named_chain([("Cnot", [0, 1])], gate_matrices)
+        qubits = [0, 1, 2]
+        tableau = StabilizerTableau.from_gate_chain(chain, qubits)
+        self.assertEqual(tableau.num_qubits, 3)
+        self.assertEqual(tableau, StabilizerTableau.from_gate_chain(same, qubits))
+        self.assertNotEqual(tableau, StabilizerTableau.from_gate_chain(moved, qubits))
+        # Populated qubits of each chain compacted separately
+        self.assertEqual(StabilizerTableau.from_gate_chain(chain), StabilizerTableau.from_gate_chain(moved))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+
+import numpy as np
+
+from arline_benchmarks.metrics.statistics import AdaptiveSampleSize, confidence_interval
+
+
+class TestStatistics(unittest.TestCase):
+    def test_confidence_interval(self):
+        mean, half_width = confidence_interval([1.0, 2.0, 3.0], confidence=0.95)
+        self.assertAlmostEqual(mean, 2.0)
+        # t(0.975, 2) = 4.303, sem = 1 / sqrt(3)
+        self.assertAlmostEqual(half_width, 4.302653 / np.sqrt(3), places=5)
+        self.assertEqual(confidence_interval([1.0])[1], float("inf"))
+
+    def test_adaptive_sample_size(self):
+        cfg = {"metrics": ["Two-Qubit Gate Count"], "rel_tol": 0.05, "min_number": 3, "max_number": 50}
+        sampler = AdaptiveSampleSize(cfg, default_stage_id="final")
+        # Constant metric converges at min_number
+        for i in range(3):
+            self.assertFalse(sampler.done())
+            sampler.add({"final": {"Two-Qubit Gate Count": 10}})
+        self.assertTrue(sampler.converged())
+
+        sampler = AdaptiveSampleSize(cfg, default_stage_id="final")
+        rng = np.random.RandomState(0)
+        while not sampler.done():
+            sampler.add({"final": {"Two-Qubit Gate Count": rng.normal(10, 5)}})
+        # Noisy metric hits max_number
+        self.assertEqual(sampler.number, 50)
+        self.assertFalse(sampler.report()["Adaptive Sampling Converged"])
+        self.assertIn("Two-Qubit Gate Count CI Half Width", sampler.report())
+
+
+if __name__ == "__main__":
+    unittest.main()
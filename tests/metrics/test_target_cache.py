@@ -0,0 +1,58 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from arline_benchmarks.metrics.target_cache import TargetCache
+
+
+class FakeChain:
+    def __init__(self, qasm, hardware_name="IbmAll"):
+        self.qasm = qasm
+        self.quantum_hardware = SimpleNamespace(name=hardware_name)
+
+    def to_qasm(self, qreg_name="q"):
+        return self.qasm
+
+
+class TestTargetCache(unittest.TestCase):
+    def test_shared_between_equal_targets(self):
+        cache = TargetCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"Total Gate Count": 3}
+
+        self.assertEqual(cache.get(FakeChain("h q[0];"), "report", compute), {"Total Gate Count": 3})
+        self.assertEqual(cache.get(FakeChain("h q[0];"), "report", compute), {"Total Gate Count": 3})
+        self.assertEqual(len(calls), 1)
+        cache.get(FakeChain("h q[0];", hardware_name="IbmRueschlikon"), "report", compute)
+        cache.get(FakeChain("h q[0];"), "qasm", compute)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_lru_eviction(self):
+        cache = TargetCache(max_bytes=2 * 8 * 16)
+        targets = [FakeChain(str(i)) for i in range(3)]
+        for t in targets[:2]:
+            cache.get(t, "psi", lambda: np.zeros(16))
+        # Touch first target, the second one becomes least recently used
+        cache.get(targets[0], "psi", lambda: None)
+        cache.get(targets[2], "psi", lambda: np.zeros(16))
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNotNone(cache.get(targets[0], "psi", lambda: None))
+        self.assertIsNone(cache.get(targets[1], "psi", lambda: None))
+
+    def test_disabled(self):
+        cache = TargetCache(max_bytes=0)
+        cache.get(FakeChain(""), "qasm", lambda: "")
+        self.assertEqual(len(cache), 0)
+        # Non gate chain targets are not cached
+        self.assertEqual(TargetCache().get(np.eye(2), "psi", lambda: 1), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
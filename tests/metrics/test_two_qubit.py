@@ -0,0 +1,86 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from arline_benchmarks.metrics.active_qubits import apply_chain, populated_qubits
+from arline_benchmarks.metrics.two_qubit import chain_unitaries, gate_arrays, min_cnot_counts, process_fidelities
+
+
+def random_unitary(rng, dim):
+    q, _ = np.linalg.qr(rng.normal(size=(dim, dim)) + 1j * rng.normal(size=(dim, dim)))
+    return q
+
+
+def random_chain(rng, length, qubits=(3, 7)):
+    gates = []
+    for _ in range(length):
+        if rng.random() < 0.5:
+            gates.append((random_unitary(rng, 2), [int(rng.choice(qubits))]))
+        else:
+            gates.append((random_unitary(rng, 4), [int(q) for q in rng.permutation(qubits)]))
+    return SimpleNamespace(chain=[SimpleNamespace(gate=SimpleNamespace(u=u), connections=c) for u, c in gates])
+
+
+def dense_unitary(chain):
+    # Columns are images of basis states, qubit 0 is the least significant bit
+    columns = []
+    for i in range(4):
+        state = np.zeros((2, 2), dtype=np.complex128)
+        state[i & 1, i >> 1] = 1
+        columns.append(apply_chain(chain, populated_qubits(chain), state).T.reshape(-1))
+    return np.array(columns).T
+
+
+class TestTwoQubitUnitaries(unittest.TestCase):
+    def test_batched_unitaries(self):
+        rng = np.random.default_rng(0)
+        chains = [random_chain(rng, length) for length in (1, 2, 7, 30, 120)]
+        unitaries = chain_unitaries([gate_arrays(c) for c in chains])
+        for chain, unitary in zip(chains, unitaries):
+            np.testing.assert_allclose(unitary, dense_unitary(chain), atol=1e-12)
+        np.testing.assert_allclose(chain_unitaries([gate_arrays(SimpleNamespace(chain=[]))])[0], np.eye(4))
+
+    def test_process_fidelities(self):
+        rng = np.random.default_rng(1)
+        chain = random_chain(rng, 10)
+        qubits = populated_qubits(chain)
+        unitary = chain_unitaries([gate_arrays(chain, qubits)])[0]
+        # Same circuit with qubits 3 and 7 exchanged, qubits are matched by index
+        swapped = SimpleNamespace(
+            chain=[SimpleNamespace(gate=g.gate, connections=[10 - q for q in g.connections]) for g in chain.chain]
+        )
+        others = chain_unitaries([gate_arrays(c, qubits) for c in (chain, swapped, random_chain(rng, 10))])
+        fidelities = process_fidelities(unitary * np.exp(0.3j), others)
+        self.assertAlmostEqual(fidelities[0], 1)
+        self.assertLess(fidelities[1], 0.99)
+        self.assertLess(fidelities[2], 0.99)
+        # Swapped circuit matches the target with exchanged order of qubits
+        swapped_unitary = chain_unitaries([gate_arrays(swapped, qubits[::-1])])
+        self.assertAlmostEqual(process_fidelities(unitary, swapped_unitary)[0], 1)
+        with self.assertRaises(ValueError):
+            gate_arrays(chain, [3, 7, 9])
+
+    def test_min_cnot_counts(self):
+        rng = np.random.default_rng(2)
+        cnot = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])
+        swap = np.eye(4)[[0, 2, 1, 3]]
+
+        def local():
+            return np.kron(random_unitary(rng, 2), random_unitary(rng, 2))
+
+        unitaries = [
+            np.exp(0.7j) * local(),
+            local() @ np.diag([1, 1, 1, -1]) @ local(),
+            local() @ cnot @ local() @ cnot @ local(),
+            np.array([[1, 0, 0, 0], [0, 0, 1j, 0], [0, 1j, 0, 0], [0, 0, 0, 1]]),
+            swap,
+            local() @ cnot @ local() @ cnot @ local() @ cnot @ local(),
+        ]
+        np.testing.assert_array_equal(min_cnot_counts(unitaries), [0, 1, 2, 2, 3, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+from unittest import mock
+
+from arline_benchmarks.pipeline.pipeline import Pipeline
+from arline_benchmarks.strategies.strategy import Strategy
+
+
+class StubAnalyser:
+    def run_all(self, target, result):
+        return {
+            "Total Gate Count": 3,
+            "Two-Qubit Gate Count": 1,
+            "Depth": 2,
+            "Connectivity Satisfied": True,
+            "Gate Set Satisfied": True,
+            "Qubit Number Satisfied": False,
+        }
+
+    def run_light(self, target, result):
+        return {"Total Gate Count": 3, "Single-Qubit Gate Count": 2, "Two-Qubit Gate Count": 1}
+
+
+class StubStrategy(Strategy):
+    def __init__(self, execution_time, analyser_options={}):
+        super().__init__(analyser_options)
+        self.stub_execution_time = execution_time
+        self.run_analyser_calls = []
+
+    def run(self, target, run_analyser=True):
+        self.run_analyser_calls.append(run_analyser)
+        self.execution_time = self.stub_execution_time
+        if run_analyser:
+            self.analyser = StubAnalyser()
+            self.analyser_report = self.analyser_run(target, target)
+            self.analyser_report["Execution Time"] = self.execution_time
+        return target
+
+
+def stage(stage_id, execution_time, analyse=None):
+    cfg = {"id": stage_id, "strategy": "stub", "args": {"execution_time": execution_time}}
+    if analyse is not None:
+        cfg["analyse"] = analyse
+    return cfg
+
+
+class TestAnalyseModes(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(Strategy, "get_class", return_value=StubStrategy)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_pipeline(self, stages, run_analyser=True):
+        pipeline = Pipeline("pl", stages, run_analyser=run_analyser, log_writer=mock.Mock())
+        self.assertEqual(pipeline.run("target"), "target")
+        return pipeline
+
+    def test_reports(self):
+        pipeline = self.run_pipeline([stage("full", 1.0), stage("light", 2.0, "light"), stage("none", 4.0, "none")])
+        full, light, none = pipeline.analyser_report_history
+        self.assertEqual(full["Depth"], 2)
+        self.assertFalse(full["Full Check"])
+        self.assertEqual(full["Total Execution Time"], 1.0)
+        self.assertEqual(
+            light,
+            {
+                "Total Gate Count": 3,
+                "Single-Qubit Gate Count": 2,
+                "Two-Qubit Gate Count": 1,
+                "Execution Time": 2.0,
+                "Total Execution Time": 3.0,
+            },
+        )
+        self.assertEqual(none, {"Execution Time": 4.0, "Total Execution Time": 7.0})
+        self.assertEqual([s.run_analyser_calls for s in pipeline.strategy_list], [[True], [True], [False]])
+        self.assertEqual([s.analyse_mode for s in pipeline.strategy_list], ["full", "light", "none"])
+
+    def test_pipeline_without_analyser(self):
+        pipeline = self.run_pipeline([stage("full", 1.0), stage("light", 2.0, "light")], run_analyser=False)
+        self.assertEqual(pipeline.analyser_report_history, [])
+        self.assertEqual([s.run_analyser_calls for s in pipeline.strategy_list], [[False], [False]])
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            self.run_pipeline([stage("fast", 1.0, "fast")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from arline_benchmarks.profiling.stage_profiler import StageProfiler
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestStageProfiler(unittest.TestCase):
+    def test_profiles(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_dir = os.path.join(tmp_dir, "profiles")
+            profiler = StageProfiler(output_dir, stage_ids=["compress"], sampling_interval=0.001)
+            self.assertFalse(profiler.is_profiled({"id": "target_analysis"}))
+            # Directory is created only when a stage is profiled
+            self.assertFalse(os.path.exists(output_dir))
+
+            stages = [{"id": "compress"}, {"id": "route", "profile": "sampling"}]
+            for target_id in range(2):
+                for stage_cfg in stages:
+                    with profiler.profile("Pl", target_id, stage_cfg):
+                        busy(0.02)
+            with mock.patch("arline_benchmarks.profiling.stage_profiler.tqdm.write") as write:
+                profiler.save_aggregated()
+            self.assertIn("Profile of pipeline Pl, stage compress", write.call_args.args[0])
+
+            self.assertEqual(
+                sorted(os.listdir(output_dir)),
+                [
+                    "Pl_0_compress.pstats",
+                    "Pl_0_route.collapsed",
+                    "Pl_1_compress.pstats",
+                    "Pl_1_route.collapsed",
+                    "Pl_compress_all_targets.pstats",
+                    "Pl_route_all_targets.collapsed",
+                ],
+            )
+            with open(os.path.join(output_dir, "Pl_route_all_targets.collapsed")) as f:
+                self.assertIn("busy", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
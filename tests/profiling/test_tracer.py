@@ -0,0 +1,74 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import json
+import os
+import tempfile
+import unittest
+
+from arline_benchmarks.profiling.tracer import Tracer
+
+
+class TestTracer(unittest.TestCase):
+    def test_disabled(self):
+        tracer = Tracer()
+        with tracer.context(pipeline_id="Pl"), tracer.span("job"):
+            pass
+        tracer.add_span("compile", 0, 1)
+        tracer.stop()
+        self.assertFalse(tracer.enabled)
+
+    def test_empty_chrome_trace(self):
+        tracer = Tracer()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            chrome_path = os.path.join(tmp_dir, "trace.json")
+            tracer.start(chrome_trace_path=chrome_path)
+            tracer.stop()
+            with open(chrome_path) as f:
+                self.assertEqual(json.load(f)["traceEvents"], [])
+
+    def test_nested_spans_and_chrome_trace(self):
+        tracer = Tracer()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            jsonl_path = os.path.join(tmp_dir, "trace.jsonl")
+            chrome_path = os.path.join(tmp_dir, "trace.json")
+            tracer.start(jsonl_path=jsonl_path, chrome_trace_path=chrome_path)
+            with tracer.context(pipeline_id="Pl", target_id=3), tracer.span("job"):
+                with tracer.context(stage_id="compress"):
+                    stage_start = tracer.begin_stage()
+                    with tracer.span("compile"):
+                        pass
+                    with tracer.span("analyse"):
+                        pass
+                    tracer.end_stage(stage_start)
+                with tracer.span("write"):
+                    pass
+            tracer.stop()
+
+            with open(jsonl_path) as f:
+                spans = [json.loads(line) for line in f]
+            with open(chrome_path) as f:
+                events = json.load(f)["traceEvents"]
+
+        phases = [s["phase"] for s in spans]
+        self.assertEqual(phases, ["compile", "analyse", "convert-in", "convert-out", "stage", "write", "job"])
+        by_phase = {s["phase"]: s for s in spans}
+        # Inner spans lie within outer ones and inherit ids of enclosing contexts
+        for phase in ("compile", "analyse", "convert-in", "convert-out"):
+            self.assertGreaterEqual(by_phase[phase]["start"], by_phase["stage"]["start"])
+            self.assertLessEqual(by_phase[phase]["end"], by_phase["stage"]["end"])
+            self.assertEqual(by_phase[phase]["stage_id"], "compress")
+        self.assertLessEqual(by_phase["stage"]["end"], by_phase["job"]["end"])
+        self.assertNotIn("stage_id", by_phase["write"])
+        self.assertEqual(by_phase["write"]["target_id"], 3)
+
+        self.assertEqual(len(events), len(spans))
+        names = {e["name"] for e in events}
+        self.assertIn("compress: compile", names)
+        self.assertIn("job", names)
+        for e in events:
+            self.assertEqual(e["ph"], "X")
+            self.assertGreaterEqual(e["dur"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
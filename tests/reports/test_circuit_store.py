@@ -0,0 +1,37 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import os
+import tempfile
+import unittest
+
+from arline_benchmarks.reports.circuit_store import CircuitStore
+
+
+class QasmChain:
+    def __init__(self, qasm):
+        self.qasm = qasm
+
+    def to_qasm(self, qreg_name="q"):
+        return self.qasm
+
+
+class TestCircuitStore(unittest.TestCase):
+    def test_identical_circuits_stored_once(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            store = CircuitStore(tmpdirname)
+            h1, p1 = store.put(QasmChain("qreg q[2];\ncx q[0],q[1];\n"))
+            h2, p2 = store.put(QasmChain("qreg q[2];\ncx q[0],q[1];\n"))
+            h3, p3 = store.put(QasmChain("qreg q[2];\ncx q[1],q[0];\n"))
+
+            self.assertEqual(h1, h2)
+            self.assertEqual(p1, p2)
+            self.assertNotEqual(h1, h3)
+            self.assertEqual(store.num_circuits, 3)
+            self.assertEqual(store.num_unique_circuits, 2)
+            self.assertEqual(len(os.listdir(tmpdirname)), 2)
+            with open(p3) as f:
+                self.assertEqual(f.read(), "qreg q[2];\ncx q[1],q[0];\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
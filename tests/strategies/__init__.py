@@ -0,0 +1 @@
+# Copyright (c) 2019-2022 Turation Ltd
@@ -0,0 +1,57 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import operator
+import os
+import unittest
+from unittest import mock
+
+from arline_benchmarks.strategies import parallel
+from arline_benchmarks.strategies.parallel import derive_seeds, get_executor, parallel_map, shutdown_executors
+
+
+class TestParallel(unittest.TestCase):
+    def test_derive_seeds(self):
+        seeds = derive_seeds(1, 4)
+        self.assertEqual(seeds[0], 1)
+        self.assertEqual(len(set(seeds)), 4)
+        self.assertEqual(seeds, derive_seeds(1, 4))
+        self.assertEqual(derive_seeds(1, 1), [1])
+        self.assertEqual(derive_seeds(1, 0), [])
+
+    def test_parallel_map(self):
+        args_list = [(i, i + 1) for i in range(5)]
+        expected = [i * (i + 1) for i in range(5)]
+        self.assertEqual(parallel_map(operator.mul, args_list, max_workers=2), expected)
+        self.assertEqual(parallel_map(operator.mul, args_list, max_workers=1), expected)
+        self.assertEqual(parallel_map(operator.mul, []), [])
+
+    def test_shared_executor(self):
+        self.addCleanup(shutdown_executors)
+        args_list = [(i, i) for i in range(3)]
+        parallel_map(operator.mul, args_list, max_workers=2)
+        executor = get_executor(2)
+        parallel_map(operator.mul, args_list, max_workers=2)
+        self.assertIs(get_executor(2), executor)
+        # Pool grows for larger requests and is reused by smaller ones
+        larger = get_executor(3)
+        self.assertIsNot(larger, executor)
+        self.addCleanup(larger.shutdown)
+        self.assertIs(get_executor(2), larger)
+        self.assertEqual(parallel_map(operator.mul, args_list, max_workers=2), [0, 1, 4])
+        # Forked child process does not reuse the pool of the parent
+        with mock.patch.object(parallel.os, "getpid", return_value=os.getpid() + 1):
+            child_executor = get_executor(2)
+            self.assertIsNot(child_executor, larger)
+            child_executor.shutdown()
+
+    def test_default_workers(self):
+        self.addCleanup(shutdown_executors)
+        with mock.patch.object(parallel.os, "cpu_count", return_value=2), mock.patch.object(
+            parallel, "get_executor", wraps=get_executor
+        ) as executor:
+            self.assertEqual(parallel_map(operator.mul, [(i, i) for i in range(5)]), [i * i for i in range(5)])
+            executor.assert_called_once_with(2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import operator
+import os
+import signal
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from arline_benchmarks.strategies import portfolio, strategy
+from arline_benchmarks.strategies.parallel import parallel_map
+from arline_benchmarks.strategies.portfolio import Portfolio
+from arline_benchmarks.strategies.strategy import CircuitProcessingStrategy, Strategy
+from tests.gate_chain_stubs import make_chain_by_num_qubits
+
+
+class StubMember(CircuitProcessingStrategy):
+    def __init__(
+        self, hardware, num_cnots=0, sleep_s=0, fail=False, killed=False, nested=False, analyser_options={}
+    ):
+        super().__init__(hardware, analyser_options)
+        self.num_cnots = num_cnots
+        self.sleep_s = sleep_s
+        self.fail = fail
+        self.killed = killed
+        self.nested = nested
+
+    def run(self, target, run_analyser=True):
+        if self.fail:
+            raise RuntimeError("member failed")
+        if self.killed:
+            # Crash that skips exception handling of the member process
+            os.kill(os.getpid(), signal.SIGKILL)
+        time.sleep(self.sleep_s)
+        num_cnots = self.num_cnots
+        if self.nested:
+            # Process pool inside of a member process
+            num_cnots = sum(parallel_map(operator.mul, [(num_cnots, 1), (0, 1)], max_workers=2))
+        return make_chain_by_num_qubits([2] * num_cnots)
+
+
+def member(member_id, **args):
+    return {"id": member_id, "strategy": "stub_member", "args": args}
+
+
+class TestPortfolio(unittest.TestCase):
+    def setUp(self):
+        self.hardware = SimpleNamespace(name="hw", num_qubits=3)
+        for patcher in (
+            mock.patch.object(strategy, "cached_hardware_by_name", side_effect=lambda cfg: self.hardware),
+            mock.patch.object(Strategy, "get_class", return_value=StubMember),
+            mock.patch.object(Portfolio, "analyse", side_effect=self.analyse),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def analyse(self, target, result):
+        self.portfolio.analyser_report = {}
+
+    def run_portfolio(self, members, **kwargs):
+        self.portfolio = Portfolio({"class": "hw"}, members, **kwargs)
+        with mock.patch("sys.stderr"):
+            return self.portfolio.run("target")
+
+    def test_winner(self):
+        result = self.run_portfolio([member("a", num_cnots=5), member("b", num_cnots=2), member("c", num_cnots=3)])
+        self.assertEqual(len(result.chain), 2)
+        self.assertIs(result.quantum_hardware, self.hardware)
+        report = self.portfolio.analyser_report
+        self.assertEqual(report["Portfolio Winner"], "b")
+        self.assertTrue(all(report["Portfolio {} Time".format(m)] is not None for m in "abc"))
+
+    def test_failing_member(self):
+        result = self.run_portfolio([member("a", fail=True), member("b", num_cnots=4)])
+        self.assertEqual(len(result.chain), 4)
+        self.assertEqual(self.portfolio.analyser_report["Portfolio Winner"], "b")
+        self.assertIsNone(self.portfolio.analyser_report["Portfolio a Time"])
+        with self.assertRaises(RuntimeError):
+            self.run_portfolio([member("a", fail=True)])
+
+    def test_killed_member(self):
+        with mock.patch.object(portfolio, "_poll_interval_s", 0.1):
+            result = self.run_portfolio([member("killed", killed=True), member("b", num_cnots=4, sleep_s=0.5)])
+            self.assertEqual(len(result.chain), 4)
+            self.assertIsNone(self.portfolio.analyser_report["Portfolio killed Time"])
+            start = time.monotonic()
+            with self.assertRaises(RuntimeError):
+                self.run_portfolio([member("killed", killed=True)])
+            self.assertLess(time.monotonic() - start, 5)
+
+    def test_time_budget(self):
+        start = time.monotonic()
+        result = self.run_portfolio([member("slow", sleep_s=30), member("fast", num_cnots=7)], time_budget_s=1)
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(len(result.chain), 7)
+        self.assertEqual(self.portfolio.analyser_report["Portfolio Winner"], "fast")
+        self.assertIsNone(self.portfolio.analyser_report["Portfolio slow Time"])
+
+    def test_nested_process_pool(self):
+        result = self.run_portfolio([member("nested", num_cnots=3, nested=True)])
+        self.assertEqual(len(result.chain), 3)
+
+    def test_unique_member_ids(self):
+        with self.assertRaises(ValueError):
+            Portfolio({"class": "hw"}, [member("a"), member("a")])
+
+
+if __name__ == "__main__":
+    unittest.main()
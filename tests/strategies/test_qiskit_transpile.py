@@ -0,0 +1,78 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from arline_benchmarks.metrics import result_selector
+from arline_benchmarks.strategies import qiskit_transpile, strategy
+from arline_benchmarks.strategies.parallel import derive_seeds
+from arline_benchmarks.strategies.qiskit_transpile import QiskitTranspile
+from tests.gate_chain_stubs import make_chain_by_num_qubits
+
+
+def make_candidates(num_cnots_and_depths):
+    return [make_chain_by_num_qubits([2] * num_cnots, depth=depth) for num_cnots, depth in num_cnots_and_depths]
+
+
+class StubCostFunction:
+    def calculate_cost(self, gate_chain):
+        # Cost depends on the hardware of the gate chain
+        assert gate_chain.quantum_hardware is not None, "Hardware is not set"
+        return gate_chain.quantum_hardware.cnot_cost * len(gate_chain.chain) + gate_chain.depth
+
+
+class TestQiskitTranspile(unittest.TestCase):
+    def setUp(self):
+        self.hardware = SimpleNamespace(name="hw", num_qubits=3, cnot_cost=10, convert_to_qiskit_hardware=None)
+        for patcher in (
+            mock.patch.object(strategy, "cached_hardware_by_name", return_value=self.hardware),
+            mock.patch.object(qiskit_transpile, "cached_hardware_conversion", return_value="backend"),
+            mock.patch.object(result_selector, "Estimator", **{"from_config.return_value": StubCostFunction()}),
+            mock.patch.object(QiskitTranspile, "analyse", side_effect=self.analyse),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def analyse(self, target, result):
+        self.strategy.analyser_report = {}
+
+    def run_sweep(self, candidates, **kwargs):
+        self.strategy = QiskitTranspile({"hardware": "hw"}, seed_transpiler=7, num_seeds=len(candidates), **kwargs)
+        target = mock.Mock()
+        target.convert_to.return_value = "circuit"
+        gate_chain_class = mock.Mock(**{"convert_from.side_effect": lambda c, format_id: candidates[c]})
+        with mock.patch.object(qiskit_transpile, "transpile", return_value=list(range(len(candidates)))) as transpile:
+            with mock.patch.object(qiskit_transpile, "GateChain", gate_chain_class):
+                result = self.strategy.run(target)
+        return result, transpile
+
+    def test_seed_derivation(self):
+        candidates = make_candidates([(3, 5)] * 4)
+        result, transpile = self.run_sweep(candidates)
+        args, kwargs = transpile.call_args
+        self.assertEqual(args[0], ["circuit"] * 4)
+        self.assertEqual(kwargs["seed_transpiler"], derive_seeds(7, 4))
+        self.assertEqual(kwargs["seed_transpiler"][0], 7)
+        self.assertIs(result, candidates[0])
+        self.assertEqual(self.strategy.analyser_report["Best Seed"], 7)
+        self.assertIn("Seed Sweep CPU Time", self.strategy.analyser_report)
+        self.assertNotIn("Seed Sweep Wall Time", self.strategy.analyser_report)
+
+    def test_best_candidate(self):
+        candidates = make_candidates([(3, 5), (2, 9), (2, 4), (4, 1)])
+        result, _ = self.run_sweep(candidates)
+        self.assertIs(result, candidates[1])
+        self.assertEqual(self.strategy.analyser_report["Best Seed"], derive_seeds(7, 4)[1])
+        result, _ = self.run_sweep(candidates, select_metric="depth")
+        self.assertIs(result, candidates[3])
+
+    def test_cost_selection_uses_hardware(self):
+        candidates = make_candidates([(3, 5), (2, 9), (2, 4)])
+        result, _ = self.run_sweep(candidates, select_metric="cost")
+        self.assertIs(result, candidates[2])
+        self.assertTrue(all(c.quantum_hardware is self.hardware for c in candidates))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import re
+import unittest
+from glob import glob
+from os import path
+
+import arline_benchmarks.strategies
+from arline_benchmarks.strategies.registry import check_strategy_name, strategy_registry
+
+
+class TestStrategyRegistry(unittest.TestCase):
+    def test_registry_matches_strategy_modules(self):
+        strategies_dir = path.dirname(arline_benchmarks.strategies.__file__)
+        modules = {}
+        for f in glob(path.join(strategies_dir, "*.py")):
+            with open(f) as src:
+                m = re.search(r'^_strategy_class_name = "(\w+)"', src.read(), re.MULTILINE)
+            if m is not None:
+                modules[path.splitext(path.basename(f))[0]] = m.group(1)
+
+        self.assertEqual(set(modules), set(strategy_registry))
+        for strategy_name, class_name in modules.items():
+            self.assertEqual(strategy_registry[strategy_name][0], class_name)
+
+    def test_check_strategy_name(self):
+        check_strategy_name("qiskit_transpile")
+        with self.assertRaises(ValueError):
+            check_strategy_name("qiskit_transpil")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# Copyright (c) 2019-2022 Turation Ltd
+
+import pickle
+import threading
+import unittest
+from unittest import mock
+
+from arline_benchmarks.strategies import strategy as strategy_module
+from arline_benchmarks.strategies.strategy import Strategy
+
+
+class StubStrategy(Strategy):
+    def __init__(self, hardware, seed=0, analyser_options={}):
+        super().__init__(analyser_options)
+        self.hardware_cfg = hardware
+        self.seed = seed
+
+    def run(self, target, run_analyser=True):
+        self.execution_time = 0
+        self.analyser_report = {"Target": target, "Seed": self.seed}
+        return target
+
+
+def stage_cfg(seed=0):
+    return {"strategy": "stub", "args": {"hardware": {"class": "IbmAll2All", "args": {"num_qubits": 3}}, "seed": seed}}
+
+
+class TestStrategyInterning(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(Strategy, "get_class", return_value=StubStrategy)
+        self.get_class = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_interning(self):
+        pool = {}
+        strategy = Strategy.from_config(stage_cfg(), pool)
+        reordered_cfg = stage_cfg()
+        reordered_cfg["args"] = dict(reversed(list(reordered_cfg["args"].items())))
+        self.assertIs(Strategy.from_config(reordered_cfg, pool), strategy)
+        self.assertIsNot(Strategy.from_config(stage_cfg(seed=1), pool), strategy)
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(self.get_class.call_count, 2)
+        # Without pool a new strategy is created on every call
+        self.assertIsNot(Strategy.from_config(stage_cfg()), Strategy.from_config(stage_cfg()))
+
+    def test_thread_local_run_state(self):
+        strategy = Strategy.from_config(stage_cfg(), {})
+        barrier = threading.Barrier(2)
+        reports = {}
+
+        def worker(target, analyse_mode):
+            strategy.analyse_mode = analyse_mode
+            strategy.run(target)
+            # Both threads have run before either reads its state back
+            barrier.wait()
+            reports[target] = (strategy.analyser_report, strategy.analyse_mode)
+
+        threads = [threading.Thread(target=worker, args=args) for args in [("t1", "light"), ("t2", "full")]]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(reports["t1"], ({"Target": "t1", "Seed": 0}, "light"))
+        self.assertEqual(reports["t2"], ({"Target": "t2", "Seed": 0}, "full"))
+        # Main thread has its own (empty) state
+        self.assertIsNone(strategy.analyser_report)
+        self.assertEqual(strategy.analyse_mode, "full")
+
+    def test_pickle_drops_run_state(self):
+        strategy = Strategy.from_config(stage_cfg(seed=2), {})
+        strategy.run("t1")
+        restored = pickle.loads(pickle.dumps(strategy))
+        self.assertEqual(restored.seed, 2)
+        self.assertIsNone(restored.analyser_report)
+        self.assertEqual(restored.execution_time, 0)
+
+    def test_record_execution_time(self):
+        strategy = Strategy.from_config(stage_cfg(), {})
+        with mock.patch.object(strategy_module, "tracer") as tracer:
+            strategy.execution_time = 1.5
+            tracer.add_span.assert_not_called()
+            strategy.record_execution_time(strategy_module.timer() - 2)
+            self.assertGreaterEqual(strategy.execution_time, 2)
+            tracer.add_span.assert_called_once()
+            phase, start, end = tracer.add_span.call_args[0]
+            self.assertEqual(phase, "compile")
+            self.assertAlmostEqual(end - start, strategy.execution_time)
+
+
+if __name__ == "__main__":
+    unittest.main()